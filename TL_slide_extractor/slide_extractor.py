@@ -1,36 +1,164 @@
+import argparse
 import cv2
 import numpy as np
 import mss
 import os
+import sys
 import time
+import tomllib
+import uuid
 import threading
 import queue
+import sqlite3
+import difflib
+import json
 import pytesseract
+from collections import OrderedDict
 from datetime import datetime
 from skimage.metrics import structural_similarity as ssim
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+# CPU budgeting is shared with the transcriber package; without it (e.g. a
+# standalone copy of this script) OCR threads are left at library defaults
+try:
+    from transcription_app.config.resources import ResourceBudget
+except ImportError:
+    try:
+        from TL_transcriber.config.resources import ResourceBudget
+    except ImportError:
+        ResourceBudget = None
 
 # === Config ===
 
 
 class Config:
-    """Configuration settings for the application."""
+    """Configuration settings for the application.
+
+    Defaults can be overridden from a TOML file with Config.load; keys are
+    the lowercase attribute names and may be grouped in any tables.
+    """
+    # Frame source: "screen", "video" (file at SOURCE_PATH) or "images"
+    # (directory of screenshots at SOURCE_PATH)
+    SOURCE = "screen"
+    SOURCE_PATH = None
+    MAX_FRAMES = None  # stop after this many samples (None = no limit)
+    MAX_DURATION = None  # stop after this many seconds of source time
     SCREEN_INDEX = 1  # 0 = all screens, since mss on macOS treats all as one virtual screen
+    # Watch several monitors at once, e.g. [1, 2]; None watches SCREEN_INDEX only
+    SCREEN_INDICES = None
     CAPTURE_INTERVAL = 2  # seconds between checks
     SSIM_THRESHOLD = 0.95  # lower = more sensitive to change
+    # A change is only captured once the screen has looked the same for
+    # SETTLE_SAMPLES consecutive samples spanning at least SETTLE_MS of source
+    # time, so transitions and animations are not OCRed half-rendered
+    SETTLE_SAMPLES = 2
+    SETTLE_MS = 0
+    # Similarity between consecutive samples for the screen to count as still;
+    # stricter than SSIM_THRESHOLD so slow fades do not look settled
+    SETTLE_THRESHOLD = 0.98
+    SETTLE_INTERVAL = 0.25  # seconds between samples while a change settles
+    # Slides replaced within this many seconds are not OCRed if still queued;
+    # None means replaced by the first regular sample after settling (see
+    # Config.min_slide_duration)
+    MIN_SLIDE_DURATION = None
     OUTPUT_DIR = "captured_text"
     OCR_QUEUE_SIZE = 100  # maximum number of images to queue for OCR processing
+    # Hard cap on the memory of frames waiting for or undergoing OCR;
+    # slides beyond it are skipped like those that find the queue full
+    MAX_INFLIGHT_MB = 256
+    OCR_WORKERS = 1  # OCR threads shared by all watched monitors
+    # CPUs are divided between the OCR workers; optionally pin each to its share
+    PIN_OCR_WORKERS = False
     DELETE_IMAGES_AFTER_OCR = True  # delete image files after OCR processing
     # Minimum text length to consider OCR successful (characters)
     MIN_TEXT_LENGTH = 10
     # Whether to try both light and dark mode processing
     TRY_DARK_MODE = False
+    # OCR only the text blocks found by a morphological pre-stage, each scaled
+    # so its lines are OCR_LINE_HEIGHT pixels tall (the whole image is the
+    # fallback when no blocks are found or they cover most of the screen)
+    DETECT_TEXT_REGIONS = True
+    OCR_LINE_HEIGHT = 40
+    OCR_REGION_WORKERS = 2  # tesseract processes per slide
+    MAX_TEXT_REGION_FRACTION = 0.8
+    # SQLite file holding the OCR results of every capture session
+    # (None = sessions.db in OUTPUT_DIR)
+    SESSION_STORE_PATH = None
+    STORE_BATCH_SIZE = 20  # slides buffered before a write transaction
+    STORE_FLUSH_INTERVAL = 10  # seconds before a partial batch is written
+    # Slide text is stored as a delta against the previous slide on the same
+    # screen, with a full snapshot every STORE_SNAPSHOT_INTERVAL slides
+    STORE_SNAPSHOT_INTERVAL = 10
+    STORE_TEXT_CACHE_SIZE = 256  # reconstructed texts kept in memory
+    # Whether to keep a compressed thumbnail of each slide in the store
+    STORE_THUMBNAILS = False
+    THUMBNAIL_WIDTH = 320
+    # Regions ignored by change detection, as (x, y, width, height) fractions
+    # of the screen, e.g. [(0.75, 0.75, 0.25, 0.25)] for a webcam overlay
+    MASK_REGIONS = []
+    # Whether to learn and ignore regions that keep changing (video, cursor)
+    LEARN_MASK = True
+    MASK_GRID = (16, 9)  # columns and rows of cells used to learn the mask
+    MASK_LEARNING_RATE = 0.2  # weight of the newest sample in the estimate
+    MASK_CELL_THRESHOLD = 8  # mean grey-level difference of a changed cell
+    # Cells changing in at least this fraction of samples are masked
+    MASK_VOLATILITY_THRESHOLD = 0.5
+    # Changes covering more of the screen than this are slide changes and
+    # are not used for learning
+    MASK_LOCAL_CHANGE_FRACTION = 0.25
+    MAX_MASKED_FRACTION = 0.5  # never mask more of the screen than this
+    BATCH_FRAME_WIDTH = 320  # frames are downsampled to this width for batches
+    BATCH_CHUNK_SIZE = 64  # frames per vectorized SSIM pass
 
     @classmethod
     def initialize(cls):
         """Initialize directories based on configuration."""
         os.makedirs(cls.OUTPUT_DIR, exist_ok=True)
 
+    @classmethod
+    def min_slide_duration(cls):
+        """Return the display time below which a queued slide is superseded.
+
+        A slide's capture time is when its change began, so the earliest a
+        replacement can be captured is after the slide settled and one more
+        CAPTURE_INTERVAL passed. Unless MIN_SLIDE_DURATION is set, slides
+        replaced by that first sample (with half an interval of slack for
+        timing jitter) count as animation or build steps.
+        """
+        if cls.MIN_SLIDE_DURATION is not None:
+            return cls.MIN_SLIDE_DURATION
+        settle = max((cls.SETTLE_SAMPLES - 1) * cls.SETTLE_INTERVAL,
+                     cls.SETTLE_MS / 1000)
+        return settle + 1.5 * cls.CAPTURE_INTERVAL
+
+    @classmethod
+    def load(cls, path):
+        """Override settings from a TOML configuration file."""
+        with open(path, "rb") as f:
+            cls.update(tomllib.load(f))
+
+    @classmethod
+    def update(cls, values):
+        """Override settings from a (possibly nested) dict of lowercase keys."""
+        for key, value in values.items():
+            if isinstance(value, dict):
+                cls.update(value)
+                continue
+
+            name = key.upper()
+            if (name.startswith("_") or not hasattr(cls, name) or
+                    callable(getattr(cls, name))):
+                raise ValueError(f"Unknown configuration key: {key}")
+            if isinstance(getattr(cls, name), tuple):
+                value = tuple(value)
+            setattr(cls, name, value)
+
+    @classmethod
+    def session_store_path(cls):
+        """Return the session store path, defaulting to OUTPUT_DIR."""
+        return cls.SESSION_STORE_PATH or os.path.join(cls.OUTPUT_DIR, "sessions.db")
+
 
 # === Screen Capture Module ===
 class ScreenCapture:
@@ -48,22 +176,483 @@ class ScreenCapture:
             img = np.array(screenshot)
             return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
 
+    @staticmethod
+    def capture_screens(screen_indices):
+        """Capture several monitors with a single grab.
+
+        The bounding box of the requested monitors is grabbed once and cut
+        into one image per monitor, so all screens are sampled at the same
+        instant.
+
+        Returns:
+            dict: Screen index mapped to its BGR image
+        """
+        with mss.mss() as sct:
+            monitors = {i: sct.monitors[i] for i in screen_indices}
+            left = min(m["left"] for m in monitors.values())
+            top = min(m["top"] for m in monitors.values())
+            right = max(m["left"] + m["width"] for m in monitors.values())
+            bottom = max(m["top"] + m["height"] for m in monitors.values())
+            screenshot = sct.grab({"left": left, "top": top,
+                                   "width": right - left,
+                                   "height": bottom - top})
+            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_BGRA2BGR)
+
+        # Grabs can be larger than the logical size on high-DPI displays
+        scale = img.shape[1] / (right - left)
+        images = {}
+        for index, m in monitors.items():
+            x = round((m["left"] - left) * scale)
+            y = round((m["top"] - top) * scale)
+            w = round(m["width"] * scale)
+            h = round(m["height"] * scale)
+            images[index] = img[y:y + h, x:x + w]
+        return images
+
+
+# === Frame Source Module ===
+class ScreenFrameSource:
+    """Samples the watched monitors every Config.CAPTURE_INTERVAL seconds.
+
+    While settling is set (a change is waiting to settle), samples are taken
+    every Config.SETTLE_INTERVAL seconds instead.
+    """
+
+    settling = False
+
+    def __init__(self, screen_indices=None, interval=None):
+        """Initialize the source for the given monitors."""
+        self.screens = (screen_indices or Config.SCREEN_INDICES or
+                        [Config.SCREEN_INDEX])
+        self.interval = Config.CAPTURE_INTERVAL if interval is None else interval
+
+    def __iter__(self):
+        """Yield (timestamp, {screen index: image}) once per interval."""
+        while True:
+            yield time.time(), ScreenCapture.capture_screens(self.screens)
+            time.sleep(Config.SETTLE_INTERVAL if self.settling else self.interval)
+
+
+class VideoFrameSource:
+    """Samples a recorded video every Config.CAPTURE_INTERVAL seconds of video time.
+
+    Like ScreenFrameSource, it samples every Config.SETTLE_INTERVAL seconds
+    while settling is set. Timestamps are start_time plus the position in
+    the video, so the slides (and kept images) of different runs do not
+    share 1970-based times.
+    """
+
+    settling = False
+
+    def __init__(self, path, interval=None, start_time=None):
+        """Initialize the source for a video file.
+
+        start_time defaults to the time the video starts being read.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+        self.path = path
+        self.screens = [None]
+        self.interval = Config.CAPTURE_INTERVAL if interval is None else interval
+        self.start_time = start_time
+
+    def __iter__(self):
+        """Yield (start_time + seconds into the video, {None: image}) per sample."""
+        capture = cv2.VideoCapture(self.path)
+        if not capture.isOpened():
+            raise ValueError(f"Could not open video: {self.path}")
+        if self.start_time is None:
+            self.start_time = time.time()
+
+        try:
+            fps = capture.get(cv2.CAP_PROP_FPS) or 25
+            index = 0
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    return
+                yield self.start_time + index / fps, {None: frame}
+
+                interval = Config.SETTLE_INTERVAL if self.settling else self.interval
+                step = max(1, round(fps * interval))
+
+                # Skipped frames are only grabbed, not converted
+                for _ in range(step - 1):
+                    if not capture.grab():
+                        return
+                index += step
+        finally:
+            capture.release()
+
+
+class ImageDirectoryFrameSource:
+    """Replays a directory of screenshots in file name order.
+
+    Each file is yielded once and there is nothing to resample while a
+    change settles, so every screenshot is treated as already settled.
+    """
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+    settled = True
+
+    def __init__(self, path):
+        """Initialize the source for an image directory."""
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Directory not found: {path}")
+        self.path = path
+        self.screens = [None]
+
+    def __iter__(self):
+        """Yield (file modification time, {None: image}) per screenshot."""
+        for name in sorted(os.listdir(self.path)):
+            if not name.lower().endswith(self.IMAGE_EXTENSIONS):
+                continue
+            filepath = os.path.join(self.path, name)
+            image = cv2.imread(filepath)
+            if image is None:
+                print(f"⚠️ Could not read image: {filepath}")
+                continue
+            yield os.path.getmtime(filepath), {None: image}
+
+
+def create_frame_source(kind=None, path=None):
+    """Create the frame source selected in the configuration."""
+    kind = kind or Config.SOURCE
+    path = path or Config.SOURCE_PATH
+
+    if kind == "screen":
+        return ScreenFrameSource()
+    if kind in ("video", "images") and not path:
+        raise ValueError(f"The {kind} source needs a source path")
+    if kind == "video":
+        return VideoFrameSource(path)
+    if kind == "images":
+        return ImageDirectoryFrameSource(path)
+    raise ValueError(f"Unknown frame source: {kind}")
+
 
 # === Image Processing Module ===
 class ImageProcessor:
     """Handles image processing and analysis."""
 
     @staticmethod
-    def image_similarity(img1, img2):
-        """Calculate similarity between two images using SSIM."""
+    def image_similarity(img1, img2, mask=None):
+        """Calculate similarity between two images using SSIM.
+
+        If a boolean mask is given, only pixels where it is True are scored.
+        """
         gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
         gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
 
         if gray1.shape != gray2.shape:
             return 0  # consider as very different
 
-        score, _ = ssim(gray1, gray2, full=True)
-        return score
+        score, ssim_map = ssim(gray1, gray2, full=True)
+        if mask is None:
+            return score
+        if not mask.any():
+            return 1.0  # nothing left to compare
+        return float(ssim_map[mask].mean())
+
+    @staticmethod
+    def prepare_frames(frames, width=None):
+        """Stack BGR frames as downsampled grayscale images.
+
+        Args:
+            frames (iterable): BGR images of identical size
+            width (int, optional): Target width, defaults to
+                Config.BATCH_FRAME_WIDTH; 0 keeps the original size
+
+        Returns:
+            numpy.ndarray: uint8 array of shape (N, H, W)
+        """
+        if width is None:
+            width = Config.BATCH_FRAME_WIDTH
+
+        stack = []
+        for frame in frames:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if width and gray.shape[1] != width:
+                height = max(7, round(gray.shape[0] * width / gray.shape[1]))
+                gray = cv2.resize(gray, (width, height),
+                                  interpolation=cv2.INTER_AREA)
+            stack.append(gray)
+        return np.stack(stack)
+
+    @staticmethod
+    def batch_similarity(stack, chunk_size=None):
+        """Calculate SSIM between consecutive frames of a grayscale stack.
+
+        Uses the same window, constants and covariance normalisation as
+        skimage's structural_similarity, so each score matches
+        image_similarity on the same pair to within floating point error
+        (1e-6), but all pairs of a chunk are computed in one pass.
+
+        Args:
+            stack (numpy.ndarray): uint8 array of shape (N, H, W)
+            chunk_size (int, optional): Frames per pass, bounding memory use
+
+        Returns:
+            numpy.ndarray: N - 1 similarity scores
+        """
+        if chunk_size is None:
+            chunk_size = Config.BATCH_CHUNK_SIZE
+        win_size, pad = 7, 3
+        cov_norm = win_size ** 2 / (win_size ** 2 - 1)
+        c1 = (0.01 * 255) ** 2
+        c2 = (0.03 * 255) ** 2
+
+        def window_mean(values):
+            # Borders differ from skimage's reflection but are cropped below
+            return np.stack([cv2.blur(frame, (win_size, win_size))
+                             for frame in values])
+
+        scores = []
+        # Chunks overlap by one frame so every consecutive pair is scored
+        for start in range(0, max(len(stack) - 1, 0), chunk_size):
+            frames = stack[start:start + chunk_size + 1].astype(np.float64)
+            x, y = frames[:-1], frames[1:]
+            means = window_mean(frames)
+            squares = window_mean(frames * frames)
+            ux, uy = means[:-1], means[1:]
+            vx = cov_norm * (squares[:-1] - ux * ux)
+            vy = cov_norm * (squares[1:] - uy * uy)
+            vxy = cov_norm * (window_mean(x * y) - ux * uy)
+
+            ssim_map = ((2 * ux * uy + c1) * (2 * vxy + c2) /
+                        ((ux * ux + uy * uy + c1) * (vx + vy + c2)))
+            scores.append(ssim_map[:, pad:-pad, pad:-pad].mean(axis=(1, 2)))
+        return np.concatenate(scores) if scores else np.empty(0)
+
+    @staticmethod
+    def batch_difference(stack):
+        """Calculate the mean absolute difference between consecutive frames.
+
+        A cheaper alternative to batch_similarity, scaled to 0..1.
+        """
+        if len(stack) < 2:
+            return np.empty(0)
+        diff = np.abs(np.diff(stack.astype(np.int16), axis=0))
+        return diff.mean(axis=(1, 2)) / 255
+
+    @staticmethod
+    def segment_scenes(stack, threshold=None, chunk_size=None):
+        """Split a frame sequence into scenes at consecutive-frame changes.
+
+        A new scene starts wherever the similarity of a frame to its
+        predecessor drops below the threshold (Config.SSIM_THRESHOLD).
+
+        Returns:
+            list: (start, end) frame index ranges, end exclusive
+        """
+        if threshold is None:
+            threshold = Config.SSIM_THRESHOLD
+        if len(stack) == 0:
+            return []
+
+        scores = ImageProcessor.batch_similarity(stack, chunk_size)
+        starts = [0] + [int(i) + 1 for i in np.flatnonzero(scores < threshold)]
+        ends = starts[1:] + [len(stack)]
+        return list(zip(starts, ends))
+
+    @staticmethod
+    def fingerprint(image):
+        """Compute a 64-bit difference hash of an image as a hex string."""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return f"{int(''.join('1' if b else '0' for b in bits), 2):016x}"
+
+    @staticmethod
+    def encode_thumbnail(image, width=None):
+        """Downscale an image and encode it as JPEG bytes."""
+        if width is None:
+            width = Config.THUMBNAIL_WIDTH
+
+        height = max(1, round(image.shape[0] * width / image.shape[1]))
+        small = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(".jpg", small, [cv2.IMWRITE_JPEG_QUALITY, 70])
+        return encoded.tobytes() if ok else None
+
+
+# === Change Detection Module ===
+class ChangeDetector:
+    """Decides whether a frame shows a new slide, ignoring noisy regions.
+
+    Regions listed in Config.MASK_REGIONS are always ignored. With
+    Config.LEARN_MASK, the detector also tracks how often each cell of a
+    coarse grid changes between consecutive samples while the rest of the
+    screen stays put (embedded videos, webcam overlays, the cursor) and
+    ignores cells that change most of the time.
+
+    update() additionally waits for a change to settle: a frame that differs
+    from the reference only becomes the new reference once the following
+    samples stop changing, so slide transitions are never captured.
+    """
+
+    NEW = "new"
+    SETTLING = "settling"
+    UNCHANGED = "unchanged"
+
+    def __init__(self, mask_regions=None, learn_mask=None):
+        """Initialize the detector with no reference slide."""
+        self.mask_regions = (Config.MASK_REGIONS if mask_regions is None
+                             else mask_regions)
+        self.learn_mask = Config.LEARN_MASK if learn_mask is None else learn_mask
+        self.columns, self.rows = Config.MASK_GRID
+        self.reference = None
+        self.volatility = np.zeros((self.rows, self.columns))
+        # Latest frame of a change that has not settled yet
+        self.candidate = None
+        self.changed_at = None
+        self._change_started = None
+        self._stable_since = None
+        self._stable_samples = 0
+        self._previous_cells = None
+        self._shape = None
+        self._static_cells = None
+
+    def compare(self, image):
+        """Return the masked similarity of an image to the reference slide.
+
+        Every sampled frame should be passed here, since consecutive samples
+        are what the mask is learned from.
+        """
+        self._observe(image)
+        if self.reference is None:
+            return 0.0
+        return ImageProcessor.image_similarity(
+            image, self.reference, mask=self.mask(image.shape[:2]))
+
+    @property
+    def settling(self):
+        """Whether a change is waiting to settle."""
+        return self.candidate is not None
+
+    def update(self, image, timestamp, settled=False):
+        """Track a sample and report whether a change has settled.
+
+        Returns (status, similarity to the reference), where status is NEW,
+        SETTLING or UNCHANGED. On NEW the settled frame is the reference and
+        changed_at is the timestamp at which the change began. A settled
+        frame (e.g. a screenshot file, which cannot be resampled) is adopted
+        without waiting for further samples.
+        """
+        similarity = self.compare(image)
+        unchanged = (self.reference is not None and
+                     similarity >= Config.SSIM_THRESHOLD)
+
+        if self.candidate is None:
+            if unchanged:
+                return self.UNCHANGED, similarity
+            self._change_started = self._stable_since = timestamp
+            self._stable_samples = 1
+        elif unchanged:
+            # Back to the current slide, e.g. a tooltip or menu closed
+            self.candidate = None
+            return self.UNCHANGED, similarity
+        elif ImageProcessor.image_similarity(
+                image, self.candidate,
+                mask=self.mask(image.shape[:2])) >= Config.SETTLE_THRESHOLD:
+            self._stable_samples += 1
+        else:
+            # Still moving; stability is counted from this sample on
+            self._stable_since = timestamp
+            self._stable_samples = 1
+
+        self.candidate = image
+        if settled or (self._stable_samples >= Config.SETTLE_SAMPLES and
+                       timestamp - self._stable_since >= Config.SETTLE_MS / 1000):
+            self._adopt_candidate()
+            return self.NEW, similarity
+        return self.SETTLING, similarity
+
+    def confirm_pending(self):
+        """Adopt a change that has not settled, e.g. when the source ends.
+
+        Returns:
+            bool: Whether there was such a change
+        """
+        if self.candidate is None:
+            return False
+        self._adopt_candidate()
+        return True
+
+    def _adopt_candidate(self):
+        self.reference = self.candidate
+        self.changed_at = self._change_started
+        self.candidate = None
+
+    def mask(self, shape):
+        """Return a boolean mask of the pixels that should be compared."""
+        self._ensure_shape(shape)
+        ignored = self._static_cells | self._learned_cells()
+        if not ignored.any() and not self.mask_regions:
+            return None
+
+        height, width = shape
+        mask = ~cv2.resize(ignored.astype(np.uint8), (width, height),
+                           interpolation=cv2.INTER_NEAREST).astype(bool)
+        for x, y, w, h in self.mask_regions:
+            mask[int(y * height):int((y + h) * height),
+                 int(x * width):int((x + w) * width)] = False
+        return mask
+
+    def _ensure_shape(self, shape):
+        """Reset learned state when the screen resolution changes."""
+        if shape == self._shape:
+            return
+        self._shape = shape
+        self._previous_cells = None
+        self.volatility[:] = 0
+
+        # Cells fully inside a configured region are excluded from learning
+        self._static_cells = np.zeros((self.rows, self.columns), dtype=bool)
+        for x, y, w, h in self.mask_regions:
+            self._static_cells[
+                int(np.ceil(y * self.rows)):int((y + h) * self.rows),
+                int(np.ceil(x * self.columns)):int((x + w) * self.columns)] = True
+
+    def _learned_cells(self):
+        """Return the grid cells currently considered volatile."""
+        if not self.learn_mask:
+            return np.zeros_like(self._static_cells)
+
+        volatile = self.volatility >= Config.MASK_VOLATILITY_THRESHOLD
+        limit = int(Config.MAX_MASKED_FRACTION * volatile.size)
+        if volatile.sum() > limit:
+            # Keep only the most volatile cells
+            order = np.argsort(self.volatility, axis=None)[::-1][:limit]
+            volatile = np.zeros_like(volatile)
+            volatile.flat[order] = True
+        return volatile
+
+    def _observe(self, image):
+        """Update the per-cell change frequency from consecutive samples."""
+        self._ensure_shape(image.shape[:2])
+        if not self.learn_mask:
+            return
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        cells = cv2.resize(gray, (self.columns * 8, self.rows * 8),
+                           interpolation=cv2.INTER_AREA).astype(np.int16)
+        previous, self._previous_cells = self._previous_cells, cells
+        if previous is None:
+            return
+
+        diff = np.abs(cells - previous).reshape(
+            self.rows, 8, self.columns, 8).mean(axis=(1, 3))
+        changed = diff > Config.MASK_CELL_THRESHOLD
+        candidates = ~self._static_cells
+        if not candidates.any():
+            return
+
+        # A change over most of the screen is a slide change, not noise
+        if changed[candidates].mean() > Config.MASK_LOCAL_CHANGE_FRACTION:
+            return
+
+        rate = Config.MASK_LEARNING_RATE
+        self.volatility = (1 - rate) * self.volatility + rate * changed
 
 
 # === File Management Module ===
@@ -71,18 +660,296 @@ class FileManager:
     """Handles file operations for saving and renaming images."""
 
     @staticmethod
-    def save_image(image, output_dir=None):
-        """Save an image with a timestamp filename."""
+    def save_image(image, output_dir=None, captured_at=None):
+        """Save an image with a millisecond-resolution timestamp filename."""
         if output_dir is None:
             output_dir = Config.OUTPUT_DIR
+        if captured_at is None:
+            captured_at = time.time()
 
-        timestamp = datetime.now().strftime("%y%m%d-%H%M%S")
+        timestamp = datetime.fromtimestamp(
+            captured_at).strftime("%y%m%d-%H%M%S-%f")[:-3]
         filepath = os.path.join(output_dir, f"{timestamp}.png")
         cv2.imwrite(filepath, image)
         print(f"[+] 🔍 Slide captured: {filepath}")
         return filepath
 
 
+# === Session Store Module ===
+class SessionStore:
+    """Append-only SQLite store for the OCR results of capture sessions.
+
+    Slides are buffered in memory and written in batches. Text is indexed
+    with a contentless FTS5 table so searches across all sessions stay fast
+    without keeping a second copy of the text.
+
+    Consecutive slides of a build sequence share most of their lines, so each
+    slide's text is stored as a line-level delta against the previous slide
+    of the same session and screen (base_id), with a full snapshot every
+    STORE_SNAPSHOT_INTERVAL slides to keep reconstruction chains short.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            started_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS slides (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL REFERENCES sessions(id),
+            captured_at REAL NOT NULL,
+            fingerprint TEXT,
+            text TEXT NOT NULL,
+            thumbnail BLOB,
+            screen INTEGER,
+            base_id INTEGER REFERENCES slides(id)
+        );
+        CREATE INDEX IF NOT EXISTS slides_session_time
+            ON slides (session_id, captured_at);
+        CREATE VIRTUAL TABLE IF NOT EXISTS slides_fts
+            USING fts5(text, content='');
+    """
+
+    def __init__(self, path=None, session_id=None, batch_size=None,
+                 flush_interval=None, snapshot_interval=None):
+        """Open (or create) the store and register a new session."""
+        self.path = path or Config.session_store_path()
+        self.batch_size = batch_size or Config.STORE_BATCH_SIZE
+        self.flush_interval = (Config.STORE_FLUSH_INTERVAL
+                               if flush_interval is None else flush_interval)
+        self.snapshot_interval = (snapshot_interval or
+                                  Config.STORE_SNAPSHOT_INTERVAL)
+        started_at = time.time()
+        # A random suffix keeps runs started in the same millisecond apart
+        self.session_id = session_id or "{}-{}".format(
+            datetime.fromtimestamp(started_at).strftime("%y%m%d-%H%M%S-%f")[:-3],
+            uuid.uuid4().hex[:8])
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        # Writes a partial batch once it is flush_interval seconds old
+        self._flush_timer = None
+        # Last slide written per screen: (id, text, deltas since snapshot)
+        self._chains = {}
+        self._text_cache = OrderedDict()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+        self._add_missing_columns()
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO sessions (id, started_at) VALUES (?, ?)",
+                    (self.session_id, started_at))
+        except sqlite3.IntegrityError:
+            self._conn.close()
+            self._conn = None
+            raise ValueError(f"Session {self.session_id} already exists "
+                             f"in {self.path}") from None
+
+    def _add_missing_columns(self):
+        """Upgrade stores created before a column was added."""
+        columns = {row[1] for row in
+                   self._conn.execute("PRAGMA table_info(slides)")}
+        with self._conn:
+            if "screen" not in columns:
+                self._conn.execute("ALTER TABLE slides ADD COLUMN screen INTEGER")
+            if "base_id" not in columns:
+                # Existing rows keep base_id NULL, i.e. they are full snapshots
+                self._conn.execute("ALTER TABLE slides ADD COLUMN base_id INTEGER"
+                                   " REFERENCES slides(id)")
+
+    @staticmethod
+    def encode_delta(base_text, text):
+        """Encode text as line edits of base_text.
+
+        The delta is a compact JSON list whose items are either [start, end]
+        (copy those lines of the base) or a string (insert it verbatim).
+        """
+        base_lines = base_text.splitlines(keepends=True)
+        lines = text.splitlines(keepends=True)
+        matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+        ops = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([i1, i2])
+            elif j2 > j1:
+                ops.append("".join(lines[j1:j2]))
+        return json.dumps(ops, separators=(",", ":"))
+
+    @staticmethod
+    def apply_delta(base_text, delta):
+        """Rebuild the text encoded by encode_delta from its base text."""
+        base_lines = base_text.splitlines(keepends=True)
+        return "".join("".join(base_lines[op[0]:op[1]]) if isinstance(op, list)
+                       else op for op in json.loads(delta))
+
+    def add(self, captured_at, text, fingerprint=None, thumbnail=None,
+            screen=None):
+        """Buffer one slide, writing the batch once it is full or stale."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._pending.append(
+                (captured_at, fingerprint, text, thumbnail, screen))
+            due = self._last_flush + self.flush_interval - time.monotonic()
+            if len(self._pending) >= self.batch_size or due <= 0:
+                self._flush_locked()
+            elif self._flush_timer is None:
+                timer = threading.Timer(due, self._flush_stale)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+
+    def flush(self):
+        """Write all buffered slides in a single transaction."""
+        with self._lock:
+            if self._conn is not None:
+                self._flush_locked()
+
+    def _flush_stale(self):
+        """Write a partial batch that reached flush_interval without new slides."""
+        with self._lock:
+            if (self._conn is not None and
+                    self._flush_timer is threading.current_thread()):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+
+        chains = dict(self._chains)
+        written = []
+        with self._conn:
+            for captured_at, fingerprint, text, thumbnail, screen in self._pending:
+                stored, base_id, depth = text, None, 0
+                if screen in chains:
+                    previous_id, previous_text, previous_depth = chains[screen]
+                    if previous_depth + 1 < self.snapshot_interval:
+                        delta = self.encode_delta(previous_text, text)
+                        if len(delta) < len(text):
+                            stored, base_id = delta, previous_id
+                            depth = previous_depth + 1
+
+                cursor = self._conn.execute(
+                    "INSERT INTO slides (session_id, captured_at, fingerprint,"
+                    " text, thumbnail, screen, base_id)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.session_id, captured_at, fingerprint, stored,
+                     thumbnail, screen, base_id))
+                self._conn.execute(
+                    "INSERT INTO slides_fts (rowid, text) VALUES (?, ?)",
+                    (cursor.lastrowid, text))
+                chains[screen] = (cursor.lastrowid, text, depth)
+                written.append((cursor.lastrowid, text))
+        # Only advance the chains and cache texts once the rows they refer to
+        # are committed; a rolled-back batch's IDs are reused by the next one
+        self._chains = chains
+        for slide_id, text in written:
+            self._cache_text(slide_id, text)
+        self._pending = []
+
+    def _cache_text(self, slide_id, text):
+        self._text_cache[slide_id] = text
+        self._text_cache.move_to_end(slide_id)
+        while len(self._text_cache) > Config.STORE_TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+
+    def text(self, slide_id):
+        """Return the full OCR text of a slide, reconstructing it if needed."""
+        self.flush()
+        with self._lock:
+            return self._text_locked(slide_id)
+
+    def _text_locked(self, slide_id):
+        # Walk back to the nearest cached text or snapshot, then replay the
+        # deltas forward; chains are at most snapshot_interval long
+        chain = []
+        current = slide_id
+        text = self._text_cache.get(current)
+        while text is None:
+            row = self._conn.execute(
+                "SELECT text, base_id FROM slides WHERE id = ?",
+                (current,)).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown slide: {current}")
+            stored, base_id = row
+            chain.append((current, stored, base_id))
+            if base_id is None:
+                break
+            current = base_id
+            text = self._text_cache.get(current)
+
+        for chain_id, stored, base_id in reversed(chain):
+            text = stored if base_id is None else self.apply_delta(text, stored)
+            self._cache_text(chain_id, text)
+        if not chain:
+            self._text_cache.move_to_end(slide_id)
+        return text
+
+    def slides(self, session_id=None, screen=None):
+        """Return the slides of a session (default: this one) in capture order.
+
+        If a screen index is given, only slides from that monitor are returned.
+        """
+        self.flush()
+        query = ("SELECT id, session_id, captured_at, fingerprint, screen"
+                 " FROM slides WHERE session_id = ?")
+        params = [session_id or self.session_id]
+        if screen is not None:
+            query += " AND screen = ?"
+            params.append(screen)
+        with self._lock:
+            rows = self._conn.execute(
+                query + " ORDER BY captured_at, id", params).fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def search(self, query, limit=20):
+        """Full-text search across all sessions, best matches first."""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.id, s.session_id, s.captured_at, s.fingerprint,"
+                " s.screen"
+                " FROM slides_fts JOIN slides AS s ON s.id = slides_fts.rowid"
+                " WHERE slides_fts MATCH ? ORDER BY rank LIMIT ?",
+                (query, limit)).fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def thumbnail(self, slide_id):
+        """Return the JPEG thumbnail bytes of a slide, or None."""
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT thumbnail FROM slides WHERE id = ?", (slide_id,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        """Flush pending slides and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
+
+    def _row_to_dict(self, row):
+        slide_id, session_id, captured_at, fingerprint, screen = row
+        return {
+            "id": slide_id,
+            "session_id": session_id,
+            "captured_at": captured_at,
+            "fingerprint": fingerprint,
+            "text": self._text_locked(slide_id),
+            "screen": screen,
+        }
+
+
 # === OCR Module ===
 class OCRProcessor:
     """Handles OCR processing of images."""
@@ -94,6 +961,11 @@ class OCRProcessor:
             # Convert to grayscale
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
+            if Config.DETECT_TEXT_REGIONS:
+                region_text = OCRProcessor._process_regions(gray)
+                if region_text and len(region_text) >= Config.MIN_TEXT_LENGTH:
+                    return region_text
+
             # Try standard processing (assuming light background, dark text)
             light_mode_text = OCRProcessor._process_light_mode(gray)
 
@@ -115,6 +987,103 @@ class OCRProcessor:
             print(f"❌ OCR error: {e}")
             return ""
 
+    @staticmethod
+    def detect_text_regions(gray_image):
+        """Find blocks of text with a morphological gradient pre-stage.
+
+        Returns (x, y, width, height, line_height) boxes in reading order.
+        """
+        height, width = gray_image.shape[:2]
+
+        # Text has strong local contrast; Otsu separates it from flat areas,
+        # and the floor keeps noise on empty slides from passing as text
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        gradient = cv2.morphologyEx(gray_image, cv2.MORPH_GRADIENT, kernel)
+        otsu, _ = cv2.threshold(gradient, 0, 255,
+                                cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+        _, binary = cv2.threshold(gradient, max(otsu, 30), 255,
+                                  cv2.THRESH_BINARY)
+
+        # Join the characters of a line into one component
+        line_kernel = cv2.getStructuringElement(
+            cv2.MORPH_RECT, (max(9, width // 100), 1))
+        joined = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, line_kernel)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(joined)
+
+        lines = []
+        for x, y, w, h, area in stats[1:count]:
+            # Drop specks, and components too tall to be a line of text
+            if h < 6 or w < 8 or h > height * 0.2 or area < 0.2 * w * h:
+                continue
+            lines.append((x, y, w, h))
+        if not lines:
+            return []
+
+        # Merge lines separated by less than a line height into blocks
+        line_height = int(np.median([h for _, _, _, h in lines]))
+        mask = np.zeros_like(binary)
+        for x, y, w, h in lines:
+            mask[y:y + h, x:x + w] = 255
+        block_kernel = cv2.getStructuringElement(
+            cv2.MORPH_RECT, (line_height, line_height))
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, block_kernel)
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(mask)
+
+        heights = [[] for _ in range(count)]
+        for x, y, w, h in lines:
+            heights[labels[y + h // 2, x + w // 2]].append(h)
+
+        regions = []
+        for label in range(1, count):
+            x, y, w, h, _ = stats[label]
+            block_line_height = (int(np.median(heights[label]))
+                                 if heights[label] else line_height)
+            regions.append((x, y, w, h, block_line_height))
+        return sorted(regions, key=lambda region: (region[1], region[0]))
+
+    @staticmethod
+    def _ocr_region(gray_image, region):
+        """OCR one text block, scaled to tesseract's preferred line height."""
+        x, y, w, h, line_height = region
+        pad = max(4, line_height // 4)
+        crop = gray_image[max(0, y - pad):y + h + pad,
+                          max(0, x - pad):x + w + pad]
+
+        scale = min(4.0, max(0.5, Config.OCR_LINE_HEIGHT / line_height))
+        if scale != 1.0:
+            interpolation = cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA
+            crop = cv2.resize(crop, None, fx=scale, fy=scale,
+                              interpolation=interpolation)
+
+        # Blocks are binarized on their own, so light-on-dark text is
+        # inverted per block rather than by a second pass over the slide
+        if crop.mean() < 128:
+            crop = cv2.bitwise_not(crop)
+        _, binary = cv2.threshold(crop, 0, 255,
+                                  cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+        # Page segmentation mode 6: a single uniform block of text
+        return pytesseract.image_to_string(binary,
+                                           config='--psm 6 --oem 3 -l eng')
+
+    @staticmethod
+    def _process_regions(gray_image):
+        """OCR the detected text blocks in parallel.
+
+        Returns None when the whole image should be OCRed instead.
+        """
+        regions = OCRProcessor.detect_text_regions(gray_image)
+        covered = sum(w * h for _, _, w, h, _ in regions)
+        if (not regions or
+                covered > Config.MAX_TEXT_REGION_FRACTION * gray_image.size):
+            return None
+
+        workers = max(1, min(Config.OCR_REGION_WORKERS, len(regions)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            texts = pool.map(lambda region: OCRProcessor._ocr_region(
+                gray_image, region), regions)
+            return "\n\n".join(text.strip() for text in texts if text.strip())
+
     @staticmethod
     def _process_light_mode(gray_image):
         """Process image assuming light background with dark text."""
@@ -182,109 +1151,231 @@ class OCRProcessor:
 
 
 # === Slide Capture Application ===
+class OCRJob:
+    """A captured slide waiting in the OCR queue."""
+
+    def __init__(self, screen_index, captured_at, image):
+        """Initialize a job that has neither started nor been cancelled."""
+        self.screen_index = screen_index
+        self.captured_at = captured_at
+        self.image = image
+        self.nbytes = image.nbytes
+        self.started = False
+        self.cancelled = False
+
+    def cancel(self):
+        """Skip this job and release its image."""
+        self.cancelled = True
+        self.image = None
+
+
 class SlideCapture:
     """Main application class that coordinates the slide capture process."""
 
-    def __init__(self):
-        """Initialize the slide capture application."""
+    def __init__(self, store=None, screen_indices=None, source=None,
+                 text_extractor=None):
+        """Initialize the slide capture application.
+
+        text_extractor defaults to OCRProcessor.extract_text_from_image.
+        """
+        self.source = source or ScreenFrameSource(screen_indices)
+        self.text_extractor = text_extractor
+        self.screen_indices = self.source.screens
         self.ocr_queue = queue.Queue(maxsize=Config.OCR_QUEUE_SIZE)
-        self.last_image = None
-        self.ocr_thread = None
+        # Change detection is independent for every monitor
+        self.detectors = {index: ChangeDetector()
+                          for index in self.screen_indices}
+        self.ocr_threads = []
+        self.resources = None
+        self.store = store
+        self.frames_sampled = 0
+        self.slides_captured = 0
+        self.slides_cancelled = 0
+        self.slides_dropped = 0
+        # Bytes of the frames held by queued and running OCR jobs
+        self.inflight_bytes = 0
+        # Newest job per monitor, cancelled if replaced before OCR starts
+        self._latest_jobs = {}
+        self._jobs_lock = threading.Lock()
 
     def start(self):
         """Start the slide capture application."""
+        return self.run(Config.MAX_FRAMES, Config.MAX_DURATION)
+
+    def run(self, max_frames=None, max_duration=None):
+        """Capture slides until the source ends or a limit is reached.
+
+        Args:
+            max_frames (int, optional): Stop after this many samples
+            max_duration (float, optional): Stop after this many seconds of
+                source time
+
+        Returns:
+            dict: Frames sampled, slides captured and wall-clock seconds
+        """
         print("🔍 Starting slide capture...")
+        started = time.monotonic()
 
         # Initialize configuration
         Config.initialize()
+        if self.store is None:
+            self.store = SessionStore()
+        print(f"🗄️ Writing session {self.store.session_id} to {self.store.path}")
+
+        # Divide the CPUs so OpenCV and tesseract threads of all OCR workers
+        # together do not oversubscribe the machine
+        if ResourceBudget is not None:
+            # Each worker runs up to OCR_REGION_WORKERS tesseract processes
+            # at once, which share its thread limit
+            region_workers = (Config.OCR_REGION_WORKERS
+                              if Config.DETECT_TEXT_REGIONS else 1)
+            self.resources = ResourceBudget(
+                workers=Config.OCR_WORKERS, pin=Config.PIN_OCR_WORKERS,
+                processes_per_worker=region_workers)
+            self.resources.apply()
 
-        # Start OCR worker thread
-        self.ocr_thread = threading.Thread(
-            target=self._ocr_worker, daemon=True)
-        self.ocr_thread.start()
+        # Start the OCR worker pool shared by all monitors
+        for worker_index in range(Config.OCR_WORKERS):
+            thread = threading.Thread(target=self._ocr_worker,
+                                      args=(worker_index,), daemon=True)
+            thread.start()
+            self.ocr_threads.append(thread)
 
-        self._main_loop()
+        try:
+            self._main_loop(max_frames, max_duration)
+            # Let the OCR pool finish the slides still queued
+            self.ocr_queue.join()
+        except KeyboardInterrupt:
+            print("🛑 Stopping slide capture...")
+        finally:
+            self.store.close()
+
+        stats = {
+            "frames": self.frames_sampled,
+            "slides": self.slides_captured,
+            "cancelled": self.slides_cancelled,
+            "dropped": self.slides_dropped,
+            "seconds": time.monotonic() - started,
+        }
+        print(f"✅ Sampled {stats['frames']} frames, captured "
+              f"{stats['slides']} slides ({stats['cancelled']} replaced before "
+              f"OCR) in {stats['seconds']:.1f}s")
+        return stats
 
-    def _main_loop(self):
+    def _main_loop(self, max_frames=None, max_duration=None):
         """Main loop for capturing and processing slides."""
-        while True:
-            current_image = ScreenCapture.capture_screen()
-
-            if self.last_image is None:
-                self._process_new_slide(current_image)
-            else:
-                # Check image similarity
-                similarity = ImageProcessor.image_similarity(
-                    current_image, self.last_image)
-
-                if similarity < Config.SSIM_THRESHOLD:
-                    print(
-                        f"📝 New slide detected: similarity is {similarity:.2f}")
-                    self._process_new_slide(current_image)
-                else:
-                    print(f"📋 Skipped: similarity is {similarity:.2f}")
+        first_timestamp = None
+        try:
+            for timestamp, frames in self.source:
+                if first_timestamp is None:
+                    first_timestamp = timestamp
+                for screen_index, current_image in frames.items():
+                    self._check_frame(screen_index, current_image, timestamp)
+                # Sample faster while a change settles
+                self.source.settling = any(detector.settling for detector
+                                           in self.detectors.values())
+
+                self.frames_sampled += 1
+                if max_frames and self.frames_sampled >= max_frames:
+                    return
+                if max_duration and timestamp - first_timestamp >= max_duration:
+                    return
+        finally:
+            # The last state of each screen stays up until the end
+            for screen_index, detector in self.detectors.items():
+                if detector.confirm_pending():
+                    self._process_new_slide(detector.reference, screen_index,
+                                            detector.changed_at)
 
-            time.sleep(Config.CAPTURE_INTERVAL)
+    def _check_frame(self, screen_index, current_image, captured_at=None):
+        """Compare a monitor's frame to its last slide and queue settled changes."""
+        if captured_at is None:
+            captured_at = time.time()
+        detector = self.detectors[screen_index]
+        label = self._screen_label(screen_index)
 
-    def _process_new_slide(self, image):
+        # Check image similarity outside masked regions; sources whose
+        # frames are final are not waited on to settle
+        status, similarity = detector.update(
+            current_image, captured_at,
+            settled=getattr(self.source, "settled", False))
+
+        if status == ChangeDetector.NEW:
+            print(f"📝 New slide detected{label}: similarity is {similarity:.2f}")
+            self._process_new_slide(detector.reference, screen_index,
+                                    detector.changed_at)
+        elif status == ChangeDetector.SETTLING:
+            print(f"⏳ Waiting for the change to settle{label}...")
+        else:
+            print(f"📋 Skipped{label}: similarity is {similarity:.2f}")
+
+    def _screen_label(self, screen_index):
+        """Return a monitor suffix for log lines when watching several."""
+        if len(self.screen_indices) == 1:
+            return ""
+        return f" on monitor {screen_index}"
+
+    def _process_new_slide(self, image, screen_index=None, captured_at=None):
         """Process a new slide image."""
-        filepath = FileManager.save_image(image)
-        self.last_image = image
+        if captured_at is None:
+            captured_at = time.time()
+        self.slides_captured += 1
+
+        # Images only go to disk when they are kept after OCR
+        if not Config.DELETE_IMAGES_AFTER_OCR:
+            FileManager.save_image(image, captured_at=captured_at)
+
+        # A slide replaced this quickly was a step of an animation or build;
+        # skip its OCR if no worker has picked it up yet
+        job = OCRJob(screen_index, captured_at, image)
+        with self._jobs_lock:
+            previous = self._latest_jobs.get(screen_index)
+            # Jobs without an image were cancelled or dropped already
+            if (previous is not None and not previous.started and
+                    previous.image is not None and
+                    captured_at - previous.captured_at <
+                    Config.min_slide_duration()):
+                previous.cancel()
+                self.inflight_bytes -= previous.nbytes
+                self.slides_cancelled += 1
+                print(f"⏭️ Cancelled OCR of a slide replaced after "
+                      f"{captured_at - previous.captured_at:.2f}s")
+
+            if (self.inflight_bytes + job.nbytes >
+                    Config.MAX_INFLIGHT_MB * 1024 * 1024):
+                self.slides_dropped += 1
+                print("⚠️ Frames waiting for OCR exceed MAX_INFLIGHT_MB, "
+                      "skipping OCR for this image")
+                return
+            self.inflight_bytes += job.nbytes
+            self._latest_jobs[screen_index] = job
 
         # Add to OCR queue for processing
         try:
-            self.ocr_queue.put((filepath, image), block=False)
+            self.ocr_queue.put(job, block=False)
         except queue.Full:
             print("⚠️ OCR queue is full, skipping OCR for this image")
+            self._release(job)
 
-    def _ocr_worker(self):
+    def _ocr_worker(self, worker_index=None):
         """Worker thread for OCR processing."""
         print("🔍 Starting OCR worker thread...")
+        if self.resources is not None and worker_index is not None:
+            self.resources.apply(worker_index)
 
         while True:
             try:
-                filepath, image = self.ocr_queue.get()
-                filename = os.path.basename(filepath)
-
+                job = self.ocr_queue.get()
                 try:
-                    print(f"🔤 Processing OCR for {filename}...")
-                    text = OCRProcessor.extract_text_from_image(image)
-
-                    if text:
-                        # Save OCR text to file with same name + _OCR
-                        base_name = os.path.splitext(filepath)[0]
-                        ocr_filepath = f"{base_name}_OCR.txt"
-
-                        with open(ocr_filepath, 'w') as f:
-                            f.write(text)
-
-                        print(f"📝 OCR text saved to {ocr_filepath}")
-
-                        # Delete the image file if configured to do so
-                        if Config.DELETE_IMAGES_AFTER_OCR:
-                            try:
-                                os.remove(filepath)
-                                print(f"🗑️ Deleted image file: {filename}")
-                            except Exception as e:
-                                print(
-                                    f"⚠️ Failed to delete image {filename}: {e}")
-                    else:
-                        print(f"⚠️ No text extracted from {filename}")
-                        if Config.DELETE_IMAGES_AFTER_OCR:
-                            try:
-                                os.remove(filepath)
-                                print(f"🗑️ Deleted image file: {filename}")
-                            except Exception as e:
-                                print(
-                                    f"⚠️ Failed to delete image {filename}: {e}")
-                except Exception as e:
-                    print(f"❌ Error processing {filename}: {e}")
-                    if Config.DELETE_IMAGES_AFTER_OCR:
-                        try:
-                            os.remove(filepath)
-                            print(f"🗑️ Deleted image file: {filename}")
-                        except Exception as e:
-                            print(f"⚠️ Failed to delete image {filename}: {e}")
+                    with self._jobs_lock:
+                        if job.cancelled:
+                            continue
+                        job.started = True
+                    try:
+                        self._store_ocr_result(job.screen_index,
+                                               job.captured_at, job.image)
+                    finally:
+                        self._release(job)
                 finally:
                     self.ocr_queue.task_done()
             except Exception as e:
@@ -292,12 +1383,102 @@ class SlideCapture:
                 # Prevent tight loop in case of persistent errors
                 time.sleep(1)
 
+    def _release(self, job):
+        """Drop a finished job's frame from the in-flight total."""
+        with self._jobs_lock:
+            if job.image is not None:
+                self.inflight_bytes -= job.nbytes
+                job.image = None
+
+    def _store_ocr_result(self, screen_index, captured_at, image):
+        """Run OCR on a captured slide and append the result to the store."""
+        label = datetime.fromtimestamp(captured_at).strftime("%H:%M:%S.%f")[:-3]
+        label += self._screen_label(screen_index)
+        print(f"🔤 Processing OCR for slide captured at {label}...")
+        extract_text = (self.text_extractor or
+                        OCRProcessor.extract_text_from_image)
+        text = extract_text(image)
+
+        if not text:
+            print(f"⚠️ No text extracted from slide captured at {label}")
+            return
+
+        thumbnail = (ImageProcessor.encode_thumbnail(image)
+                     if Config.STORE_THUMBNAILS else None)
+        self.store.add(captured_at, text,
+                       fingerprint=ImageProcessor.fingerprint(image),
+                       thumbnail=thumbnail, screen=screen_index)
+        print(f"📝 OCR text stored for slide captured at {label}")
 
-def main():
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Capture slides from screens, videos or screenshots and OCR them"
+    )
+
+    parser.add_argument("--config", help="TOML file overriding the default settings")
+    parser.add_argument("--source", choices=["screen", "video", "images"],
+                        help="Where frames come from (default: screen)")
+    parser.add_argument("--input", dest="source_path",
+                        help="Video file or screenshot directory for the source")
+    parser.add_argument("--screens", dest="screen_indices", type=int, nargs="+",
+                        help="Monitor indices to watch (see view-screen-indexes.py)")
+    parser.add_argument("--interval", dest="capture_interval", type=float,
+                        help="Seconds between samples")
+    parser.add_argument("--threshold", dest="ssim_threshold", type=float,
+                        help="SSIM below which a frame is a new slide")
+    parser.add_argument("--settle-samples", type=int,
+                        help="Consecutive still samples before a change is captured")
+    parser.add_argument("--settle-ms", type=float,
+                        help="Milliseconds the screen must stay still before capture")
+    parser.add_argument("--ocr-workers", type=int, help="Number of OCR threads")
+    parser.add_argument("--queue-size", dest="ocr_queue_size", type=int,
+                        help="Maximum number of slides waiting for OCR")
+    parser.add_argument("--store", dest="session_store_path",
+                        help="SQLite session store to write to")
+    parser.add_argument("--store-batch-size", type=int,
+                        help="Slides buffered before each store write")
+    parser.add_argument("--output-dir", help="Directory for the store and kept images")
+    parser.add_argument("--max-frames", type=int, help="Stop after this many samples")
+    parser.add_argument("--duration", dest="max_duration", type=float,
+                        help="Stop after this many seconds of source time")
+    parser.add_argument("--dark-mode", dest="try_dark_mode", action="store_true",
+                        default=None, help="Also try dark mode OCR processing")
+
+    return parser.parse_args(argv)
+
+
+def configure(args):
+    """Apply the configuration file, then command-line overrides, to Config."""
+    if args.config:
+        Config.load(args.config)
+
+    overrides = {key: value for key, value in vars(args).items()
+                 if key != "config" and value is not None}
+    Config.update(overrides)
+
+
+def main(argv=None):
     """Main entry point for the application."""
-    app = SlideCapture()
+    args = parse_args(argv)
+
+    try:
+        configure(args)
+        source = create_frame_source()
+    except (OSError, ValueError, tomllib.TOMLDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    app = SlideCapture(source=source)
     app.start()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
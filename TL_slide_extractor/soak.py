@@ -0,0 +1,320 @@
+"""Long-run soak test for the slide capture pipeline.
+
+Drives SlideCapture from a synthetic lecture (slide builds, fades and a
+playing video in one corner) for hours of simulated time, as fast as the
+pipeline can go, while tracking RSS and tracemalloc. The run fails if
+memory grows past a budget once the warm-up is over.
+
+    python TL_slide_extractor/soak.py --hours 4 --budget-mb 64
+"""
+
+import argparse
+import contextlib
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+# Allow running as a script from anywhere in the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from TL_slide_extractor.slide_extractor import (  # noqa: E402
+    Config,
+    ImageProcessor,
+    SessionStore,
+    SlideCapture,
+)
+
+
+# === Synthetic Source ===
+class SyntheticFrameSource:
+    """Replays a synthetic lecture without waiting between samples.
+
+    Every deck has BUILD_STEPS slides that reveal one more bullet and chart
+    bar each, and each slide fades in over fade_seconds. Like the screen
+    source, samples are taken every Config.SETTLE_INTERVAL seconds while
+    settling is set.
+    """
+
+    BUILD_STEPS = 4
+    settling = False
+
+    def __init__(self, duration, interval=None, slide_seconds=30,
+                 size=(640, 360), fade_seconds=1.0, on_sample=None, seed=0):
+        """Initialize a source lasting duration seconds of simulated time."""
+        self.duration = duration
+        self.interval = Config.CAPTURE_INTERVAL if interval is None else interval
+        self.slide_seconds = slide_seconds
+        self.width, self.height = size
+        self.fade_seconds = fade_seconds
+        self.on_sample = on_sample
+        self.screens = [None]
+        self._rng = np.random.default_rng(seed)
+        self._slides = {}
+
+    def _slide(self, number):
+        """Render a slide, keeping only the two most recent ones."""
+        if number not in self._slides:
+            deck, step = divmod(number, self.BUILD_STEPS)
+            image = np.full((self.height, self.width, 3), 255, dtype=np.uint8)
+            scale = self.height / 360
+            cv2.putText(image, f"Section {deck}: synthetic lecture",
+                        (int(20 * scale), int(50 * scale)),
+                        cv2.FONT_HERSHEY_SIMPLEX, scale, (0, 0, 0), 2)
+            for bullet in range(step + 1):
+                cv2.putText(image, f"- point {bullet} of section {deck}",
+                            (int(30 * scale), int((110 + 50 * bullet) * scale)),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (0, 0, 0), 2)
+                # One more bar of a bar chart on the right half
+                left = self.width // 2 + bullet * self.width // 8
+                for y in range(self.height // 4, self.height * 3 // 4, 4):
+                    cv2.line(image, (left, y), (left + self.width // 10, y),
+                             (60 * bullet, 120, 200), 2)
+            self._slides = {key: value for key, value in self._slides.items()
+                            if key == number - 1}
+            self._slides[number] = image
+        return self._slides[number]
+
+    def frame_at(self, t):
+        """Render the screen at t seconds into the lecture."""
+        number, offset = divmod(t, self.slide_seconds)
+        number = int(number)
+        frame = self._slide(number).copy()
+        if number > 0 and offset < self.fade_seconds:
+            alpha = offset / self.fade_seconds
+            frame = cv2.addWeighted(self._slide(number - 1), 1 - alpha,
+                                    frame, alpha, 0)
+
+        # A playing video in the bottom-right corner
+        h, w = self.height // 4, self.width // 4
+        frame[-h:, -w:] = self._rng.integers(0, 255, (h, w, 3), dtype=np.uint8)
+        return frame
+
+    def __iter__(self):
+        """Yield (timestamp, {None: image}) until the duration is reached."""
+        started = time.time()
+        t = 0.0
+        index = 0
+        while t <= self.duration:
+            if self.on_sample is not None:
+                self.on_sample(index, t)
+            yield started + t, {None: self.frame_at(t)}
+            t += Config.SETTLE_INTERVAL if self.settling else self.interval
+            index += 1
+
+
+def synthetic_ocr(image):
+    """Stand-in for tesseract: a few lines that depend on the image."""
+    fingerprint = ImageProcessor.fingerprint(image)
+    lines = [f"Slide {fingerprint}"]
+    lines += [f"- bullet {i} of a synthetic slide" for i in range(10)]
+    return "\n".join(lines)
+
+
+# === Memory Monitoring ===
+def current_rss():
+    """Return the resident set size of this process in bytes.
+
+    Reads /proc on Linux; elsewhere falls back to the peak RSS reported by
+    getrusage, which can only detect growth, not shrinking.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryMonitor:
+    """Samples RSS and tracemalloc and checks growth against a budget."""
+
+    def __init__(self, budget_mb):
+        """Initialize a monitor allowing budget_mb of growth after warm-up."""
+        self.budget = budget_mb * 1024 * 1024
+        self.samples = []
+        self.baseline = None
+        self._baseline_snapshot = None
+
+    def start(self):
+        """Start tracing Python allocations."""
+        tracemalloc.start()
+
+    def stop(self):
+        """Stop tracing Python allocations."""
+        tracemalloc.stop()
+
+    def sample(self, t):
+        """Record memory use at simulated time t."""
+        traced, _ = tracemalloc.get_traced_memory()
+        self.samples.append((t, current_rss(), traced))
+
+    def set_baseline(self, t):
+        """Take the memory use at the end of the warm-up as the baseline."""
+        # The snapshot itself takes tens of MB, so measure RSS after it
+        self._baseline_snapshot = tracemalloc.take_snapshot()
+        self.sample(t)
+        self.baseline = self.samples[-1]
+
+    def growth(self):
+        """Return the largest (RSS, traced) growth over the baseline in bytes."""
+        if self.baseline is None:
+            return 0, 0
+        after = [sample for sample in self.samples
+                 if sample[0] >= self.baseline[0]]
+        return (max(rss for _, rss, _ in after) - self.baseline[1],
+                max(traced for _, _, traced in after) - self.baseline[2])
+
+    def passed(self):
+        """Check that neither RSS nor traced memory grew past the budget."""
+        return all(grown <= self.budget for grown in self.growth())
+
+    def top_growth(self, limit=10):
+        """Describe the source lines whose allocations grew the most."""
+        if self._baseline_snapshot is None:
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(
+            self._baseline_snapshot, "lineno")
+        return [str(stat) for stat in stats[:limit]]
+
+
+# === Soak Run ===
+def run_soak(hours=1.0, interval=None, slide_seconds=30, size=(640, 360),
+             budget_mb=64, warmup_fraction=0.1, samples=50, real_ocr=False,
+             store_path=None, verbose=False):
+    """Run the pipeline over a synthetic lecture and check its memory.
+
+    Args:
+        hours (float): Simulated length of the lecture
+        interval (float, optional): Seconds between samples
+            (default: Config.CAPTURE_INTERVAL)
+        slide_seconds (float): How long each slide stays up
+        size (tuple): Frame (width, height)
+        budget_mb (float): Allowed RSS and tracemalloc growth after warm-up
+        warmup_fraction (float): Share of the run before the baseline is taken
+        samples (int): Number of memory samples over the run
+        real_ocr (bool): Use tesseract instead of a fast stand-in
+        store_path (str, optional): Session store to write to
+            (default: a temporary file)
+        verbose (bool): Keep the pipeline's per-frame log lines
+
+    Returns:
+        dict: Pipeline stats, memory growth and whether the run passed
+    """
+    duration = hours * 3600
+    monitor = MemoryMonitor(budget_mb)
+    warmup = duration * warmup_fraction
+    sample_every = max(duration / samples, 1e-9)
+    state = {"next": 0.0}
+
+    def on_sample(index, t):
+        if monitor.baseline is None and t >= warmup:
+            monitor.set_baseline(t)
+        elif t >= state["next"]:
+            monitor.sample(t)
+        else:
+            return
+        state["next"] = t + sample_every
+
+    source = SyntheticFrameSource(duration, interval=interval,
+                                  slide_seconds=slide_seconds, size=size,
+                                  on_sample=on_sample)
+
+    # The run redirects output to a temporary directory; put the settings
+    # back afterwards so callers keep their own
+    saved = {key: getattr(Config, key)
+             for key in ("OUTPUT_DIR", "DELETE_IMAGES_AFTER_OCR")}
+    with tempfile.TemporaryDirectory() as temp_dir, \
+            open(os.devnull, "w") as devnull:
+        monitor.start()
+        try:
+            Config.OUTPUT_DIR = temp_dir
+            Config.DELETE_IMAGES_AFTER_OCR = True
+            store = SessionStore(store_path or os.path.join(temp_dir, "soak.db"))
+            app = SlideCapture(store=store, source=source,
+                               text_extractor=None if real_ocr else synthetic_ocr)
+
+            output = contextlib.nullcontext() if verbose else \
+                contextlib.redirect_stdout(devnull)
+            with output:
+                stats = app.run()
+            monitor.sample(duration)
+            rss_growth, traced_growth = monitor.growth()
+            result = dict(stats,
+                          simulated_seconds=duration,
+                          rss_growth_mb=rss_growth / 1024 / 1024,
+                          traced_growth_mb=traced_growth / 1024 / 1024,
+                          inflight_bytes=app.inflight_bytes,
+                          passed=monitor.passed(),
+                          top_growth=[] if monitor.passed() else monitor.top_growth())
+        finally:
+            monitor.stop()
+            for key, value in saved.items():
+                setattr(Config, key, value)
+    return result
+
+
+def parse_args(argv=None):
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Soak-test the slide pipeline with a synthetic lecture"
+    )
+    parser.add_argument("--config", help="TOML file overriding the default settings")
+    parser.add_argument("--hours", type=float, default=1.0,
+                        help="Simulated lecture length (default: 1)")
+    parser.add_argument("--interval", type=float, help="Seconds between samples")
+    parser.add_argument("--slide-seconds", type=float, default=30,
+                        help="How long each slide stays up (default: 30)")
+    parser.add_argument("--size", default="640x360",
+                        help="Frame size as WIDTHxHEIGHT (default: 640x360)")
+    parser.add_argument("--budget-mb", type=float, default=64,
+                        help="Allowed memory growth after warm-up (default: 64)")
+    parser.add_argument("--ocr", action="store_true",
+                        help="Run tesseract instead of a fast stand-in")
+    parser.add_argument("--store", help="Session store to write to")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show the pipeline's log lines")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the soak test and report whether memory stayed in budget."""
+    args = parse_args(argv)
+    if args.config:
+        Config.load(args.config)
+    width, height = (int(value) for value in args.size.lower().split("x"))
+
+    print(f"🧪 Soak-testing {args.hours:g} simulated hours "
+          f"at {width}x{height}...")
+    result = run_soak(hours=args.hours, interval=args.interval,
+                      slide_seconds=args.slide_seconds, size=(width, height),
+                      budget_mb=args.budget_mb, real_ocr=args.ocr,
+                      store_path=args.store, verbose=args.verbose)
+
+    print(f"📊 {result['frames']} frames, {result['slides']} slides "
+          f"({result['cancelled']} cancelled, {result['dropped']} dropped) in "
+          f"{result['seconds']:.1f}s, "
+          f"{result['simulated_seconds'] / result['seconds']:.0f}x real time")
+    print(f"📈 Growth after warm-up: RSS {result['rss_growth_mb']:.1f} MB, "
+          f"traced {result['traced_growth_mb']:.1f} MB "
+          f"(budget {args.budget_mb:g} MB)")
+    if not result["passed"]:
+        print("❌ Memory grew past the budget. Largest growth:")
+        for line in result["top_growth"]:
+            print(f"   {line}")
+        return 1
+    print("✅ Memory stayed within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,24 @@ import argparse
 import os
 import sys
 from transcription_app.core.transcriber import Transcriber
-from transcription_app.config.settings import MODEL_SIZES, DEFAULT_MODEL_SIZE
+from transcription_app.core.backends import create_backend_factory
+from transcription_app.core.audio_cache import AudioCache
+from transcription_app.core.extractors import FFmpegAudioExtractor
+from transcription_app.core.ingest import IngestDaemon, ocr_screenshot
+from transcription_app.core.job_queue import JobQueue, QueueWorker
+from transcription_app.config.resources import ResourceBudget
+from transcription_app.config.presets import AUTO, choose_preset, decode_options, get_preset
+from transcription_app.utils.file_utils import get_base_filename
+from transcription_app.config.settings import (
+    MODEL_SIZES,
+    DEFAULT_MODEL_SIZE,
+    BACKENDS,
+    DEFAULT_BACKEND,
+    AUDIO_CACHE_DIR,
+    AUDIO_CACHE_MAX_BYTES,
+    PRESETS,
+    DEFAULT_TARGET_SECONDS,
+)
 
 
 def parse_args():
@@ -22,14 +39,147 @@ def parse_args():
     
     parser.add_argument(
         "file",
+        nargs="?",
         help="Path to the audio or video file to transcribe"
     )
     
+    parser.add_argument(
+        "--watch",
+        action="append",
+        metavar="DIR",
+        help="Run as an ingest daemon transcribing files dropped into DIR. "
+             "Repeat for several directories; earlier ones have priority."
+    )
+    
+    parser.add_argument(
+        "--state",
+        default="ingest_state.json",
+        help="Ingest daemon state file recording processed files "
+             "(default: ingest_state.json)"
+    )
+    
+    parser.add_argument(
+        "--queue",
+        metavar="DB",
+        help="Job queue database shared by workers, e.g. on a network share. "
+             "Alone, prints the number of jobs by status."
+    )
+    
+    parser.add_argument(
+        "--enqueue",
+        nargs="+",
+        metavar="FILE",
+        help="Add files to the --queue"
+    )
+    
+    parser.add_argument(
+        "--work",
+        action="store_true",
+        help="Run a worker transcribing jobs from the --queue until interrupted"
+    )
+    
+    parser.add_argument(
+        "--until-empty",
+        action="store_true",
+        help="Worker: exit once no job is queued or running"
+    )
+    
+    parser.add_argument(
+        "--output-dir",
+        help="Ingest daemon or --enqueue output directory (default: next to each input file)"
+    )
+    
+    parser.add_argument(
+        "--ocr-screenshots",
+        action="store_true",
+        help="Ingest daemon: also OCR images dropped into watched directories"
+    )
+    
     parser.add_argument(
         "--model",
         choices=MODEL_SIZES,
-        default=DEFAULT_MODEL_SIZE,
-        help=f"Whisper model size to use (default: {DEFAULT_MODEL_SIZE})"
+        help=f"Whisper model size to use (default: the preset's, or {DEFAULT_MODEL_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--preset",
+        choices=list(PRESETS) + [AUTO],
+        help="Set model size, beam size, temperature fallback and "
+             "condition-on-previous-text together; auto picks the most "
+             "accurate preset expected to finish within --target-time"
+    )
+    
+    parser.add_argument(
+        "--target-time",
+        type=float,
+        metavar="SECONDS",
+        help=f"Turnaround --preset auto aims for (default: {DEFAULT_TARGET_SECONDS})"
+    )
+    
+    parser.add_argument(
+        "--language",
+        help="Language code of the audio, e.g. en; skips language detection"
+    )
+    
+    parser.add_argument(
+        "--refine-model",
+        choices=MODEL_SIZES,
+        help="Two-pass mode: draft with --model, then re-decode low-confidence "
+             "segments with this larger model"
+    )
+    
+    parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help="Use a dynamically int8-quantized model for faster CPU inference"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=DEFAULT_BACKEND,
+        help=f"Inference backend (default: {DEFAULT_BACKEND})"
+    )
+    
+    parser.add_argument(
+        "--compute-type",
+        help="Backend compute type: float32 or int8 for whisper; int8 "
+             "(default), int8_float32, float32, ... for faster-whisper"
+    )
+    
+    parser.add_argument(
+        "--audio-cache",
+        nargs="?",
+        const=AUDIO_CACHE_DIR,
+        metavar="DIR",
+        help=f"Cache decoded audio so reruns skip ffmpeg (default DIR: {AUDIO_CACHE_DIR})"
+    )
+    
+    parser.add_argument(
+        "--audio-cache-size",
+        type=float,
+        default=AUDIO_CACHE_MAX_BYTES / 1024 ** 3,
+        metavar="GB",
+        help=f"Audio cache size budget (default: {AUDIO_CACHE_MAX_BYTES / 1024 ** 3:g} GB)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of transcriptions sharing this machine's CPUs (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--worker-index",
+        type=int,
+        help="Which share of the CPUs this process uses (0 to workers - 1)"
+    )
+    
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        help="Pin this process to its share of the CPUs (needs --worker-index)"
     )
     
     parser.add_argument(
@@ -37,13 +187,152 @@ def parse_args():
         help="Path to save the transcription (default: input filename with .txt extension)"
     )
     
+    parser.add_argument(
+        "--segments",
+        help="Also save timestamped segments as JSON to this path"
+    )
+    
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Enable verbose output"
     )
     
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.file and not args.watch and not args.queue:
+        parser.error("a file to transcribe, --watch or --queue is required")
+    if (args.enqueue or args.work) and not args.queue:
+        parser.error("--enqueue and --work need --queue")
+    if args.preset == AUTO and not (args.file and not args.watch and not args.queue):
+        parser.error("--preset auto needs a single file to measure")
+    return args
+
+
+def resolve_preset(args):
+    """
+    Fill in the model size and decode options from --preset and --language.
+    
+    An explicit --model takes precedence over the preset's model.
+    
+    Returns:
+        str: Name of the preset used, or None
+    """
+    name = args.preset
+    if name == AUTO:
+        duration = FFmpegAudioExtractor().get_duration(args.file)
+        name = choose_preset(duration, args.target_time)
+    
+    preset = get_preset(name) if name else {}
+    args.model = args.model or preset.get("model", DEFAULT_MODEL_SIZE)
+    args.decode_options = decode_options(preset, args.language)
+    return name
+
+
+def create_transcriber(args, resources, worker_index):
+    """
+    Create a Transcriber configured from the command-line arguments.
+    
+    Returns:
+        Transcriber: The configured transcriber
+    """
+    model_factory = None
+    if args.backend != "whisper" or args.compute_type:
+        compute_type = args.compute_type or ("int8" if args.quantize else None)
+        model_factory = create_backend_factory(
+            args.backend,
+            compute_type=compute_type,
+            cpu_threads=resources.threads_for(worker_index),
+        )
+    
+    audio_cache = None
+    if args.audio_cache:
+        audio_cache = AudioCache(args.audio_cache, int(args.audio_cache_size * 1024 ** 3))
+    
+    return Transcriber(
+        model_size=args.model,
+        model_factory=model_factory,
+        quantize=args.quantize,
+        resources=resources,
+        worker_index=worker_index,
+        refine_model_size=args.refine_model,
+        audio_cache=audio_cache,
+        decode_options=args.decode_options,
+    )
+
+
+def run_ingest(args):
+    """
+    Run the watch-folder ingest daemon until interrupted.
+    
+    Returns:
+        int: Exit code
+    """
+    for directory in args.watch:
+        if not os.path.isdir(directory):
+            print(f"Error: Directory not found: {directory}", file=sys.stderr)
+            return 1
+    
+    # --workers is the number of warm transcription workers in this process
+    resources = ResourceBudget(workers=args.workers, pin=args.pin_cpus)
+    daemon = IngestDaemon(
+        args.watch,
+        args.state,
+        transcriber_factory=lambda index: create_transcriber(args, resources, index),
+        output_dir=args.output_dir,
+        workers=args.workers,
+        screenshot_handler=ocr_screenshot if args.ocr_screenshots else None,
+    )
+    
+    print(f"Watching {', '.join(args.watch)} with {args.workers} worker(s)...")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_queue(args):
+    """
+    Add files to the job queue, run a queue worker, or report the queue.
+    
+    Returns:
+        int: Exit code
+    """
+    job_queue = JobQueue(args.queue)
+    
+    for file_path in args.enqueue or []:
+        if not os.path.exists(file_path):
+            print(f"Error: File not found: {file_path}", file=sys.stderr)
+            return 1
+        output_path = None
+        if args.output_dir:
+            output_path = os.path.join(args.output_dir, get_base_filename(file_path) + ".txt")
+        job_id = job_queue.enqueue(file_path, output_path)
+        if job_id is None:
+            print(f"Already queued or done: {file_path}")
+        else:
+            print(f"Queued job {job_id}: {file_path}")
+    
+    if args.work:
+        resources = ResourceBudget(workers=args.workers, pin=args.pin_cpus)
+        worker = QueueWorker(
+            job_queue,
+            transcriber_factory=lambda: create_transcriber(args, resources, args.worker_index),
+        )
+        print(f"Worker {worker.worker_id} taking jobs from {args.queue}...")
+        try:
+            worker.run(until_empty=args.until_empty)
+        except KeyboardInterrupt:
+            # The lease on an interrupted job expires and another worker retries it
+            pass
+    
+    if not args.enqueue and not args.work:
+        for status, count in job_queue.counts().items():
+            print(f"{status}: {count}")
+    return 0
 
 
 def main():
@@ -51,6 +340,13 @@ def main():
     Main entry point for the CLI.
     """
     args = parse_args()
+    preset = resolve_preset(args)
+    
+    if args.watch:
+        return run_ingest(args)
+    
+    if args.queue:
+        return run_queue(args)
     
     # Check if file exists
     if not os.path.exists(args.file):
@@ -59,15 +355,22 @@ def main():
     
     try:
         # Initialize transcriber
-        transcriber = Transcriber(model_size=args.model)
+        resources = ResourceBudget(workers=args.workers, pin=args.pin_cpus)
+        transcriber = create_transcriber(args, resources, args.worker_index)
         
         if args.verbose:
-            print(f"Transcribing {args.file} with model size {args.model}...")
+            suffix = f" ({preset} preset)" if preset else ""
+            print(f"Transcribing {args.file} with model size {args.model}{suffix}...")
         
         # Transcribe and save
-        output_path = transcriber.transcribe_and_save(args.file, args.output)
+        output_path = transcriber.transcribe_and_save(
+            args.file, args.output, segments_path=args.segments
+        )
         
         print(f"Transcription saved to: {output_path}")
+        if transcriber.upgraded_fraction is not None:
+            print(f"Re-decoded with {args.refine_model}: "
+                  f"{transcriber.upgraded_fraction:.1%} of the audio")
         return 0
         
     except Exception as e:
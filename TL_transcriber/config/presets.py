@@ -0,0 +1,76 @@
+"""
+Speed/accuracy presets for transcription.
+
+A preset sets the model size and the decode options that trade speed for
+accuracy together. The "auto" preset picks the most accurate preset
+expected to finish a file within a target turnaround time.
+"""
+
+from transcription_app.config.settings import (
+    PRESETS,
+    PRESET_RTF,
+    DEFAULT_PRESET,
+    DEFAULT_TARGET_SECONDS,
+)
+
+AUTO = "auto"
+
+
+def get_preset(name):
+    """
+    Get a preset by name.
+
+    Args:
+        name (str): One of PRESETS
+
+    Returns:
+        dict: A copy of the preset with "model" and decode options
+    """
+    if name not in PRESETS:
+        raise ValueError(f"Unknown preset: {name} (choose from {', '.join(PRESETS)} or {AUTO})")
+    return dict(PRESETS[name])
+
+
+def choose_preset(duration, target_seconds=None, rtf=None):
+    """
+    Pick the most accurate preset expected to finish within a target time.
+
+    Args:
+        duration (float): Length of the input in seconds, or None if unknown
+        target_seconds (float, optional): Turnaround to aim for. Defaults to
+                                         DEFAULT_TARGET_SECONDS.
+        rtf (dict, optional): Real-time factor of each preset. Defaults to
+                              PRESET_RTF.
+
+    Returns:
+        str: Name of the preset; the fastest one if none fits, and
+             DEFAULT_PRESET if the duration is unknown
+    """
+    if duration is None:
+        return DEFAULT_PRESET
+    target_seconds = DEFAULT_TARGET_SECONDS if target_seconds is None else target_seconds
+    rtf = rtf or PRESET_RTF
+
+    # PRESETS is ordered from fastest to most accurate
+    names = [name for name in PRESETS if name in rtf]
+    for name in reversed(names):
+        if duration * rtf[name] <= target_seconds:
+            return name
+    return min(names, key=lambda name: rtf[name])
+
+
+def decode_options(preset, language=None):
+    """
+    Get the options a preset passes to the model's transcribe().
+
+    Args:
+        preset (dict): Preset from get_preset
+        language (str, optional): Language code overriding the preset's
+
+    Returns:
+        dict: Options that are set, so unset ones keep the backend's defaults
+    """
+    options = {key: value for key, value in preset.items() if key != "model"}
+    if language:
+        options["language"] = language
+    return {key: value for key, value in options.items() if value is not None}
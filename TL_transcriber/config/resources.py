@@ -0,0 +1,147 @@
+"""
+CPU resource budgeting for worker pools.
+
+Torch, OpenCV, tesseract (OpenMP) and ffmpeg each default to one thread
+per core. With several workers side by side that oversubscribes the
+machine, so a ResourceBudget divides the cores between the workers and
+limits every library to its worker's share.
+"""
+
+import os
+import sys
+
+
+def available_cpus():
+    """
+    Get the CPUs this process may run on.
+    
+    Returns:
+        list: Sorted CPU ids
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def set_thread_limits(threads):
+    """
+    Limit the thread pools of torch, OpenCV, OpenMP and BLAS libraries.
+    
+    The environment variables are inherited by child processes such as
+    tesseract, which uses OpenMP.
+    
+    Args:
+        threads (int): Threads each library may use
+    """
+    for variable in ("OMP_THREAD_LIMIT", "OMP_NUM_THREADS",
+                     "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    
+    # Only configure the libraries this program actually uses; importing
+    # torch just to limit it would load it into the OCR-only slide extractor
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    
+    cv2 = sys.modules.get("cv2")
+    if cv2 is not None:
+        cv2.setNumThreads(threads)
+
+
+def pin_to_cpus(cpus):
+    """
+    Pin the calling thread (and processes it starts) to the given CPUs.
+    
+    Args:
+        cpus (list): CPU ids
+        
+    Returns:
+        bool: True if pinning is supported on this platform
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    os.sched_setaffinity(0, cpus)
+    return True
+
+
+class ResourceBudget:
+    """
+    Divides the available CPUs between a number of workers.
+    """
+    
+    def __init__(self, workers=1, cpus=None, pin=False, processes_per_worker=1):
+        """
+        Initialize the budget.
+        
+        Args:
+            workers (int): Number of workers sharing the CPUs
+            cpus (list, optional): CPU ids to share. Defaults to all CPUs
+                                   available to this process.
+            pin (bool): Pin each worker to its own CPUs
+            processes_per_worker (int): Processes each worker runs at once,
+                                        e.g. parallel tesseract calls; they
+                                        split the worker's thread limit
+        """
+        self.workers = max(1, workers)
+        self.cpus = list(cpus) if cpus is not None else available_cpus()
+        self.pin = pin
+        self.processes_per_worker = max(1, processes_per_worker)
+    
+    @property
+    def threads_per_worker(self):
+        """
+        Threads each worker may use (at least one).
+        """
+        return max(1, len(self.cpus) // self.workers)
+    
+    def worker_cpus(self, worker_index):
+        """
+        Get the CPUs assigned to a worker.
+        
+        CPUs are split into contiguous shares; leftover CPUs go to the first
+        workers. With more workers than CPUs, workers share CPUs round-robin.
+        
+        Args:
+            worker_index (int): Index of the worker, from 0
+            
+        Returns:
+            list: CPU ids
+        """
+        count = len(self.cpus)
+        if self.workers >= count:
+            return [self.cpus[worker_index % count]]
+        
+        share, extra = divmod(count, self.workers)
+        start = worker_index * share + min(worker_index, extra)
+        return self.cpus[start:start + share + (worker_index < extra)]
+    
+    def threads_for(self, worker_index=None):
+        """
+        Get the thread limit of a worker (or of any worker if None).
+        
+        Args:
+            worker_index (int, optional): Index of the worker
+            
+        Returns:
+            int: Number of threads
+        """
+        if worker_index is None:
+            return self.threads_per_worker
+        return len(self.worker_cpus(worker_index))
+    
+    def apply(self, worker_index=None):
+        """
+        Apply the worker's limits to the calling thread and process.
+        
+        Args:
+            worker_index (int, optional): Index of the worker. Pinning only
+                                          happens when it is given.
+            
+        Returns:
+            int: The thread limit that was applied
+        """
+        threads = max(1, self.threads_for(worker_index) // self.processes_per_worker)
+        set_thread_limits(threads)
+        if self.pin and worker_index is not None:
+            pin_to_cpus(self.worker_cpus(worker_index))
+        return threads
@@ -2,12 +2,93 @@
 Settings for the transcription app.
 """
 
+import os
+
 # Default model size to use
 DEFAULT_MODEL_SIZE = "base"
 
 # Available model sizes
 MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]
 
+# Directory where int8-quantized models are cached after conversion
+QUANTIZED_MODEL_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "whisper",
+    "quantized",
+)
+
+# Decoded-audio cache (used with --audio-cache) and its size budget
+AUDIO_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "whisper",
+    "audio",
+)
+AUDIO_CACHE_MAX_BYTES = 10 * 1024 ** 3
+
+# Inference backends: openai-whisper (PyTorch) or faster-whisper (CTranslate2)
+BACKENDS = ["whisper", "faster-whisper"]
+DEFAULT_BACKEND = "whisper"
+FASTER_WHISPER_COMPUTE_TYPE = "int8"
+
+# Speed/accuracy presets (--preset). Decode options left out or None keep
+# Whisper's defaults (a beam_size of None decodes greedily on every
+# backend); a fixed language skips language detection.
+# temperature is the fallback schedule, tried in order when a window's
+# output is repetitive or unlikely; best_of is the number of samples at
+# non-zero temperatures.
+PRESETS = {
+    "fast": {
+        "model": "tiny",
+        "beam_size": None,  # greedy
+        "temperature": (0.0,),  # no fallback
+        "condition_on_previous_text": False,
+        "language": None,
+    },
+    "balanced": {
+        "model": "base",
+        "beam_size": None,
+        "best_of": 3,
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": True,
+        "language": None,
+    },
+    "accurate": {
+        "model": "small",
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "language": None,
+    },
+}
+DEFAULT_PRESET = "balanced"
+
+# Real-time factor (processing seconds per second of audio) of each preset,
+# used by --preset auto. These are rough, unmeasured estimates for a recent
+# multi-core CPU with the openai-whisper backend, not benchmark results;
+# replace them with factors measured by benchmarks/preset_benchmark.py on the
+# machine that runs the transcriptions
+PRESET_RTF = {
+    "fast": 0.05,
+    "balanced": 0.15,
+    "accurate": 0.6,
+}
+# Turnaround --preset auto aims for when --target-time is not given
+DEFAULT_TARGET_SECONDS = 600
+
+# Job queue (--queue): lease length without a heartbeat, attempts per job
+# and the retry backoff, doubled after every failed attempt
+JOB_LEASE_SECONDS = 300
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF = 60
+JOB_RETRY_MAX_BACKOFF = 3600
+
+# Two-pass transcription: draft segments crossing any of these confidence
+# thresholds are re-decoded with the larger refine model
+REFINE_LOGPROB_THRESHOLD = -0.8  # below this average log probability
+REFINE_COMPRESSION_RATIO_THRESHOLD = 2.4  # above this (repetitive output)
+REFINE_NO_SPEECH_THRESHOLD = 0.6  # above this no-speech probability
+
 # Default output format
 DEFAULT_OUTPUT_FORMAT = "txt"
 
@@ -0,0 +1,148 @@
+"""
+Cache of decoded audio shared across model sizes and reruns.
+"""
+
+import os
+import uuid
+
+import numpy as np
+from transcription_app.config.settings import AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES
+from transcription_app.utils.file_utils import fingerprint_file
+
+
+class AudioCache:
+    """
+    Decoded 16 kHz mono float32 audio stored as .npy files.
+
+    Entries are keyed by the content fingerprint of the source file, so
+    renamed or copied files hit the cache, and are loaded memory-mapped, so
+    a cached file costs neither ffmpeg nor a copy of the samples. Reading an entry
+    refreshes its modification time; when the cache grows past its size
+    budget, the least recently used entries are deleted.
+    """
+
+    EXTENSION = ".npy"
+
+    def __init__(self, directory=None, max_bytes=None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory (str, optional): Cache directory. Defaults to AUDIO_CACHE_DIR.
+            max_bytes (int, optional): Size budget. Defaults to AUDIO_CACHE_MAX_BYTES.
+        """
+        self.directory = directory or AUDIO_CACHE_DIR
+        self.max_bytes = AUDIO_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key_for(self, file_path):
+        """
+        Get the cache key of a source file.
+        """
+        return fingerprint_file(file_path)
+
+    def path_for(self, key):
+        """
+        Get the path of a cache entry.
+        """
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def get(self, key):
+        """
+        Load a cached entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            numpy.ndarray: Memory-mapped samples, or None on a miss
+        """
+        path = self.path_for(key)
+        try:
+            # Copy-on-write keeps the array writable (torch warns on
+            # read-only arrays) without reading it into memory
+            audio = np.load(path, mmap_mode="c")
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return audio
+
+    def put(self, key, audio):
+        """
+        Store decoded samples and enforce the size budget.
+
+        Args:
+            key (str): Cache key
+            audio (numpy.ndarray): 16 kHz mono samples
+        """
+        path = self.path_for(key)
+        # Written under a unique name and renamed so concurrent readers
+        # never see a partial file
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.save(f, np.asarray(audio, dtype=np.float32))
+        os.replace(temp_path, path)
+        self.evict()
+
+    def load(self, file_path, decode):
+        """
+        Load the decoded audio of a file, decoding it on a miss.
+
+        Args:
+            file_path (str): Source audio or video file
+            decode (callable): Decodes file_path to 16 kHz mono samples
+
+        Returns:
+            numpy.ndarray: Samples, memory-mapped from the cache
+        """
+        key = self.key_for(file_path)
+        audio = self.get(key)
+        if audio is not None:
+            return audio
+
+        decoded = decode(file_path)
+        self.put(key, decoded)
+        audio = self.get(key)
+        # Evicted straight away if larger than the whole budget
+        return audio if audio is not None else decoded
+
+    def entries(self):
+        """
+        List cache entries, least recently used first.
+
+        Returns:
+            list: (path, size in bytes, modification time) tuples
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        """
+        Get the total size of the cache in bytes.
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits its budget.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                # Open memory maps stay valid after the file is unlinked
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,168 @@
+"""
+Speech-to-text inference backends for the transcription app.
+"""
+
+from abc import ABC, abstractmethod
+
+import whisper
+from transcription_app.core.quantization import load_quantized_model
+from transcription_app.config.settings import BACKENDS, FASTER_WHISPER_COMPUTE_TYPE
+
+
+class TranscriptionBackend(ABC):
+    """
+    Abstract base class for loaded speech-to-text models.
+
+    Backends mirror the openai-whisper model API, so Transcriber can use
+    them, or a plain whisper model, interchangeably.
+    """
+
+    @abstractmethod
+    def transcribe(self, audio, **options):
+        """
+        Transcribe audio.
+
+        Args:
+            audio (str or numpy.ndarray): Path to an audio file, or 16 kHz
+                                          mono float32 samples
+            **options: Whisper decoding options such as language or beam_size
+
+        Returns:
+            dict: Whisper-style result with "text", "segments" (dicts with
+                  "start", "end", "text" and the confidence signals
+                  "avg_logprob", "compression_ratio", "no_speech_prob") and
+                  "language"
+        """
+        pass
+
+
+class WhisperBackend(TranscriptionBackend):
+    """
+    Backend running openai-whisper in PyTorch.
+    """
+
+    COMPUTE_TYPES = ["float32", "int8"]
+
+    def __init__(self, model_size, compute_type=None):
+        """
+        Load a Whisper model.
+
+        Args:
+            model_size (str): Size of the Whisper model
+            compute_type (str, optional): "int8" for a dynamically quantized
+                                         CPU model, "float32" (or None) for
+                                         the standard model
+        """
+        compute_type = compute_type or "float32"
+        if compute_type not in self.COMPUTE_TYPES:
+            raise ValueError(f"Unsupported compute type for whisper: {compute_type}")
+
+        self.compute_type = compute_type
+        if compute_type == "int8":
+            self.model = load_quantized_model(model_size)
+        else:
+            self.model = whisper.load_model(model_size)
+
+    def transcribe(self, audio, **options):
+        """
+        Transcribe audio with the Whisper model.
+        """
+        if self.compute_type == "int8":
+            # Quantized models run on the CPU, where fp16 is not available
+            options.setdefault("fp16", False)
+        return self.model.transcribe(audio, **options)
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """
+    Backend running CTranslate2 conversions of Whisper through faster-whisper.
+
+    On the CPU, int8 weights with CTranslate2's fused kernels transcribe
+    several times faster than PyTorch at similar accuracy.
+    """
+
+    # Options that only apply to openai-whisper
+    IGNORED_OPTIONS = {"fp16", "verbose"}
+
+    def __init__(self, model_size, compute_type=None, cpu_threads=None, device="cpu"):
+        """
+        Load a faster-whisper model (downloaded on first use).
+
+        Args:
+            model_size (str): Size of the Whisper model
+            compute_type (str, optional): CTranslate2 compute type, such as
+                                         "int8", "int8_float32" or "float32".
+                                         Defaults to FASTER_WHISPER_COMPUTE_TYPE.
+            cpu_threads (int, optional): Threads per transcription. Defaults
+                                        to OMP_NUM_THREADS or all cores.
+            device (str): "cpu" or "cuda"
+        """
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError(
+                "The faster-whisper backend needs the faster-whisper package "
+                "(pip install faster-whisper)"
+            ) from e
+
+        self.compute_type = compute_type or FASTER_WHISPER_COMPUTE_TYPE
+        self.model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=self.compute_type,
+            cpu_threads=cpu_threads or 0,
+        )
+
+    def transcribe(self, audio, **options):
+        """
+        Transcribe audio and convert the result to Whisper's format.
+        """
+        options = {k: v for k, v in options.items() if k not in self.IGNORED_OPTIONS}
+        # faster-whisper defaults to a beam search of 5; decode greedily like
+        # openai-whisper unless a beam size is given, so presets and
+        # benchmarks compare the same settings on both backends
+        options.setdefault("beam_size", 1)
+        segments, info = self.model.transcribe(audio, **options)
+
+        # Segments are generated lazily while decoding
+        segments = [
+            {
+                "id": segment.id,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+                "temperature": segment.temperature,
+            }
+            for segment in segments
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+def create_backend_factory(backend="whisper", compute_type=None, cpu_threads=None):
+    """
+    Create a model factory for Transcriber that loads the given backend.
+
+    Args:
+        backend (str): One of BACKENDS
+        compute_type (str, optional): Backend-specific compute type
+        cpu_threads (int, optional): Threads per transcription (faster-whisper;
+                                    whisper takes its threads from the
+                                    resource budget)
+
+    Returns:
+        callable: Takes a model size and returns a TranscriptionBackend
+    """
+    if backend == "whisper":
+        return lambda model_size: WhisperBackend(model_size, compute_type)
+    if backend == "faster-whisper":
+        return lambda model_size: FasterWhisperBackend(
+            model_size, compute_type, cpu_threads=cpu_threads
+        )
+    raise ValueError(f"Unknown backend: {backend} (choose from {', '.join(BACKENDS)})")
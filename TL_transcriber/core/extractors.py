@@ -2,6 +2,7 @@
 Audio extraction functionality for the transcription app.
 """
 
+import json
 import os
 import subprocess
 import tempfile
@@ -30,14 +31,103 @@ class AudioExtractor(ABC):
 class FFmpegAudioExtractor(AudioExtractor):
     """
     Audio extractor that uses FFmpeg to extract audio from video files.
+    
+    The input is probed with ffprobe first (results are cached per file) so
+    the cheapest extraction path can be chosen: copying the audio stream
+    into its own container when Whisper can read the codec, resampling to
+    16 kHz mono PCM otherwise, and seeking directly to the requested range
+    when only part of the file is needed. If probing fails, the audio is
+    transcoded to MP3 as before.
     """
     
-    def extract_audio(self, file_path):
+    # Audio codecs that can be copied without re-encoding, mapped to the
+    # extension of a container that holds them
+    STREAM_COPY_EXTENSIONS = {
+        'aac': '.m4a',
+        'alac': '.m4a',
+        'mp3': '.mp3',
+        'opus': '.ogg',
+        'vorbis': '.ogg',
+        'flac': '.flac',
+    }
+    
+    # Whisper resamples everything to 16 kHz mono
+    SAMPLE_RATE = 16000
+    
+    def __init__(self, threads=None):
+        """
+        Initialize the extractor with an empty probe cache.
+        
+        Args:
+            threads (int, optional): Thread limit for ffmpeg, e.g. from a
+                                     ResourceBudget. Defaults to ffmpeg's own.
+        """
+        self.threads = threads
+        self._probe_cache = {}
+    
+    def probe(self, file_path):
+        """
+        Probe a media file with ffprobe.
+        
+        Args:
+            file_path (str): Path to the media file
+            
+        Returns:
+            dict: The ffprobe streams and format, or None if probing failed
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        
+        key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._probe_cache:
+            self._probe_cache[key] = self._run_ffprobe(file_path)
+        return self._probe_cache[key]
+    
+    @staticmethod
+    def _run_ffprobe(file_path):
+        command = [
+            'ffprobe',
+            '-v', 'error',
+            '-print_format', 'json',
+            '-show_streams',
+            '-show_format',
+            file_path
+        ]
+        
+        try:
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                return None
+            return json.loads(result.stdout)
+        except (OSError, ValueError):
+            return None
+    
+    def get_duration(self, file_path):
+        """
+        Get the duration of a media file from its probe.
+        
+        Args:
+            file_path (str): Path to the media file
+            
+        Returns:
+            float: Duration in seconds, or None if unknown
+        """
+        info = self.probe(file_path)
+        try:
+            return float(info["format"]["duration"])
+        except (TypeError, KeyError, ValueError):
+            return None
+    
+    def extract_audio(self, file_path, start=None, end=None):
         """
         Extract audio from a video file using ffmpeg.
         
         Args:
             file_path (str): Path to the video file
+            start (float, optional): Start of the range to extract, in seconds
+            end (float, optional): End of the range to extract, in seconds
             
         Returns:
             str: Path to the extracted audio file
@@ -45,20 +135,76 @@ class FFmpegAudioExtractor(AudioExtractor):
         # Check if file exists
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
-            
-        # Create a temporary file for the extracted audio
-        temp_audio = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
-        temp_audio.close()
         
-        # Use ffmpeg to extract audio
-        command = [
-            'ffmpeg', 
-            '-i', file_path, 
+        info = self.probe(file_path)
+        if info is None:
+            return self._transcode_mp3(file_path, start, end)
+        
+        audio_streams = [
+            stream for stream in info.get("streams", [])
+            if stream.get("codec_type") == "audio"
+        ]
+        if not audio_streams:
+            raise Exception(f"No audio stream found in: {file_path}")
+        
+        codec = audio_streams[0].get("codec_name")
+        if start is None and end is None and codec in self.STREAM_COPY_EXTENSIONS:
+            return self._copy_stream(file_path, self.STREAM_COPY_EXTENSIONS[codec])
+        return self._resample_pcm(file_path, start, end)
+    
+    def _copy_stream(self, file_path, extension):
+        """
+        Demux the first audio stream into its own file without re-encoding.
+        """
+        return self._run_ffmpeg(file_path, extension, [
+            '-vn',
+            '-map', '0:a:0',
+            '-c:a', 'copy',
+        ])
+    
+    def _resample_pcm(self, file_path, start=None, end=None):
+        """
+        Decode straight to the 16 kHz mono PCM that Whisper works on.
+        """
+        return self._run_ffmpeg(file_path, '.wav', [
+            '-vn',
+            '-map', '0:a:0',
+            '-ac', '1',
+            '-ar', str(self.SAMPLE_RATE),
+            '-c:a', 'pcm_s16le',
+        ], start, end)
+    
+    def _transcode_mp3(self, file_path, start=None, end=None):
+        """
+        Transcode to MP3, used when the input could not be probed.
+        """
+        return self._run_ffmpeg(file_path, '.mp3', [
             '-q:a', '0',  # Use high quality
             '-map', 'a',  # Extract only audio
             '-f', 'mp3',
-            temp_audio.name
-        ]
+        ], start, end)
+    
+    def _run_ffmpeg(self, file_path, extension, output_args, start=None, end=None):
+        """
+        Run ffmpeg on (a range of) the input, writing to a temporary file.
+        
+        Returns:
+            str: Path to the temporary output file
+        """
+        # Create a temporary file for the extracted audio
+        temp_audio = tempfile.NamedTemporaryFile(suffix=extension, delete=False)
+        temp_audio.close()
+        
+        # Seeking before the input skips decoding everything before the range
+        command = ['ffmpeg']
+        if self.threads:
+            command += ['-threads', str(self.threads)]
+        if start:
+            command += ['-ss', str(start)]
+        command += ['-i', file_path, '-y']
+        if end is not None:
+            command += ['-t', str(end - (start or 0))]
+        command += output_args + [temp_audio.name]
         
         result = subprocess.run(command, capture_output=True, text=True)
         
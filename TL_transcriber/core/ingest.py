@@ -0,0 +1,407 @@
+"""
+Watch-folder ingestion of media files and screenshots.
+"""
+
+import ctypes
+import ctypes.util
+import heapq
+import itertools
+import json
+import os
+import queue
+import select
+import struct
+import threading
+import time
+
+from transcription_app.core.transcriber import Transcriber
+from transcription_app.utils.file_utils import fingerprint_file, get_base_filename
+
+
+class InotifyWatcher:
+    """
+    Reports files that were closed after writing or moved into directories.
+
+    Uses the Linux inotify API through libc, so the directories are not
+    polled. If the kernel's event queue overflows, events are lost, so every
+    file in the watched directories is reported instead.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_Q_OVERFLOW = 0x00004000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directories):
+        """
+        Start watching the given directories.
+
+        Args:
+            directories (list): Directories to watch (not recursively)
+        """
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+
+        self._fd = self._libc.inotify_init1(self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._directories = {}
+        for directory in directories:
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+            )
+            if wd < 0:
+                os.close(self._fd)
+                raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+            self._directories[wd] = directory
+
+    def read_events(self, timeout=None):
+        """
+        Wait for events.
+
+        Args:
+            timeout (float, optional): Seconds to wait, None waits forever
+
+        Returns:
+            list: Paths of files that were written or moved in, or of every
+                  file in the watched directories after an overflow
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        data = os.read(self._fd, 64 * 1024)
+        paths = []
+        overflowed = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                overflowed = True
+            elif name and wd in self._directories:
+                paths.append(os.path.join(self._directories[wd], os.fsdecode(name)))
+        if overflowed:
+            return self.list_files()
+        return paths
+
+    def list_files(self):
+        """
+        List the files currently in the watched directories.
+
+        Returns:
+            list: Paths in name order per directory
+        """
+        paths = []
+        for directory in self._directories.values():
+            for name in sorted(os.listdir(directory)):
+                paths.append(os.path.join(directory, name))
+        return paths
+
+    def close(self):
+        """
+        Stop watching.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class IngestState:
+    """
+    Content hashes of processed files, persisted as JSON across restarts.
+    """
+
+    def __init__(self, path):
+        """
+        Load the state file if it exists.
+
+        Args:
+            path (str): Path to the state file
+        """
+        self.path = path
+        self.processed = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.processed = json.load(f).get("processed", {})
+
+    def __contains__(self, content_hash):
+        return content_hash in self.processed
+
+    def mark_processed(self, content_hash, file_path, output_path):
+        """
+        Record a processed file and save the state.
+        """
+        self.processed[content_hash] = {
+            "path": file_path,
+            "output": output_path,
+            "finished_at": time.time(),
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"processed": self.processed}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def ocr_screenshot(file_path, output_path):
+    """
+    OCR a screenshot with the slide extractor and save the text.
+
+    Args:
+        file_path (str): Path to the image
+        output_path (str): Path to save the text to
+
+    Returns:
+        str: Path to the saved text
+    """
+    # The OCR stack is only needed when screenshots are ingested
+    import cv2
+    from TL_slide_extractor.slide_extractor import OCRProcessor
+
+    image = cv2.imread(file_path)
+    if image is None:
+        raise ValueError(f"Could not read image: {file_path}")
+
+    with open(output_path, 'w') as f:
+        f.write(OCRProcessor.extract_text_from_image(image))
+    return output_path
+
+
+class IngestDaemon:
+    """
+    Long-running ingestion of files dropped into watched directories.
+
+    New files are picked up once they have been closed (or moved in) and
+    left untouched for settle_seconds, deduplicated by content hash, and
+    fed to a bounded priority queue served by workers that keep their
+    Transcriber, and therefore their model, loaded between files. Settled
+    files that find the queue full wait in an unbounded backlog, so the
+    watcher keeps reading events however large a drop is.
+    """
+
+    IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff']
+
+    def __init__(self, directories, state_path, transcriber_factory=None,
+                 output_dir=None, workers=1, queue_size=100, settle_seconds=2.0,
+                 screenshot_handler=None):
+        """
+        Initialize the daemon.
+
+        Args:
+            directories (list): Directories to watch, highest priority first
+            state_path (str): JSON file recording processed content hashes
+            transcriber_factory (callable, optional): Called with a worker index,
+                                                     returns a Transcriber
+            output_dir (str, optional): Where to write outputs. Defaults to
+                                       next to each input file.
+            workers (int): Number of transcription workers
+            queue_size (int): Maximum number of files waiting to be processed
+            settle_seconds (float): How long a file must stay unchanged
+            screenshot_handler (callable, optional): Called with (image path,
+                                                    output path) for images.
+                                                    Images are ignored if None.
+        """
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.state = IngestState(state_path)
+        self.transcriber_factory = transcriber_factory or (lambda index: Transcriber())
+        self.output_dir = output_dir
+        self.workers = workers
+        self.settle_seconds = settle_seconds
+        self.screenshot_handler = screenshot_handler
+
+        self.queue = queue.PriorityQueue(maxsize=queue_size)
+        self._sequence = itertools.count()
+        self._pending = {}
+        # Settled files waiting for room in the queue, as a heap of queue
+        # items, so a large drop never blocks reading events
+        self._backlog = []
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        # First exception of a worker that could not load its model
+        self._worker_error = None
+
+    def is_supported(self, file_path):
+        """
+        Check whether a file is media, or a screenshot when they are handled.
+        """
+        _, ext = os.path.splitext(file_path.lower())
+        if ext in Transcriber.VIDEO_EXTENSIONS or ext in Transcriber.AUDIO_EXTENSIONS:
+            return True
+        return self.screenshot_handler is not None and ext in self.IMAGE_EXTENSIONS
+
+    def priority(self, file_path):
+        """
+        Get the queue priority of a file (lower runs first).
+
+        Files from earlier watched directories come first, then smaller files,
+        which finish soonest.
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        rank = self.directories.index(directory) if directory in self.directories else len(self.directories)
+        return (rank, os.path.getsize(file_path))
+
+    def serve_forever(self, poll_timeout=0.5):
+        """
+        Start the workers and process files until stop() is called.
+
+        Args:
+            poll_timeout (float): Longest wait for events before checking
+                                  for settled files and stop requests
+
+        Raises:
+            RuntimeError: If a worker could not load its model
+        """
+        watcher = InotifyWatcher(self.directories)
+        try:
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker, args=(index,), daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+            # Catch up on files that arrived while the daemon was not running
+            for path in watcher.list_files():
+                self._note(path)
+
+            while not self._stop.is_set():
+                timeout = min(poll_timeout, self.settle_seconds) if self._pending else poll_timeout
+                for path in watcher.read_events(timeout):
+                    self._note(path)
+                self._submit_settled()
+                self._fill_queue()
+        finally:
+            watcher.close()
+            self._stop.set()
+            # Workers that died cannot make room in a full queue, so only
+            # wait for room while some worker is still taking items
+            sentinels = 0
+            while sentinels < len(self._threads) and any(t.is_alive() for t in self._threads):
+                try:
+                    self.queue.put(((-1,), -1, None, None), timeout=poll_timeout)
+                    sentinels += 1
+                except queue.Full:
+                    continue
+            for thread in self._threads:
+                thread.join()
+        
+        if self._worker_error is not None:
+            raise RuntimeError(f"A worker failed to start: {self._worker_error}") from self._worker_error
+
+    def stop(self):
+        """
+        Ask serve_forever() to return after the files being processed.
+
+        Files still queued or waiting for room in the queue are not recorded
+        as processed, so they are picked up again on the next start.
+        """
+        self._stop.set()
+
+    def _note(self, path):
+        """
+        Remember that a file changed; it is submitted once it has settled.
+        """
+        if not self.is_supported(path):
+            return
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._pending[path] = (time.monotonic(), stat.st_size, stat.st_mtime_ns)
+
+    def _submit_settled(self):
+        """
+        Queue pending files that have not changed for settle_seconds.
+        """
+        now = time.monotonic()
+        for path, (noted_at, size, mtime) in list(self._pending.items()):
+            if now - noted_at < self.settle_seconds:
+                continue
+            del self._pending[path]
+            try:
+                stat = os.stat(path)
+                if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                    # Still being written by something that did not close it
+                    self._pending[path] = (now, stat.st_size, stat.st_mtime_ns)
+                    continue
+                self._submit(path)
+            except OSError:
+                # Deleted or moved away before it could be processed
+                continue
+
+    def _submit(self, path):
+        """
+        Queue a settled file unless its content was already seen.
+        """
+        content_hash = fingerprint_file(path)
+        with self._lock:
+            if content_hash in self.state or content_hash in self._in_flight:
+                return
+            self._in_flight.add(content_hash)
+
+        item = (self.priority(path), next(self._sequence), path, content_hash)
+        heapq.heappush(self._backlog, item)
+
+    def _fill_queue(self):
+        """
+        Move backlogged files into the queue while it has room.
+        """
+        while self._backlog:
+            try:
+                self.queue.put_nowait(self._backlog[0])
+            except queue.Full:
+                return
+            heapq.heappop(self._backlog)
+
+    def _output_path(self, file_path, extension=".txt"):
+        directory = self.output_dir or os.path.dirname(file_path)
+        return os.path.join(directory, get_base_filename(file_path) + extension)
+
+    def _worker(self, index):
+        """
+        Process queued files with a transcriber that stays loaded.
+        """
+        try:
+            transcriber = self.transcriber_factory(index)
+            transcriber.load_model()
+        except Exception as e:
+            # Without a model the worker cannot serve; stop the daemon
+            # rather than accept files nobody will process
+            with self._lock:
+                if self._worker_error is None:
+                    self._worker_error = e
+            self._stop.set()
+            return
+
+        while True:
+            _, _, path, content_hash = self.queue.get()
+            try:
+                if path is None:
+                    return
+                self._process(transcriber, path, content_hash)
+            except Exception as e:
+                print(f"Error processing {path}: {e}")
+            finally:
+                with self._lock:
+                    self._in_flight.discard(content_hash)
+                self.queue.task_done()
+
+    def _process(self, transcriber, path, content_hash):
+        """
+        Transcribe (or OCR) one file and record it in the state.
+        """
+        output_path = self._output_path(path)
+        _, ext = os.path.splitext(path.lower())
+        if ext in self.IMAGE_EXTENSIONS:
+            self.screenshot_handler(path, output_path)
+        else:
+            transcriber.transcribe_and_save(path, output_path)
+
+        with self._lock:
+            self.state.mark_processed(content_hash, path, output_path)
+        print(f"Processed {path} -> {output_path}")
@@ -0,0 +1,441 @@
+"""
+Transcription job queue shared by worker processes on one or many hosts.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from transcription_app.config.settings import (
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_BACKOFF,
+    JOB_RETRY_MAX_BACKOFF,
+)
+from transcription_app.core.transcriber import Transcriber
+from transcription_app.utils.file_utils import fingerprint_file, get_base_filename
+
+
+class JobQueue:
+    """
+    Jobs stored in a SQLite database that every worker opens.
+
+    A worker claims a job by taking a lease on it, which it renews with
+    heartbeats while the job runs. If the worker dies, the lease expires
+    and another worker claims the job again. Failed jobs are retried after
+    an exponential backoff until they have used max_attempts.
+
+    Claims run in an immediate transaction, so two workers never hold the
+    same job. The database may live on a network share as long as it
+    supports POSIX file locks (NFSv4, SMB); the rollback journal is used
+    because WAL mode needs shared memory on one host. Lease expiry compares
+    wall-clock times, so hosts need synchronized clocks.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, path, lease_seconds=None, max_attempts=None,
+                 backoff_seconds=None, max_backoff_seconds=None):
+        """
+        Open the queue, creating the database if needed.
+
+        Args:
+            path (str): Path to the SQLite database
+            lease_seconds (float, optional): How long a claim lasts without a
+                                            heartbeat. Defaults to JOB_LEASE_SECONDS.
+            max_attempts (int, optional): Attempts before a job is marked
+                                         failed. Defaults to JOB_MAX_ATTEMPTS.
+            backoff_seconds (float, optional): Delay before the first retry,
+                                              doubled for every further one.
+                                              Defaults to JOB_RETRY_BACKOFF.
+            max_backoff_seconds (float, optional): Longest retry delay.
+                                                  Defaults to JOB_RETRY_MAX_BACKOFF.
+        """
+        self.path = path
+        self.lease_seconds = JOB_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self.max_attempts = JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.backoff_seconds = JOB_RETRY_BACKOFF if backoff_seconds is None else backoff_seconds
+        self.max_backoff_seconds = (JOB_RETRY_MAX_BACKOFF if max_backoff_seconds is None
+                                    else max_backoff_seconds)
+
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    output_path TEXT NOT NULL,
+                    content_hash TEXT UNIQUE,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    created_at REAL NOT NULL,
+                    finished_at REAL,
+                    result TEXT,
+                    error TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, available_at)"
+            )
+
+    def _connect(self):
+        # A connection per operation keeps the queue safe to share between
+        # threads (heartbeats run beside the job) and across fork()
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self, immediate=True):
+        return _Transaction(self._connect(), immediate)
+
+    def enqueue(self, file_path, output_path=None, priority=0):
+        """
+        Add a file to the queue unless the same content was already added.
+
+        Args:
+            file_path (str): Audio or video file, at a path every worker can read
+            output_path (str, optional): Where to save the transcription.
+                                        Defaults to next to the input file.
+            priority (int): Lower runs first
+
+        Returns:
+            int: ID of the job, or None if the same content is already
+                 queued, running or done
+        """
+        file_path = os.path.abspath(file_path)
+        if output_path is None:
+            output_path = os.path.join(os.path.dirname(file_path),
+                                       get_base_filename(file_path) + ".txt")
+        content_hash = fingerprint_file(file_path)
+        now = time.time()
+        with self._transaction() as conn:
+            # Failed jobs start over with fresh attempts when added again
+            cursor = conn.execute(
+                """
+                INSERT INTO jobs
+                    (path, output_path, content_hash, priority, status, available_at, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (content_hash) DO UPDATE SET
+                    path = excluded.path, output_path = excluded.output_path,
+                    priority = excluded.priority, status = excluded.status,
+                    available_at = excluded.available_at, attempts = 0,
+                    finished_at = NULL, error = NULL
+                WHERE status = ?
+                """,
+                (file_path, os.path.abspath(output_path), content_hash,
+                 priority, self.QUEUED, now, now, self.FAILED),
+            )
+            if not cursor.rowcount:
+                return None
+            return conn.execute(
+                "SELECT id FROM jobs WHERE content_hash = ?", (content_hash,)
+            ).fetchone()["id"]
+
+    def claim(self, worker_id):
+        """
+        Lease the next job that is ready to run.
+
+        Queued jobs whose backoff has passed are eligible, and so are running
+        jobs whose lease expired. Expired jobs that have used all their
+        attempts are marked failed instead.
+
+        Args:
+            worker_id (str): Unique name of the claiming worker
+
+        Returns:
+            dict: The claimed job, or None if no job is ready
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, finished_at = ?, lease_owner = NULL,
+                       error = 'Lease expired'
+                WHERE status = ? AND lease_expires < ? AND attempts >= ?
+                """,
+                (self.FAILED, now, self.RUNNING, now, self.max_attempts),
+            )
+            row = conn.execute(
+                """
+                SELECT id FROM jobs
+                WHERE (status = ? AND available_at <= ?)
+                   OR (status = ? AND lease_expires < ?)
+                ORDER BY priority, id
+                LIMIT 1
+                """,
+                (self.QUEUED, now, self.RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?,
+                       attempts = attempts + 1
+                WHERE id = ?
+                """,
+                (self.RUNNING, worker_id, now + self.lease_seconds, row["id"]),
+            )
+            return self._job(conn, row["id"])
+
+    def heartbeat(self, job_id, worker_id):
+        """
+        Renew the lease on a running job.
+
+        Returns:
+            bool: False if the worker no longer holds the lease
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (time.time() + self.lease_seconds, job_id, self.RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result=None):
+        """
+        Record a finished job.
+
+        Args:
+            job_id (int): ID of the job
+            worker_id (str): Worker holding the lease
+            result (dict, optional): JSON-serializable result
+
+        Returns:
+            bool: False if the lease was lost, in which case the job is left
+                  to the worker now holding it
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = NULL,
+                       lease_owner = NULL, lease_expires = NULL
+                WHERE id = ? AND status = ? AND lease_owner = ?
+                """,
+                (self.DONE, time.time(), json.dumps(result), job_id, self.RUNNING, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Record a failed attempt and schedule a retry if attempts remain.
+
+        Returns:
+            bool: False if the lease was lost
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, self.RUNNING, worker_id),
+            ).fetchone()
+            if row is None:
+                return False
+
+            if row["attempts"] >= self.max_attempts:
+                status, available_at, finished_at = self.FAILED, now, now
+            else:
+                status, finished_at = self.QUEUED, None
+                available_at = now + self.retry_delay(row["attempts"])
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, available_at = ?, finished_at = ?, error = ?,
+                       lease_owner = NULL, lease_expires = NULL
+                WHERE id = ?
+                """,
+                (status, available_at, finished_at, str(error), job_id),
+            )
+            return True
+
+    def retry_delay(self, attempts):
+        """
+        Get the backoff before retrying a job that failed attempts times.
+        """
+        return min(self.backoff_seconds * 2 ** (attempts - 1), self.max_backoff_seconds)
+
+    def get(self, job_id):
+        """
+        Get a job by ID, or None if it does not exist.
+        """
+        with self._transaction(immediate=False) as conn:
+            return self._job(conn, job_id)
+
+    def jobs(self, status=None):
+        """
+        List jobs in the order they would run.
+
+        Args:
+            status (str, optional): Only list jobs with this status
+        """
+        with self._transaction(immediate=False) as conn:
+            query = "SELECT * FROM jobs"
+            params = ()
+            if status is not None:
+                query += " WHERE status = ?"
+                params = (status,)
+            rows = conn.execute(query + " ORDER BY priority, id", params).fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def counts(self):
+        """
+        Count jobs by status.
+
+        Returns:
+            dict: Number of jobs for each of the four statuses
+        """
+        with self._transaction(immediate=False) as conn:
+            counts = dict.fromkeys([self.QUEUED, self.RUNNING, self.DONE, self.FAILED], 0)
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                counts[status] = count
+            return counts
+
+    def _job(self, conn, job_id):
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else self._row_to_dict(row)
+
+    @staticmethod
+    def _row_to_dict(row):
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+class _Transaction:
+    """
+    Runs a block in an immediate transaction and closes the connection.
+    """
+
+    def __init__(self, conn, immediate=True):
+        self.conn = conn
+        self.immediate = immediate
+
+    def __enter__(self):
+        # Writers take the lock up front, so two of them never both read
+        # and then deadlock trying to upgrade
+        self.conn.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.conn.close()
+        return False
+
+
+class QueueWorker:
+    """
+    Drains a JobQueue with a Transcriber that stays loaded between jobs.
+    """
+
+    def __init__(self, job_queue, transcriber_factory=None, worker_id=None,
+                 poll_interval=1.0, heartbeat_interval=None):
+        """
+        Initialize the worker.
+
+        Args:
+            job_queue (JobQueue): Queue to take jobs from
+            transcriber_factory (callable, optional): Returns a Transcriber
+            worker_id (str, optional): Unique worker name. Defaults to the
+                                      host name, process ID and a random suffix.
+            poll_interval (float): Seconds to wait when no job is ready
+            heartbeat_interval (float, optional): Seconds between lease
+                                                 renewals. Defaults to a third
+                                                 of the lease.
+        """
+        self.queue = job_queue
+        self.transcriber_factory = transcriber_factory or Transcriber
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or job_queue.lease_seconds / 3
+        self.processed = 0
+        self._transcriber = None
+        self._stop = threading.Event()
+
+    def run(self, max_jobs=None, until_empty=False):
+        """
+        Process jobs until stopped.
+
+        Args:
+            max_jobs (int, optional): Return after this many jobs
+            until_empty (bool): Return once no job is queued or running;
+                                jobs waiting for a retry count as queued
+
+        Returns:
+            int: Number of jobs this worker processed
+        """
+        while not self._stop.is_set():
+            if max_jobs is not None and self.processed >= max_jobs:
+                break
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                if until_empty:
+                    counts = self.queue.counts()
+                    if not counts[JobQueue.QUEUED] and not counts[JobQueue.RUNNING]:
+                        break
+                self._stop.wait(self.poll_interval)
+                continue
+            self.process(job)
+        return self.processed
+
+    def stop(self):
+        """
+        Ask run() to return after the current job.
+        """
+        self._stop.set()
+
+    def process(self, job):
+        """
+        Run one claimed job, renewing its lease until it finishes.
+        """
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["id"], finished),
+                                     daemon=True)
+        heartbeat.start()
+        started = time.monotonic()
+        try:
+            output_path = self.run_job(job)
+        except Exception as e:
+            finished.set()
+            heartbeat.join()
+            self.queue.fail(job["id"], self.worker_id, f"{type(e).__name__}: {e}")
+            print(f"Job {job['id']} failed (attempt {job['attempts']}): {e}")
+        else:
+            finished.set()
+            heartbeat.join()
+            result = {
+                "output": output_path,
+                "seconds": time.monotonic() - started,
+                "worker": self.worker_id,
+            }
+            if self.queue.complete(job["id"], self.worker_id, result):
+                print(f"Job {job['id']}: {job['path']} -> {output_path}")
+        self.processed += 1
+
+    def run_job(self, job):
+        """
+        Transcribe the job's file.
+
+        Returns:
+            str: Path to the saved transcription
+        """
+        if self._transcriber is None:
+            self._transcriber = self.transcriber_factory()
+        return self._transcriber.transcribe_and_save(job["path"], job["output_path"])
+
+    def _heartbeat(self, job_id, finished):
+        while not finished.wait(self.heartbeat_interval):
+            if not self.queue.heartbeat(job_id, self.worker_id):
+                # Another worker took over; its result will be recorded
+                print(f"Lost the lease on job {job_id}")
+                return
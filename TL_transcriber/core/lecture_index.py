@@ -0,0 +1,329 @@
+"""
+Time index joining slide captures with transcript segments.
+"""
+
+import json
+import math
+import os
+from bisect import bisect_left
+from itertools import takewhile
+
+
+class IntervalIndex:
+    """
+    Static centered interval tree over [start, end) intervals.
+
+    Each node holds the intervals containing its center, sorted by start and
+    by end; intervals entirely before or after the center go to its left or
+    right subtree. Stabbing and overlap queries cost O(log n + k) for k
+    results, however long or overlapping the intervals are.
+    """
+
+    def __init__(self, intervals=()):
+        """
+        Build the index.
+
+        Args:
+            intervals (iterable): (start, end, payload) tuples
+        """
+        ordered = sorted(intervals, key=lambda interval: interval[0])
+        self.starts = [interval[0] for interval in ordered]
+        self.ends = [interval[1] for interval in ordered]
+        self.payloads = [interval[2] for interval in ordered]
+        self._root = self._build_node(list(range(len(ordered))))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _build_node(self, members):
+        """
+        Build the subtree of interval positions given in start order.
+
+        Returns:
+            tuple: (center, by start, by end descending, left, right), or
+                   None for no intervals
+        """
+        if not members:
+            return None
+        # The median start is itself contained, so every node holds at least
+        # one interval and each side gets at most half of the members
+        center = self.starts[members[len(members) // 2]]
+        left, here, right = [], [], []
+        for i in members:
+            if self.ends[i] < center:
+                left.append(i)
+            elif self.starts[i] > center:
+                right.append(i)
+            else:
+                here.append(i)
+        by_end = sorted(here, key=self.ends.__getitem__, reverse=True)
+        return (center, here, by_end,
+                self._build_node(left), self._build_node(right))
+
+    def overlapping(self, start, end):
+        """
+        Find the intervals overlapping [start, end).
+
+        Args:
+            start (float): Query start
+            end (float): Query end
+
+        Returns:
+            list: Payloads in start order
+        """
+        found = []
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+            if end <= center:
+                # Every interval here ends at or after the center
+                found.extend(takewhile(lambda i: self.starts[i] < end, by_start))
+                nodes.append(left)
+            elif start >= center:
+                # Every interval here starts at or before the center
+                found.extend(takewhile(lambda i: self.ends[i] > start, by_end))
+                nodes.append(right)
+            else:
+                found.extend(by_start)
+                nodes.extend((left, right))
+        return [self.payloads[i] for i in sorted(found)]
+
+    def at(self, t):
+        """
+        Find the intervals containing time t.
+
+        Args:
+            t (float): Query time
+
+        Returns:
+            list: Payloads in start order
+        """
+        found = []
+        node = self._root
+        while node is not None:
+            center, by_start, by_end, left, right = node
+            if t < center:
+                found.extend(takewhile(lambda i: self.starts[i] <= t, by_start))
+                node = left
+            else:
+                found.extend(takewhile(lambda i: self.ends[i] > t, by_end))
+                node = right
+        return [self.payloads[i] for i in sorted(found)]
+
+
+class LectureIndex:
+    """
+    Joins slide intervals with timestamped transcript segments.
+
+    Slides shown on a screen last from their capture time to the next
+    capture on the same screen; the last slide of a session and screen
+    lasts until the session ends, which is its last capture or the end of
+    the last transcript segment starting before the next session, whichever
+    is later. Transcript segments are shifted by the time
+    their recording started, so both live on one timeline and queries such
+    as "what was said during slide N" and "which slide was showing at t"
+    are answered from interval indexes instead of scans.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.slides = []
+        self.segments = []
+        self._slide_index = None
+        self._segment_index = None
+        self._slides_by_id = None
+
+    def add_slides(self, slides):
+        """
+        Add slide captures, e.g. the result of SessionStore.slides().
+
+        Args:
+            slides (iterable): Dicts with "id", "captured_at" and optionally
+                               "session_id", "screen" and "text"
+        """
+        groups = {}
+        for slide in slides:
+            key = (slide.get("session_id"), slide.get("screen"))
+            groups.setdefault(key, []).append(slide)
+
+        for group in groups.values():
+            group.sort(key=lambda slide: slide["captured_at"])
+            # The last slide's end depends on the transcripts, so it is set
+            # when the indexes are built
+            next_starts = [s["captured_at"] for s in group[1:]] + [None]
+            for slide, end in zip(group, next_starts):
+                self.slides.append({
+                    "id": slide["id"],
+                    "session_id": slide.get("session_id"),
+                    "screen": slide.get("screen"),
+                    "start": slide["captured_at"],
+                    "end": end,
+                    "last": end is None,
+                    "text": slide.get("text", ""),
+                })
+        self._invalidate()
+
+    def add_transcript(self, segments, lecture=None, offset=0.0):
+        """
+        Add transcript segments, e.g. from Transcriber.transcribe_segments.
+
+        Args:
+            segments (iterable): Dicts with "start", "end" and "text" in
+                                 seconds from the start of the recording
+            lecture (str, optional): Name of the recording
+            offset (float): Slide-timeline time at which the recording started
+        """
+        for segment in segments:
+            self.segments.append({
+                "lecture": lecture,
+                "start": segment["start"] + offset,
+                "end": segment["end"] + offset,
+                "text": segment["text"],
+            })
+        self._invalidate()
+
+    def slides_at(self, t):
+        """
+        Find the slides showing at time t (one per screen).
+
+        Args:
+            t (float): Time on the slide timeline
+
+        Returns:
+            list: Slide dicts
+        """
+        self._build()
+        return self._slide_index.at(t)
+
+    def segments_for_slide(self, slide_id):
+        """
+        Find the transcript segments spoken while a slide was showing.
+
+        Args:
+            slide_id (int): Slide ID from the session store
+
+        Returns:
+            list: Segment dicts in time order
+        """
+        self._build()
+        slide = self._slides_by_id.get(slide_id)
+        if slide is None:
+            raise KeyError(f"Unknown slide: {slide_id}")
+        return self._segment_index.overlapping(slide["start"], slide["end"])
+
+    def transcript_for_slide(self, slide_id):
+        """
+        Get the text spoken while a slide was showing.
+
+        Args:
+            slide_id (int): Slide ID from the session store
+
+        Returns:
+            str: Segment texts joined by spaces
+        """
+        return " ".join(s["text"] for s in self.segments_for_slide(slide_id))
+
+    def segments_between(self, start, end):
+        """
+        Find the transcript segments overlapping [start, end).
+
+        Returns:
+            list: Segment dicts in time order
+        """
+        self._build()
+        return self._segment_index.overlapping(start, end)
+
+    def save(self, path):
+        """
+        Persist the index as JSON.
+
+        Args:
+            path (str): Destination file
+        """
+        self._build()
+        data = {
+            "version": self.FORMAT_VERSION,
+            "slides": sorted(self.slides, key=lambda s: s["start"]),
+            "segments": sorted(self.segments, key=lambda s: s["start"]),
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(data, f, allow_nan=False)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with save().
+
+        Args:
+            path (str): Index file
+
+        Returns:
+            LectureIndex: The loaded index
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        if data.get("version") != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported lecture index version: {data.get('version')}")
+
+        index = cls()
+        index.slides = data["slides"]
+        index.segments = data["segments"]
+        return index
+
+    def _invalidate(self):
+        self._slide_index = None
+        self._segment_index = None
+        self._slides_by_id = None
+
+    def _build(self):
+        """
+        Build the interval indexes on first use after a change.
+        """
+        if self._slide_index is not None:
+            return
+        self._close_sessions()
+        self._slide_index = IntervalIndex(
+            (s["start"], s["end"], s) for s in self.slides
+        )
+        self._segment_index = IntervalIndex(
+            (s["start"], s["end"], s) for s in self.segments
+        )
+        self._slides_by_id = {s["id"]: s for s in self.slides}
+
+    def _close_sessions(self):
+        """
+        End the last slide of every session and screen at the session end.
+        """
+        sessions = {}
+        for slide in self.slides:
+            first, last = sessions.get(slide["session_id"], (math.inf, -math.inf))
+            sessions[slide["session_id"]] = (min(first, slide["start"]), max(last, slide["start"]))
+
+        segments = sorted(self.segments, key=lambda s: s["start"])
+        segment_starts = [s["start"] for s in segments]
+        ordered = sorted(sessions.items(), key=lambda item: item[1][0])
+
+        session_ends = {}
+        for i, (session_id, (first, last)) in enumerate(ordered):
+            # Speech after the next session started belongs to that session;
+            # sessions recorded side by side may overlap
+            limit = ordered[i + 1][1][0] if i + 1 < len(ordered) else math.inf
+            limit = max(limit, last)
+            lo = bisect_left(segment_starts, first)
+            hi = bisect_left(segment_starts, limit)
+            end = max([last] + [segments[j]["end"] for j in range(lo, hi)])
+            session_ends[session_id] = min(end, limit)
+
+        for slide in self.slides:
+            if slide.get("last"):
+                slide["end"] = max(session_ends[slide["session_id"]], slide["start"])
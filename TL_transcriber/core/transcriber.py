@@ -2,9 +2,16 @@
 Transcription functionality for the transcription app.
 """
 
+import json
 import os
 import whisper
 from transcription_app.core.extractors import FFmpegAudioExtractor
+from transcription_app.core.quantization import load_quantized_model
+from transcription_app.config.settings import (
+    REFINE_LOGPROB_THRESHOLD,
+    REFINE_COMPRESSION_RATIO_THRESHOLD,
+    REFINE_NO_SPEECH_THRESHOLD,
+)
 
 
 class Transcriber:
@@ -16,29 +23,87 @@ class Transcriber:
     VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv']
     AUDIO_EXTENSIONS = ['.mp3', '.wav', '.ogg', '.flac', '.m4a']
     
-    def __init__(self, model_size="base", model_factory=None, audio_extractor=None):
+    def __init__(self, model_size="base", model_factory=None, audio_extractor=None,
+                 quantize=False, resources=None, worker_index=None,
+                 refine_model_size=None, audio_cache=None, decode_options=None):
         """
         Initialize the Transcriber with a specified model size and dependencies.
         
         Args:
             model_size (str): Size of the Whisper model to use. 
                              Options: "tiny", "base", "small", "medium", "large"
-            model_factory (callable, optional): Function to create the model.
-                                              Defaults to whisper.load_model.
+            model_factory (callable, optional): Function to create the model
+                                              from a model size, e.g. from
+                                              create_backend_factory. It must
+                                              return a TranscriptionBackend or
+                                              a whisper model. Defaults to
+                                              whisper.load_model.
             audio_extractor (AudioExtractor, optional): Extractor for audio from video.
                                                       Defaults to FFmpegAudioExtractor.
+            quantize (bool): Load a dynamically int8-quantized model for CPU
+                             inference (ignored if model_factory is given)
+            resources (ResourceBudget, optional): CPU budget shared with other
+                                                 workers; limits torch and ffmpeg
+                                                 threads to this worker's share
+            worker_index (int, optional): This worker's index in the budget
+            refine_model_size (str, optional): Larger model for two-pass
+                                              transcription. Segments of the
+                                              draft made with model_size whose
+                                              confidence is low are re-decoded
+                                              with it and spliced back in.
+            audio_cache (AudioCache, optional): Cache of decoded audio. When
+                                               given, files are decoded once
+                                               and later runs, with any model,
+                                               load the cached samples.
+            decode_options (dict, optional): Options for the model's
+                                            transcribe(), such as beam_size,
+                                            temperature or language (see
+                                            config.presets.decode_options)
         """
         self.model_size = model_size
         self.model = None
-        self.model_factory = model_factory or whisper.load_model
-        self.audio_extractor = audio_extractor or FFmpegAudioExtractor()
+        self.model_factory = model_factory
+        self.resources = resources
+        self.worker_index = worker_index
+        self.refine_model_size = refine_model_size
+        self.refine_model = None
+        self.audio_cache = audio_cache
+        # Fraction of the audio re-decoded by the last two-pass transcription
+        self.upgraded_fraction = None
+        threads = resources.threads_for(worker_index) if resources else None
+        self.audio_extractor = audio_extractor or FFmpegAudioExtractor(threads=threads)
+        self.quantize = quantize
+        # Quantized models run on the CPU, where fp16 is not available
+        self.transcribe_options = {"fp16": False} if quantize else {}
+        self.transcribe_options.update(decode_options or {})
     
-    def _load_model(self):
+    def load_model(self):
         """
         Load the Whisper model if it hasn't been loaded yet.
         """
         if self.model is None:
-            self.model = self.model_factory(self.model_size)
+            if self.resources is not None:
+                self.resources.apply(self.worker_index)
+            self.model = self._create_model(self.model_size)
+    
+    # Name used before load_model became public
+    _load_model = load_model
+    
+    def _load_refine_model(self):
+        """
+        Load the larger two-pass model if it hasn't been loaded yet.
+        """
+        if self.refine_model is None:
+            self.refine_model = self._create_model(self.refine_model_size)
+    
+    def _create_model(self, model_size):
+        """
+        Create a model of the given size with the configured factory.
+        """
+        factory = self.model_factory
+        if factory is None:
+            factory = load_quantized_model if self.quantize else whisper.load_model
+        return factory(model_size)
     
     def is_video_file(self, file_path):
         """
@@ -76,18 +141,59 @@ class Transcriber:
         Returns:
             str: The transcribed text
         """
+        return self._transcribe(file_path)["text"]
+    
+    def transcribe_segments(self, file_path):
+        """
+        Transcribe an audio or video file into timestamped segments.
+        
+        Args:
+            file_path (str): Path to the audio or video file
+            
+        Returns:
+            list: Dicts with "start" and "end" (seconds from the start of
+                  the file) and "text"
+        """
+        return self._segments(self._transcribe(file_path))
+    
+    @staticmethod
+    def _segments(result):
+        """
+        Reduce a Whisper result to its timestamped segments.
+        """
+        return [
+            {"start": s["start"], "end": s["end"], "text": s["text"].strip()}
+            for s in result.get("segments", [])
+        ]
+    
+    def _transcribe(self, file_path):
+        """
+        Run the model on an audio or video file.
+        
+        Args:
+            file_path (str): Path to the audio or video file
+            
+        Returns:
+            dict: The raw Whisper result
+        """
         # Check if file exists
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
         # Load the model if not already loaded
-        self._load_model()
+        self.load_model()
+        
+        if self.refine_model_size:
+            return self._transcribe_two_pass(self._load_audio(file_path))
+        
+        if self.audio_cache is not None:
+            return self.model.transcribe(self._load_audio(file_path), **self.transcribe_options)
         
         # If it's a video file, extract the audio first
         if self.is_video_file(file_path):
             audio_path = self.audio_extractor.extract_audio(file_path)
             try:
-                result = self.model.transcribe(audio_path)
+                result = self.model.transcribe(audio_path, **self.transcribe_options)
                 # Clean up the temporary audio file
                 os.unlink(audio_path)
             except Exception as e:
@@ -96,13 +202,126 @@ class Transcriber:
                 raise e
         elif self.is_audio_file(file_path):
             # Directly transcribe audio file
-            result = self.model.transcribe(file_path)
+            result = self.model.transcribe(file_path, **self.transcribe_options)
+        else:
+            raise ValueError(f"Unsupported file type: {file_path}")
+        
+        return result
+    
+    def _load_audio(self, file_path):
+        """
+        Get Whisper's 16 kHz mono samples of a file, from the cache if any.
+        
+        Args:
+            file_path (str): Path to the audio or video file
+            
+        Returns:
+            numpy.ndarray: float32 samples
+        """
+        if not (self.is_video_file(file_path) or self.is_audio_file(file_path)):
+            raise ValueError(f"Unsupported file type: {file_path}")
+        if self.audio_cache is not None:
+            return self.audio_cache.load(file_path, self._decode_audio)
+        return self._decode_audio(file_path)
+    
+    def _decode_audio(self, file_path):
+        """
+        Decode an audio or video file to Whisper's 16 kHz mono samples.
+        
+        Args:
+            file_path (str): Path to the audio or video file
+            
+        Returns:
+            numpy.ndarray: float32 samples
+        """
+        if self.is_video_file(file_path):
+            audio_path = self.audio_extractor.extract_audio(file_path)
+            try:
+                return whisper.load_audio(audio_path)
+            finally:
+                os.unlink(audio_path)
+        elif self.is_audio_file(file_path):
+            return whisper.load_audio(file_path)
         else:
             raise ValueError(f"Unsupported file type: {file_path}")
+    
+    @staticmethod
+    def _needs_refinement(segment):
+        """
+        Check whether a draft segment's confidence signals cross a threshold.
+        """
+        return (
+            segment.get("avg_logprob", 0.0) < REFINE_LOGPROB_THRESHOLD
+            or segment.get("compression_ratio", 0.0) > REFINE_COMPRESSION_RATIO_THRESHOLD
+            or segment.get("no_speech_prob", 0.0) > REFINE_NO_SPEECH_THRESHOLD
+        )
+    
+    def _transcribe_two_pass(self, audio):
+        """
+        Draft with the small model and re-decode low-confidence spans.
         
-        return result["text"]
+        Consecutive flagged segments are merged into one span so the larger
+        model gets as much context as possible, and its segments replace
+        the draft's segments for that span.
+        
+        Args:
+            audio (numpy.ndarray): 16 kHz mono samples
+            
+        Returns:
+            dict: Whisper-style result with "text", "segments" and
+                  "upgraded_fraction"
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        draft = self.model.transcribe(audio, **self.transcribe_options)
+        draft_segments = draft.get("segments", [])
+        
+        # Group runs of consecutive low-confidence segments
+        spans = []
+        for i, segment in enumerate(draft_segments):
+            if not self._needs_refinement(segment):
+                continue
+            if spans and spans[-1][1] == i - 1:
+                spans[-1][1] = i
+            else:
+                spans.append([i, i])
+        
+        refined = {}
+        upgraded_seconds = 0.0
+        for first, last in spans:
+            start = draft_segments[first]["start"]
+            end = draft_segments[last]["end"]
+            self._load_refine_model()
+            clip = audio[int(start * sample_rate):int(end * sample_rate)]
+            result = self.refine_model.transcribe(clip, **self.transcribe_options)
+            refined[first] = (last, [
+                dict(segment, start=segment["start"] + start,
+                     end=min(segment["end"] + start, end), refined=True)
+                for segment in result.get("segments", [])
+            ])
+            upgraded_seconds += end - start
+        
+        # Splice the refined spans into the draft
+        segments = []
+        i = 0
+        while i < len(draft_segments):
+            if i in refined:
+                last, replacement = refined[i]
+                segments.extend(replacement)
+                i = last + 1
+            else:
+                segments.append(draft_segments[i])
+                i += 1
+        
+        duration = len(audio) / sample_rate
+        self.upgraded_fraction = upgraded_seconds / duration if duration else 0.0
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": draft.get("language"),
+            "upgraded_fraction": self.upgraded_fraction,
+        }
     
-    def transcribe_and_save(self, file_path, output_path=None):
+    def transcribe_and_save(self, file_path, output_path=None, segments_path=None):
         """
         Transcribe a file and save the result to a text file.
         
@@ -110,12 +329,15 @@ class Transcriber:
             file_path (str): Path to the audio or video file
             output_path (str, optional): Path to save the transcription. 
                                         If None, will use the input filename with .txt extension
+            segments_path (str, optional): Path to also save the timestamped
+                                          segments as JSON
         
         Returns:
             str: Path to the saved transcription file
         """
         # Get transcription
-        transcription = self.transcribe_file(file_path)
+        result = self._transcribe(file_path)
+        transcription = result["text"]
         
         # Determine output path if not provided
         if output_path is None:
@@ -126,4 +348,8 @@ class Transcriber:
         with open(output_path, 'w') as f:
             f.write(transcription)
         
+        if segments_path is not None:
+            with open(segments_path, 'w') as f:
+                json.dump(self._segments(result), f, indent=2)
+        
         return output_path
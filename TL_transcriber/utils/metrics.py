@@ -0,0 +1,50 @@
+"""
+Accuracy metrics for comparing transcriptions.
+"""
+
+import re
+
+
+def normalize_words(text):
+    """
+    Split text into lowercase words without punctuation.
+    
+    Args:
+        text (str): Text to normalize
+        
+    Returns:
+        list: Normalized words
+    """
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Compute the word error rate of a hypothesis against a reference.
+    
+    Args:
+        reference (str): Reference transcription
+        hypothesis (str): Transcription to score
+        
+    Returns:
+        float: (substitutions + deletions + insertions) / reference words
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    
+    # Word-level Levenshtein distance, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, start=1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    
+    return previous[-1] / len(ref)
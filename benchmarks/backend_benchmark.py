@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Compare inference backends and compute types on the same audio.
+
+Each sample is an audio or video file. If a reference transcript with the
+same base name and a .txt extension exists next to it, word error rates are
+measured against it; otherwise every backend is scored against the first.
+
+    python benchmarks/backend_benchmark.py samples/*.wav --model base \
+        --backends whisper whisper:int8 faster-whisper:int8
+"""
+
+import argparse
+import sys
+import time
+
+import whisper
+from transcription_app.config.settings import MODEL_SIZES, DEFAULT_MODEL_SIZE
+from transcription_app.core.backends import create_backend_factory
+from transcription_app.core.transcriber import Transcriber
+from transcription_app.utils.file_utils import get_base_filename
+from transcription_app.utils.metrics import word_error_rate
+
+from benchmark_utils import read_reference
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("samples", nargs="+", help="Audio or video files to transcribe")
+    parser.add_argument("--model", choices=MODEL_SIZES, default=DEFAULT_MODEL_SIZE)
+    parser.add_argument("--backends", nargs="+",
+                        default=["whisper", "whisper:int8", "faster-whisper:int8"],
+                        help="BACKEND[:COMPUTE_TYPE] to compare (the first is the baseline)")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Timed runs per sample (the fastest is reported)")
+    return parser.parse_args()
+
+
+def run_backend(spec, model_size, samples, runs):
+    """
+    Transcribe every sample with one backend.
+
+    Args:
+        spec (str): BACKEND or BACKEND:COMPUTE_TYPE
+
+    Returns:
+        tuple: (model load seconds, {sample: (text, best seconds)})
+    """
+    backend, _, compute_type = spec.partition(":")
+    transcriber = Transcriber(
+        model_size=model_size,
+        model_factory=create_backend_factory(backend, compute_type or None),
+    )
+
+    started = time.perf_counter()
+    transcriber.load_model()
+    load_seconds = time.perf_counter() - started
+
+    results = {}
+    for sample in samples:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            text = transcriber.transcribe_file(sample)
+            timings.append(time.perf_counter() - started)
+        results[sample] = (text, min(timings))
+    return load_seconds, results
+
+
+def main():
+    """
+    Run the comparison and print a summary table.
+    """
+    args = parse_args()
+
+    durations = {s: len(whisper.load_audio(s)) / whisper.audio.SAMPLE_RATE for s in args.samples}
+    references = {s: read_reference(s) for s in args.samples}
+
+    runs = {spec: run_backend(spec, args.model, args.samples, args.runs)
+            for spec in args.backends}
+    baseline = args.backends[0]
+    total_audio = sum(durations.values())
+
+    print(f"Model: {args.model}  ({total_audio:.1f}s of audio in {len(args.samples)} samples)")
+    print(f"{'backend':<28} {'load s':>7} {'RTF':>7} {'speedup':>8} {'WER':>7}")
+
+    baseline_seconds = sum(seconds for _, seconds in runs[baseline][1].values())
+    for spec in args.backends:
+        load_seconds, results = runs[spec]
+        seconds = sum(elapsed for _, elapsed in results.values())
+
+        errors = []
+        for sample in args.samples:
+            text = results[sample][0]
+            reference = references[sample]
+            if reference is None:
+                # Without a reference, measure drift from the baseline backend
+                reference = runs[baseline][1][sample][0]
+            errors.append(word_error_rate(reference, text) * durations[sample])
+
+        print(f"{spec:<28} {load_seconds:7.1f} {seconds / total_audio:7.3f} "
+              f"{baseline_seconds / seconds:7.2f}x {sum(errors) / total_audio:7.3f}")
+
+    if len(args.samples) > 1:
+        print()
+        print(f"{'sample':<30} " + " ".join(f"{spec[:14]:>14}" for spec in args.backends))
+        for sample in args.samples:
+            rtfs = [runs[spec][1][sample][1] / durations[sample] for spec in args.backends]
+            print(f"{get_base_filename(sample)[:30]:<30} "
+                  + " ".join(f"{rtf:14.3f}" for rtf in rtfs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
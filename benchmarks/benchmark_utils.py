@@ -0,0 +1,22 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+import os
+
+
+def read_reference(sample):
+    """
+    Read the reference transcript of a sample, if there is one.
+
+    The reference is a .txt file with the sample's base name next to it.
+
+    Returns:
+        str: The reference text, or None if there is none
+    """
+    path = os.path.splitext(sample)[0] + ".txt"
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Time sampled fingerprints against full hashes as files grow.
+
+By default sparse files of increasing size are created in a temporary
+directory; pass real media files to time those instead. Sampled fingerprints
+are timed with the memo cleared, so every run reads the file.
+
+    python benchmarks/fingerprint_benchmark.py --sizes 1 64 1024 4096
+    python benchmarks/fingerprint_benchmark.py lectures/*.mp4
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+from transcription_app.utils.file_utils import _fingerprint, fingerprint_file, get_file_size
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Files to fingerprint (default: sparse files)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1, 64, 1024],
+                        help="Sizes in MiB of the generated files")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Timed runs per file (the fastest is reported)")
+    parser.add_argument("--skip-full", action="store_true",
+                        help="Only time sampled fingerprints")
+    return parser.parse_args()
+
+
+def make_sparse_file(directory, size_mib):
+    """
+    Create a sparse file with data written at its head and tail.
+    """
+    path = os.path.join(directory, f"{size_mib}MiB.bin")
+    size = size_mib * 1024 * 1024
+    with open(path, 'wb') as f:
+        f.truncate(size)
+        f.write(os.urandom(min(size, 1024 * 1024)))
+        f.seek(max(size - 1024 * 1024, 0))
+        f.write(os.urandom(min(size, 1024 * 1024)))
+    return path
+
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    """
+    Hash a whole file with SHA-256, the baseline the fingerprints replaced.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def best_time(function, runs):
+    """
+    Time a function and return the fastest run in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        _fingerprint.cache_clear()
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    """
+    Run the benchmark and print a table of timings.
+    """
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = args.files or [make_sparse_file(temp_dir, size) for size in args.sizes]
+
+        print(f"{'file':<30} {'size MiB':>9} {'sampled ms':>11} {'memo ms':>8} "
+              f"{'full ms':>9} {'sha256 ms':>10}")
+        for path in files:
+            sampled = best_time(lambda: fingerprint_file(path), args.runs)
+
+            fingerprint_file(path)
+            started = time.perf_counter()
+            fingerprint_file(path)
+            memoized = (time.perf_counter() - started) * 1000
+
+            if args.skip_full:
+                full = sha256 = float("nan")
+            else:
+                full = best_time(lambda: fingerprint_file(path, full=True), 1)
+                sha256 = best_time(lambda: sha256_file(path), 1)
+
+            print(f"{os.path.basename(path)[:30]:<30} "
+                  f"{get_file_size(path) / 1024 / 1024:9.1f} {sampled:11.2f} "
+                  f"{memoized:8.3f} {full:9.1f} {sha256:10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Measure the real-time factor and accuracy of each speed/accuracy preset.
+
+Each sample is an audio or video file. If a reference transcript with the
+same base name and a .txt extension exists next to it, word error rates are
+measured against it; otherwise every preset is scored against the most
+accurate one. The measured real-time factors can be copied to PRESET_RTF,
+which --preset auto uses.
+
+    python benchmarks/preset_benchmark.py samples/*.wav --backend faster-whisper
+"""
+
+import argparse
+import sys
+import time
+
+import whisper
+from transcription_app.config.presets import decode_options, get_preset
+from transcription_app.config.settings import BACKENDS, DEFAULT_BACKEND, PRESETS, PRESET_RTF
+from transcription_app.core.backends import create_backend_factory
+from transcription_app.core.transcriber import Transcriber
+from transcription_app.utils.metrics import word_error_rate
+
+from benchmark_utils import read_reference
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("samples", nargs="+", help="Audio or video files to transcribe")
+    parser.add_argument("--presets", nargs="+", choices=list(PRESETS), default=list(PRESETS),
+                        help="Presets to compare (default: all)")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--compute-type", help="Backend compute type")
+    parser.add_argument("--language", help="Fix the language for every preset")
+    return parser.parse_args()
+
+
+def run_preset(name, args):
+    """
+    Transcribe every sample with one preset.
+
+    Returns:
+        dict: {sample: (text, seconds)}
+    """
+    preset = get_preset(name)
+    transcriber = Transcriber(
+        model_size=preset["model"],
+        model_factory=create_backend_factory(args.backend, args.compute_type),
+        decode_options=decode_options(preset, args.language),
+    )
+    # Model loading is not part of the turnaround of a warm worker
+    transcriber.load_model()
+
+    results = {}
+    for sample in args.samples:
+        started = time.perf_counter()
+        text = transcriber.transcribe_file(sample)
+        results[sample] = (text, time.perf_counter() - started)
+    return results
+
+
+def main():
+    """
+    Run every preset and print a table of real-time factors.
+    """
+    args = parse_args()
+
+    durations = {s: len(whisper.load_audio(s)) / whisper.audio.SAMPLE_RATE for s in args.samples}
+    references = {s: read_reference(s) for s in args.samples}
+    total_audio = sum(durations.values())
+
+    runs = {name: run_preset(name, args) for name in args.presets}
+    most_accurate = args.presets[-1]
+
+    print(f"Backend: {args.backend}  ({total_audio:.1f}s of audio in {len(args.samples)} samples)")
+    print(f"{'preset':<10} {'model':<7} {'RTF':>7} {'assumed':>8} {'WER':>7}")
+    for name in args.presets:
+        results = runs[name]
+        seconds = sum(elapsed for _, elapsed in results.values())
+
+        errors = []
+        for sample in args.samples:
+            reference = references[sample]
+            if reference is None:
+                reference = runs[most_accurate][sample][0]
+            errors.append(word_error_rate(reference, results[sample][0]) * durations[sample])
+
+        print(f"{name:<10} {PRESETS[name]['model']:<7} {seconds / total_audio:7.3f} "
+              f"{PRESET_RTF.get(name, float('nan')):8.3f} {sum(errors) / total_audio:7.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compare fp32 and int8-quantized Whisper inference on a fixed sample set.
+
+Each sample is an audio or video file. If a reference transcript with the
+same base name and a .txt extension exists next to it, word error rates are
+measured against it; otherwise the int8 output is scored against fp32.
+
+    python benchmarks/quantization_benchmark.py samples/*.wav --model base
+"""
+
+import argparse
+import sys
+import time
+
+import whisper
+from transcription_app.config.settings import MODEL_SIZES, DEFAULT_MODEL_SIZE
+from transcription_app.core.transcriber import Transcriber
+from transcription_app.utils.file_utils import get_base_filename
+from transcription_app.utils.metrics import word_error_rate
+
+from benchmark_utils import read_reference
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
+    
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("samples", nargs="+", help="Audio or video files to transcribe")
+    parser.add_argument("--model", choices=MODEL_SIZES, default=DEFAULT_MODEL_SIZE)
+    parser.add_argument("--runs", type=int, default=1,
+                        help="Timed runs per sample (the fastest is reported)")
+    return parser.parse_args()
+
+
+def run_mode(model_size, quantize, samples, runs):
+    """
+    Transcribe every sample with one model variant.
+    
+    Returns:
+        tuple: (model load seconds, {sample: (text, best seconds)})
+    """
+    transcriber = Transcriber(model_size=model_size, quantize=quantize)
+    
+    started = time.perf_counter()
+    transcriber.load_model()
+    load_seconds = time.perf_counter() - started
+    
+    results = {}
+    for sample in samples:
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            text = transcriber.transcribe_file(sample)
+            timings.append(time.perf_counter() - started)
+        results[sample] = (text, min(timings))
+    return load_seconds, results
+
+
+def main():
+    """
+    Run the comparison and print a summary table.
+    """
+    args = parse_args()
+    
+    durations = {s: len(whisper.load_audio(s)) / whisper.audio.SAMPLE_RATE for s in args.samples}
+    references = {s: read_reference(s) for s in args.samples}
+    
+    fp32_load, fp32 = run_mode(args.model, False, args.samples, args.runs)
+    int8_load, int8 = run_mode(args.model, True, args.samples, args.runs)
+    
+    print(f"Model: {args.model}  (load: fp32 {fp32_load:.1f}s, int8 {int8_load:.1f}s)")
+    print(f"{'sample':<30} {'audio s':>8} {'fp32 RTF':>9} {'int8 RTF':>9} "
+          f"{'speedup':>8} {'fp32 WER':>9} {'int8 WER':>9}")
+    
+    totals = [0.0, 0.0, 0.0]
+    for sample in args.samples:
+        duration = durations[sample]
+        fp32_text, fp32_seconds = fp32[sample]
+        int8_text, int8_seconds = int8[sample]
+        reference = references[sample]
+        
+        if reference is None:
+            # Without a reference, measure how far int8 drifts from fp32
+            fp32_wer, int8_wer = 0.0, word_error_rate(fp32_text, int8_text)
+        else:
+            fp32_wer = word_error_rate(reference, fp32_text)
+            int8_wer = word_error_rate(reference, int8_text)
+        
+        totals[0] += duration
+        totals[1] += fp32_seconds
+        totals[2] += int8_seconds
+        print(f"{get_base_filename(sample)[:30]:<30} {duration:8.1f} "
+              f"{fp32_seconds / duration:9.3f} {int8_seconds / duration:9.3f} "
+              f"{fp32_seconds / int8_seconds:7.2f}x {fp32_wer:9.3f} {int8_wer:9.3f}")
+    
+    audio, fp32_total, int8_total = totals
+    print(f"{'total':<30} {audio:8.1f} {fp32_total / audio:9.3f} "
+          f"{int8_total / audio:9.3f} {fp32_total / int8_total:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Tests for the presets module.
+"""
+
+import unittest
+
+from transcription_app.config.presets import choose_preset, decode_options, get_preset
+from transcription_app.config.settings import DEFAULT_PRESET
+
+
+class TestPresets(unittest.TestCase):
+    """Test cases for the speed/accuracy presets."""
+
+    RTF = {"fast": 0.05, "balanced": 0.2, "accurate": 1.0}
+
+    def test_get_preset(self):
+        """Test presets are copies and unknown names are rejected."""
+        preset = get_preset("fast")
+        preset["model"] = "large"
+        self.assertEqual(get_preset("fast")["model"], "tiny")
+
+        with self.assertRaises(ValueError):
+            get_preset("fastest")
+
+    def test_decode_options(self):
+        """Test only set options are passed, with the language override."""
+        options = decode_options(get_preset("fast"))
+        self.assertNotIn("model", options)
+        self.assertNotIn("beam_size", options)
+        self.assertNotIn("language", options)
+        self.assertEqual(options["temperature"], (0.0,))
+        self.assertFalse(options["condition_on_previous_text"])
+
+        self.assertEqual(decode_options(get_preset("accurate"), language="de")["language"], "de")
+        self.assertEqual(decode_options({}, language="en"), {"language": "en"})
+
+    def test_choose_preset(self):
+        """Test the most accurate preset that fits the target is chosen."""
+        # Ten minutes of audio
+        self.assertEqual(choose_preset(600, target_seconds=600, rtf=self.RTF), "accurate")
+        self.assertEqual(choose_preset(600, target_seconds=300, rtf=self.RTF), "balanced")
+        self.assertEqual(choose_preset(600, target_seconds=30, rtf=self.RTF), "fast")
+        # Nothing fits: the fastest preset is the best that can be done
+        self.assertEqual(choose_preset(600, target_seconds=1, rtf=self.RTF), "fast")
+
+    def test_choose_preset_unknown_duration(self):
+        """Test the default preset is used when the duration is unknown."""
+        self.assertEqual(choose_preset(None, target_seconds=1, rtf=self.RTF), DEFAULT_PRESET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for the resources module.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+from transcription_app.config.resources import ResourceBudget, set_thread_limits
+
+
+class TestResourceBudget(unittest.TestCase):
+    """Test cases for the ResourceBudget class."""
+
+    def test_cpus_are_divided_between_workers(self):
+        """Test every CPU is assigned to exactly one worker."""
+        budget = ResourceBudget(workers=3, cpus=list(range(8)))
+
+        shares = [budget.worker_cpus(i) for i in range(3)]
+        self.assertEqual(shares, [[0, 1, 2], [3, 4, 5], [6, 7]])
+        self.assertEqual(budget.threads_per_worker, 2)
+        self.assertEqual(budget.threads_for(0), 3)
+
+    def test_more_workers_than_cpus(self):
+        """Test workers share CPUs round-robin with one thread each."""
+        budget = ResourceBudget(workers=5, cpus=[0, 1])
+
+        self.assertEqual([budget.worker_cpus(i) for i in range(5)],
+                         [[0], [1], [0], [1], [0]])
+        self.assertEqual(budget.threads_for(4), 1)
+
+    @patch('transcription_app.config.resources.pin_to_cpus')
+    @patch('transcription_app.config.resources.set_thread_limits')
+    def test_apply(self, mock_limits, mock_pin):
+        """Test applying limits, with pinning only when requested."""
+        ResourceBudget(workers=2, cpus=[0, 1, 2, 3]).apply(1)
+        mock_limits.assert_called_once_with(2)
+        mock_pin.assert_not_called()
+
+        ResourceBudget(workers=2, cpus=[0, 1, 2, 3], pin=True).apply(1)
+        mock_pin.assert_called_once_with([2, 3])
+
+    @patch('transcription_app.config.resources.pin_to_cpus')
+    @patch('transcription_app.config.resources.set_thread_limits')
+    def test_processes_split_thread_limit(self, mock_limits, mock_pin):
+        """Test parallel processes of a worker split its threads, not its CPUs."""
+        budget = ResourceBudget(workers=2, cpus=list(range(8)), pin=True,
+                                processes_per_worker=2)
+
+        self.assertEqual(budget.apply(1), 2)
+        mock_limits.assert_called_once_with(2)
+        mock_pin.assert_called_once_with([4, 5, 6, 7])
+        self.assertEqual(ResourceBudget(workers=4, cpus=[0, 1, 2, 3],
+                                        processes_per_worker=3).apply(), 1)
+
+    @patch.dict(os.environ, {}, clear=False)
+    def test_set_thread_limits_environment(self):
+        """Test child processes such as tesseract inherit the limit."""
+        import torch
+        previous = torch.get_num_threads()
+        try:
+            set_thread_limits(2)
+            self.assertEqual(os.environ["OMP_THREAD_LIMIT"], "2")
+            self.assertEqual(torch.get_num_threads(), 2)
+        finally:
+            torch.set_num_threads(previous)
+
+
+    def test_set_thread_limits_does_not_import_torch(self):
+        """Test libraries the process has not loaded are left alone."""
+        code = ("import sys; from transcription_app.config.resources import ResourceBudget; "
+                "ResourceBudget(workers=2).apply(); print('torch' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
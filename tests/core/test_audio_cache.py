@@ -0,0 +1,102 @@
+"""
+Tests for the audio_cache module.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from transcription_app.core.audio_cache import AudioCache
+from transcription_app.core.transcriber import Transcriber
+
+
+class TestAudioCache(unittest.TestCase):
+    """Test cases for the AudioCache class."""
+
+    def setUp(self):
+        """Create a cache and a source file in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.source = os.path.join(self.temp_dir.name, "lecture.mp3")
+        with open(self.source, 'wb') as f:
+            f.write(b"fake mp3 data")
+        self.audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_decodes_once_across_instances(self):
+        """Test later loads, even from a new cache object, skip decoding."""
+        decode = MagicMock(return_value=self.audio)
+
+        first = AudioCache(self.cache_dir).load(self.source, decode)
+        second = AudioCache(self.cache_dir).load(self.source, decode)
+
+        decode.assert_called_once_with(self.source)
+        np.testing.assert_array_equal(first, self.audio)
+        np.testing.assert_array_equal(second, self.audio)
+        self.assertIsInstance(second, np.memmap)
+        self.assertEqual(second.dtype, np.float32)
+
+    def test_keyed_by_content(self):
+        """Test a copy of a file under another name hits the cache."""
+        copy = os.path.join(self.temp_dir.name, "renamed.mp3")
+        with open(copy, 'wb') as f:
+            f.write(b"fake mp3 data")
+        cache = AudioCache(self.cache_dir)
+        decode = MagicMock(return_value=self.audio)
+
+        cache.load(self.source, decode)
+        cache.load(copy, decode)
+
+        decode.assert_called_once()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test the size budget deletes the entries read longest ago."""
+        cache = AudioCache(self.cache_dir, max_bytes=2 * self.audio.nbytes + 1024)
+        for age, key in enumerate(["a", "b"]):
+            cache.put(key, self.audio)
+            os.utime(cache.path_for(key), (1000 + age, 1000 + age))
+
+        # Reading "a" makes "b" the least recently used entry
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", self.audio)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+
+    def test_entry_larger_than_budget(self):
+        """Test audio too large to cache is still returned."""
+        cache = AudioCache(self.cache_dir, max_bytes=10)
+        decode = MagicMock(return_value=self.audio)
+
+        np.testing.assert_array_equal(cache.load(self.source, decode), self.audio)
+        self.assertEqual(cache.size(), 0)
+
+    @patch('transcription_app.core.transcriber.whisper.load_audio')
+    def test_transcriber_reuses_audio_across_models(self, mock_load_audio):
+        """Test rerunning with another model size does not decode again."""
+        mock_load_audio.return_value = self.audio
+        cache = AudioCache(self.cache_dir)
+        models = {"tiny": MagicMock(), "small": MagicMock()}
+        for model in models.values():
+            model.transcribe.return_value = {"text": "hello"}
+
+        for size in ["tiny", "small"]:
+            transcriber = Transcriber(model_size=size, model_factory=models.get,
+                                      audio_cache=cache)
+            self.assertEqual(transcriber.transcribe_file(self.source), "hello")
+
+        mock_load_audio.assert_called_once_with(self.source)
+        audio = models["small"].transcribe.call_args.args[0]
+        np.testing.assert_array_equal(audio, self.audio)
+
+
+if __name__ == '__main__':
+    unittest.main()
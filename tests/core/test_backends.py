@@ -0,0 +1,133 @@
+"""
+Tests for the backends module.
+"""
+
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from transcription_app.core.backends import (
+    FasterWhisperBackend,
+    TranscriptionBackend,
+    WhisperBackend,
+    create_backend_factory,
+)
+from transcription_app.core.transcriber import Transcriber
+
+
+def make_segment(index, start, end, text):
+    """Create a faster-whisper style segment."""
+    return SimpleNamespace(
+        id=index, start=start, end=end, text=text, avg_logprob=-0.2,
+        compression_ratio=1.3, no_speech_prob=0.01, temperature=0.0,
+    )
+
+
+class TestWhisperBackend(unittest.TestCase):
+    """Test cases for the openai-whisper backend."""
+
+    @patch('transcription_app.core.backends.whisper.load_model')
+    def test_float32(self, mock_load_model):
+        """Test the standard model is loaded and called unchanged."""
+        mock_load_model.return_value.transcribe.return_value = {"text": "hello"}
+
+        backend = WhisperBackend("tiny")
+
+        self.assertIsInstance(backend, TranscriptionBackend)
+        mock_load_model.assert_called_once_with("tiny")
+        self.assertEqual(backend.transcribe("a.wav"), {"text": "hello"})
+        backend.model.transcribe.assert_called_once_with("a.wav")
+
+    @patch('transcription_app.core.backends.load_quantized_model')
+    def test_int8(self, mock_load_quantized):
+        """Test int8 uses the quantized model without fp16."""
+        backend = WhisperBackend("base", compute_type="int8")
+
+        backend.transcribe("a.wav", language="en")
+
+        mock_load_quantized.assert_called_once_with("base")
+        backend.model.transcribe.assert_called_once_with("a.wav", language="en", fp16=False)
+
+    def test_unsupported_compute_type(self):
+        """Test compute types PyTorch cannot run are rejected."""
+        with self.assertRaises(ValueError):
+            WhisperBackend("base", compute_type="int8_float16")
+
+
+class TestFasterWhisperBackend(unittest.TestCase):
+    """Test cases for the faster-whisper backend."""
+
+    def setUp(self):
+        """Provide a fake faster_whisper module."""
+        self.module = MagicMock()
+        self.model = self.module.WhisperModel.return_value
+        patcher = patch.dict(sys.modules, {"faster_whisper": self.module})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_result_is_converted(self):
+        """Test lazy segments become a Whisper-style result."""
+        segments = iter([make_segment(0, 0.0, 2.0, " Hello"),
+                         make_segment(1, 2.0, 3.5, " world.")])
+        self.model.transcribe.return_value = (segments, SimpleNamespace(language="en"))
+
+        backend = FasterWhisperBackend("small", cpu_threads=4)
+        result = backend.transcribe("a.wav", fp16=False, beam_size=1)
+
+        self.module.WhisperModel.assert_called_once_with(
+            "small", device="cpu", compute_type="int8", cpu_threads=4
+        )
+        self.model.transcribe.assert_called_once_with("a.wav", beam_size=1)
+        self.assertEqual(result["text"], " Hello world.")
+        self.assertEqual(result["language"], "en")
+        self.assertEqual(result["segments"][1]["start"], 2.0)
+        self.assertEqual(result["segments"][1]["avg_logprob"], -0.2)
+
+    def test_greedy_by_default(self):
+        """Test decoding is greedy, as with openai-whisper, unless a beam is set."""
+        self.model.transcribe.return_value = (iter([]), SimpleNamespace(language="en"))
+        backend = FasterWhisperBackend("small")
+
+        backend.transcribe("a.wav", temperature=(0.0,))
+        self.model.transcribe.assert_called_once_with("a.wav", temperature=(0.0,), beam_size=1)
+
+        backend.transcribe("a.wav", beam_size=5)
+        self.assertEqual(self.model.transcribe.call_args.kwargs["beam_size"], 5)
+
+    def test_transcriber_uses_backend(self):
+        """Test Transcriber works with a backend from the factory."""
+        self.model.transcribe.return_value = (
+            iter([make_segment(0, 0.0, 1.0, " Hi there")]), SimpleNamespace(language="en")
+        )
+        transcriber = Transcriber(
+            model_size="tiny",
+            model_factory=create_backend_factory("faster-whisper", "int8_float32"),
+        )
+
+        with patch('os.path.exists', return_value=True):
+            self.assertEqual(
+                transcriber.transcribe_segments("talk.wav"),
+                [{"start": 0.0, "end": 1.0, "text": "Hi there"}],
+            )
+        self.assertEqual(self.module.WhisperModel.call_args.kwargs["compute_type"], "int8_float32")
+
+
+class TestBackendFactory(unittest.TestCase):
+    """Test cases for create_backend_factory."""
+
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected up front."""
+        with self.assertRaises(ValueError):
+            create_backend_factory("onnx")
+
+    def test_missing_faster_whisper(self):
+        """Test a helpful error when faster-whisper is not installed."""
+        with patch.dict(sys.modules, {"faster_whisper": None}):
+            with self.assertRaises(ImportError) as context:
+                create_backend_factory("faster-whisper")("base")
+        self.assertIn("pip install faster-whisper", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
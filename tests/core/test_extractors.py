@@ -2,7 +2,9 @@
 Tests for the extractors module.
 """
 
+import json
 import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -90,5 +92,110 @@ class TestFFmpegAudioExtractor(unittest.TestCase):
         mock_unlink.assert_called_once_with("temp_audio.mp3")
 
 
+
+class TestFFmpegAudioExtractorProbing(unittest.TestCase):
+    """Test cases for probe-driven extraction paths."""
+
+    def setUp(self):
+        """Create a real input file so it can be probed."""
+        self.extractor = FFmpegAudioExtractor()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.temp_dir.name, "lecture.mp4")
+        with open(self.video_path, "wb") as f:
+            f.write(b"not really a video")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _mock_run(self, mock_run, codec):
+        """Answer ffprobe with one audio stream and let ffmpeg succeed."""
+        streams = [{"codec_type": "video", "codec_name": "h264"}]
+        if codec:
+            streams.append({"codec_type": "audio", "codec_name": codec})
+        probe = json.dumps({"streams": streams, "format": {"duration": "3600.5"}})
+
+        def run(command, **kwargs):
+            process = MagicMock()
+            process.returncode = 0
+            process.stdout = probe if command[0] == 'ffprobe' else ""
+            return process
+
+        mock_run.side_effect = run
+
+    def _ffmpeg_commands(self, mock_run):
+        return [c.args[0] for c in mock_run.call_args_list if c.args[0][0] == 'ffmpeg']
+
+    @patch('subprocess.run')
+    def test_copyable_codec_is_stream_copied(self, mock_run):
+        """AAC audio is demuxed into an m4a file without re-encoding."""
+        self._mock_run(mock_run, "aac")
+
+        result = self.extractor.extract_audio(self.video_path)
+        os.unlink(result)
+
+        command = self._ffmpeg_commands(mock_run)[0]
+        self.assertTrue(result.endswith(".m4a"))
+        self.assertIn('copy', command)
+        self.assertNotIn('-q:a', command)
+
+    @patch('subprocess.run')
+    def test_other_codec_is_resampled_to_pcm(self, mock_run):
+        """Codecs that cannot be copied are decoded to 16 kHz mono PCM."""
+        self._mock_run(mock_run, "ac3")
+
+        result = self.extractor.extract_audio(self.video_path)
+        os.unlink(result)
+
+        command = self._ffmpeg_commands(mock_run)[0]
+        self.assertTrue(result.endswith(".wav"))
+        self.assertEqual(command[command.index('-ar') + 1], '16000')
+        self.assertIn('pcm_s16le', command)
+
+    @patch('subprocess.run')
+    def test_time_range_seeks_before_input(self, mock_run):
+        """Range extraction seeks before decoding and limits the duration."""
+        self._mock_run(mock_run, "aac")
+
+        result = self.extractor.extract_audio(self.video_path, start=60, end=90)
+        os.unlink(result)
+
+        command = self._ffmpeg_commands(mock_run)[0]
+        self.assertLess(command.index('-ss'), command.index('-i'))
+        self.assertEqual(command[command.index('-t') + 1], '30')
+
+    @patch('subprocess.run')
+    def test_probe_is_cached(self, mock_run):
+        """The file is probed only once for repeated extractions."""
+        self._mock_run(mock_run, "mp3")
+
+        for _ in range(2):
+            os.unlink(self.extractor.extract_audio(self.video_path))
+        self.assertEqual(self.extractor.get_duration(self.video_path), 3600.5)
+
+        probes = [c for c in mock_run.call_args_list if c.args[0][0] == 'ffprobe']
+        self.assertEqual(len(probes), 1)
+
+    @patch('subprocess.run')
+    def test_thread_limit(self, mock_run):
+        """A thread limit from the resource budget is passed to ffmpeg."""
+        self._mock_run(mock_run, "aac")
+        extractor = FFmpegAudioExtractor(threads=2)
+
+        os.unlink(extractor.extract_audio(self.video_path))
+
+        command = self._ffmpeg_commands(mock_run)[0]
+        self.assertEqual(command[command.index('-threads') + 1], '2')
+
+    @patch('subprocess.run')
+    def test_no_audio_stream(self, mock_run):
+        """Files without audio are rejected before running ffmpeg."""
+        self._mock_run(mock_run, None)
+
+        with self.assertRaises(Exception):
+            self.extractor.extract_audio(self.video_path)
+        self.assertEqual(self._ffmpeg_commands(mock_run), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,203 @@
+"""
+Tests for the ingest module.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from transcription_app.core.ingest import IngestDaemon, IngestState, InotifyWatcher
+
+
+class FakeTranscriber:
+    """Transcriber stand-in that records the files it was given."""
+
+    def __init__(self, processed):
+        self.processed = processed
+
+    def load_model(self):
+        pass
+
+    def transcribe_and_save(self, file_path, output_path):
+        self.processed.append(os.path.basename(file_path))
+        with open(output_path, 'w') as f:
+            f.write("text")
+        return output_path
+
+
+class TestIngest(unittest.TestCase):
+    """Test cases for the watch-folder ingestion daemon."""
+
+    def setUp(self):
+        """Create watched, output and state locations."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.watch_dir = os.path.join(self.temp_dir.name, "inbox")
+        self.output_dir = os.path.join(self.temp_dir.name, "out")
+        os.makedirs(self.watch_dir)
+        os.makedirs(self.output_dir)
+        self.state_path = os.path.join(self.temp_dir.name, "state.json")
+        self.processed = []
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _drop(self, name, content):
+        with open(os.path.join(self.watch_dir, name), 'wb') as f:
+            f.write(content)
+
+    def _start_daemon(self):
+        daemon = IngestDaemon(
+            [self.watch_dir], self.state_path,
+            transcriber_factory=lambda index: FakeTranscriber(self.processed),
+            output_dir=self.output_dir, settle_seconds=0.05,
+        )
+        thread = threading.Thread(target=daemon.serve_forever, args=(0.05,))
+        thread.start()
+        return daemon, thread
+
+    def _wait_for(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(self.processed) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.2)
+
+    def test_inotify_reports_closed_files(self):
+        """Test closed and moved-in files are reported without polling."""
+        watcher = InotifyWatcher([self.watch_dir])
+        try:
+            self._drop("lecture.mp3", b"audio")
+            os.rename(os.path.join(self.watch_dir, "lecture.mp3"),
+                      os.path.join(self.watch_dir, "renamed.mp3"))
+            events = watcher.read_events(timeout=1)
+        finally:
+            watcher.close()
+
+        names = [os.path.basename(path) for path in events]
+        self.assertIn("lecture.mp3", names)
+        self.assertIn("renamed.mp3", names)
+
+    def test_overflow_reports_every_file(self):
+        """Test lost events are made up for by listing the directories."""
+        self._drop("lecture1.mp3", b"one")
+        self._drop("lecture2.mp3", b"two")
+        watcher = InotifyWatcher([self.watch_dir])
+        overflow = InotifyWatcher.EVENT_HEADER.pack(-1, InotifyWatcher.IN_Q_OVERFLOW, 0, 0)
+        try:
+            with patch('transcription_app.core.ingest.select.select',
+                       return_value=([watcher._fd], [], [])), \
+                    patch('transcription_app.core.ingest.os.read', return_value=overflow):
+                events = watcher.read_events(timeout=1)
+        finally:
+            watcher.close()
+
+        self.assertEqual([os.path.basename(path) for path in events],
+                         ["lecture1.mp3", "lecture2.mp3"])
+
+    def test_full_queue_does_not_block_submission(self):
+        """Test settled files wait in a backlog when the queue is full."""
+        daemon = IngestDaemon([self.watch_dir], self.state_path,
+                              transcriber_factory=MagicMock(), queue_size=1)
+        for name, content in [("large.mp3", b"a" * 100), ("small.mp3", b"b"),
+                              ("medium.mp3", b"c" * 10)]:
+            self._drop(name, content)
+            daemon._submit(os.path.join(self.watch_dir, name))
+        daemon._fill_queue()
+
+        order = []
+        while True:
+            try:
+                order.append(os.path.basename(daemon.queue.get_nowait()[2]))
+            except queue.Empty:
+                break
+            daemon._fill_queue()
+        self.assertEqual(order, ["small.mp3", "medium.mp3", "large.mp3"])
+
+    def test_new_files_processed_once(self):
+        """Test dropped media is processed and duplicates are skipped."""
+        daemon, thread = self._start_daemon()
+        try:
+            self._drop("week1.mp3", b"lecture one")
+            self._drop("notes.txt", b"not media")
+            self._wait_for(1)
+            self._drop("week1-copy.mp3", b"lecture one")
+            self._drop("week2.mp4", b"lecture two")
+            self._wait_for(2)
+        finally:
+            daemon.stop()
+            thread.join()
+
+        self.assertEqual(sorted(self.processed), ["week1.mp3", "week2.mp4"])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "week2.txt")))
+
+    def test_state_survives_restart(self):
+        """Test files processed before a restart are not processed again."""
+        self._drop("week1.mp3", b"lecture one")
+        daemon, thread = self._start_daemon()
+        self._wait_for(1)
+        daemon.stop()
+        thread.join()
+
+        self._drop("week2.mp3", b"lecture two")
+        daemon, thread = self._start_daemon()
+        self._wait_for(2)
+        daemon.stop()
+        thread.join()
+
+        self.assertEqual(self.processed, ["week1.mp3", "week2.mp3"])
+        self.assertEqual(len(IngestState(self.state_path).processed), 2)
+
+    def test_model_load_failure_stops_daemon(self):
+        """Test a worker that cannot load its model stops the daemon."""
+        def broken_factory(index):
+            raise ImportError("faster-whisper is not installed")
+
+        daemon = IngestDaemon([self.watch_dir], self.state_path,
+                              transcriber_factory=broken_factory,
+                              output_dir=self.output_dir, workers=2,
+                              queue_size=1, settle_seconds=0.05)
+        errors = []
+
+        def serve():
+            try:
+                daemon.serve_forever(0.05)
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        self._drop("week1.mp3", b"lecture one")
+        self._drop("week2.mp3", b"lecture two")
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0].__cause__, ImportError)
+
+    def test_priority(self):
+        """Test earlier directories, then smaller files, come first."""
+        other_dir = os.path.join(self.temp_dir.name, "backlog")
+        os.makedirs(other_dir)
+        daemon = IngestDaemon([self.watch_dir, other_dir], self.state_path,
+                              transcriber_factory=MagicMock())
+        self._drop("small.mp3", b"a")
+        self._drop("large.mp3", b"a" * 100)
+        with open(os.path.join(other_dir, "tiny.mp3"), 'wb') as f:
+            f.write(b"")
+
+        ranked = sorted(
+            [os.path.join(self.watch_dir, "large.mp3"),
+             os.path.join(other_dir, "tiny.mp3"),
+             os.path.join(self.watch_dir, "small.mp3")],
+            key=daemon.priority,
+        )
+        self.assertEqual([os.path.basename(p) for p in ranked],
+                         ["small.mp3", "large.mp3", "tiny.mp3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+"""
+Tests for the job_queue module.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+from transcription_app.core.job_queue import JobQueue, QueueWorker
+
+
+class FakeTranscriber:
+    """Transcriber stand-in that logs every run and can fail or stall."""
+
+    def __init__(self, log_path, fail_first=0, delay=0.0):
+        self.log_path = log_path
+        self.fail_first = fail_first
+        self.delay = delay
+
+    def transcribe_and_save(self, file_path, output_path):
+        # Appends from several processes land as whole lines
+        with open(self.log_path, 'a') as f:
+            f.write(f"{os.path.basename(file_path)}\n")
+        time.sleep(self.delay)
+        if self.fail_first:
+            self.fail_first -= 1
+            raise RuntimeError("decoder crashed")
+        with open(output_path, 'w') as f:
+            f.write("text")
+        return output_path
+
+
+def drain(db_path, log_path, delay):
+    """Run a worker in a child process until the queue is empty."""
+    job_queue = JobQueue(db_path, lease_seconds=5)
+    worker = QueueWorker(job_queue, lambda: FakeTranscriber(log_path, delay=delay),
+                         poll_interval=0.01)
+    worker.run(until_empty=True)
+
+
+def hang(db_path, log_path):
+    """Claim a job and stall on it without heartbeats until killed."""
+    job_queue = JobQueue(db_path, lease_seconds=0.5)
+    worker = QueueWorker(job_queue, lambda: FakeTranscriber(log_path, delay=60),
+                         heartbeat_interval=3600)
+    worker.run(max_jobs=1)
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for the SQLite job queue."""
+
+    def setUp(self):
+        """Create media files and a queue database."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.db_path = os.path.join(self.temp_dir, "jobs.db")
+        self.log_path = os.path.join(self.temp_dir, "runs.log")
+        self.files = [self._media(f"lecture{i}.mp3") for i in range(3)]
+
+    def _media(self, name, content=None):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(content or name.encode() * 100)
+        return path
+
+    def _runs(self):
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as f:
+            return f.read().split()
+
+    def test_enqueue_deduplicates_content(self):
+        """Test the same content is queued once, wherever it lives."""
+        job_queue = JobQueue(self.db_path)
+        job_id = job_queue.enqueue(self.files[0], priority=1)
+
+        copy = self._media("copy.mp3", open(self.files[0], 'rb').read())
+        self.assertIsNone(job_queue.enqueue(copy))
+        job = job_queue.get(job_id)
+        self.assertEqual(job["status"], JobQueue.QUEUED)
+        self.assertEqual(job["output_path"], os.path.join(self.temp_dir, "lecture0.txt"))
+
+    def test_claim_order_and_exclusivity(self):
+        """Test jobs are claimed by priority and never by two workers."""
+        job_queue = JobQueue(self.db_path)
+        job_queue.enqueue(self.files[0], priority=1)
+        job_queue.enqueue(self.files[1], priority=0)
+
+        first = job_queue.claim("a")
+        second = job_queue.claim("b")
+        self.assertEqual(first["path"], self.files[1])
+        self.assertEqual(second["path"], self.files[0])
+        self.assertIsNone(job_queue.claim("c"))
+        self.assertEqual(first["lease_owner"], "a")
+        self.assertEqual(first["attempts"], 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test a job whose worker stopped heartbeating moves on."""
+        job_queue = JobQueue(self.db_path, lease_seconds=0.2)
+        job_id = job_queue.enqueue(self.files[0])
+        job_queue.claim("a")
+        self.assertIsNone(job_queue.claim("b"))
+
+        time.sleep(0.3)
+        job = job_queue.claim("b")
+        self.assertEqual(job["id"], job_id)
+        self.assertEqual(job["attempts"], 2)
+
+        # The old worker's heartbeats and result are rejected
+        self.assertFalse(job_queue.heartbeat(job_id, "a"))
+        self.assertFalse(job_queue.complete(job_id, "a", {"output": "stale"}))
+        self.assertTrue(job_queue.complete(job_id, "b", {"output": "fresh"}))
+        self.assertEqual(job_queue.get(job_id)["result"], {"output": "fresh"})
+
+    def test_heartbeat_extends_lease(self):
+        """Test heartbeats keep a long job from being reclaimed."""
+        job_queue = JobQueue(self.db_path, lease_seconds=0.3)
+        job_id = job_queue.enqueue(self.files[0])
+        job_queue.claim("a")
+        for _ in range(3):
+            time.sleep(0.15)
+            self.assertTrue(job_queue.heartbeat(job_id, "a"))
+        self.assertIsNone(job_queue.claim("b"))
+
+    def test_retry_backoff_and_failure(self):
+        """Test failed jobs wait out an exponential backoff."""
+        job_queue = JobQueue(self.db_path, max_attempts=3, backoff_seconds=10,
+                             max_backoff_seconds=15)
+        self.assertEqual([job_queue.retry_delay(n) for n in (1, 2, 3)], [10, 15, 15])
+
+        job_id = job_queue.enqueue(self.files[0])
+        job_queue.claim("a")
+        before = time.time()
+        self.assertTrue(job_queue.fail(job_id, "a", "boom"))
+        job = job_queue.get(job_id)
+        self.assertEqual(job["status"], JobQueue.QUEUED)
+        self.assertGreaterEqual(job["available_at"], before + 10)
+        self.assertIsNone(job_queue.claim("a"))
+
+    def test_failed_after_max_attempts(self):
+        """Test jobs are marked failed once every attempt failed."""
+        job_queue = JobQueue(self.db_path, max_attempts=3, backoff_seconds=0)
+        job_id = job_queue.enqueue(self.files[0])
+        for _ in range(3):
+            self.assertEqual(job_queue.claim("a")["id"], job_id)
+            job_queue.fail(job_id, "a", "boom")
+        self.assertIsNone(job_queue.claim("a"))
+        job = job_queue.get(job_id)
+        self.assertEqual(job["status"], JobQueue.FAILED)
+        self.assertEqual(job["error"], "boom")
+
+        # Adding a failed file again starts it over
+        self.assertEqual(job_queue.enqueue(self.files[0]), job_id)
+        self.assertEqual(job_queue.get(job_id)["attempts"], 0)
+
+    def test_worker_retries_and_records_results(self):
+        """Test a worker retries a failing job and records the result."""
+        job_queue = JobQueue(self.db_path, backoff_seconds=0)
+        job_id = job_queue.enqueue(self.files[0])
+        worker = QueueWorker(job_queue, lambda: FakeTranscriber(self.log_path, fail_first=1),
+                             worker_id="w1", poll_interval=0.01)
+
+        self.assertEqual(worker.run(until_empty=True), 2)
+
+        job = job_queue.get(job_id)
+        self.assertEqual(job["status"], JobQueue.DONE)
+        self.assertEqual(job["attempts"], 2)
+        self.assertEqual(job["result"]["worker"], "w1")
+        self.assertEqual(job["result"]["output"], os.path.join(self.temp_dir, "lecture0.txt"))
+        self.assertTrue(os.path.exists(job["result"]["output"]))
+        self.assertEqual(job_queue.counts()[JobQueue.DONE], 1)
+
+    def test_several_processes_drain_without_duplicates(self):
+        """Test worker processes share a backlog and run every job once."""
+        job_queue = JobQueue(self.db_path)
+        files = self.files + [self._media(f"extra{i}.mp3") for i in range(17)]
+        for path in files:
+            job_queue.enqueue(path)
+
+        context = multiprocessing.get_context("fork")
+        processes = [context.Process(target=drain, args=(self.db_path, self.log_path, 0.02))
+                     for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertEqual(sorted(self._runs()), sorted(os.path.basename(p) for p in files))
+        jobs = job_queue.jobs()
+        self.assertTrue(all(job["status"] == JobQueue.DONE for job in jobs))
+        self.assertGreater(len({job["result"]["worker"] for job in jobs}), 1)
+
+    def test_killed_worker_job_is_taken_over(self):
+        """Test a job held by a killed process is finished by another."""
+        job_queue = JobQueue(self.db_path, lease_seconds=0.5)
+        job_id = job_queue.enqueue(self.files[0])
+
+        hung = multiprocessing.get_context("fork").Process(
+            target=hang, args=(self.db_path, self.log_path))
+        hung.start()
+        try:
+            deadline = time.time() + 10
+            while job_queue.get(job_id)["status"] != JobQueue.RUNNING:
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.01)
+        finally:
+            hung.kill()
+            hung.join()
+        self.assertIsNone(job_queue.claim("other"))
+
+        time.sleep(0.6)
+        worker = QueueWorker(job_queue, lambda: FakeTranscriber(self.log_path),
+                             poll_interval=0.01)
+        self.assertEqual(worker.run(until_empty=True), 1)
+        self.assertEqual(job_queue.get(job_id)["status"], JobQueue.DONE)
+        self.assertEqual(self._runs(), ["lecture0.mp3", "lecture0.mp3"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for the lecture_index module.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from transcription_app.core.lecture_index import IntervalIndex, LectureIndex
+
+
+class CountingList(list):
+    """List recording every item lookup."""
+
+    def __init__(self, items, lookups):
+        super().__init__(items)
+        self.lookups = lookups
+
+    def __getitem__(self, i):
+        self.lookups.append(i)
+        return super().__getitem__(i)
+
+
+class TestIntervalIndex(unittest.TestCase):
+    """Test cases for the IntervalIndex class."""
+
+    def test_matches_linear_scan(self):
+        """Overlap and stabbing queries agree with a brute-force scan."""
+        rng = random.Random(0)
+        intervals = []
+        for i in range(300):
+            start = rng.uniform(0, 1000)
+            intervals.append((start, start + rng.uniform(0.1, 80), i))
+        # A slide left up all session, an empty interval and shared endpoints
+        intervals += [(5.0, 990.0, 300), (500.0, 500.0, 301), (500.0, 520.0, 302)]
+        index = IntervalIndex(intervals)
+
+        for _ in range(200):
+            a = rng.uniform(-10, 1010)
+            b = a + rng.uniform(0, 50)
+            expected = sorted(p for s, e, p in intervals if s < b and e > a)
+            self.assertEqual(sorted(index.overlapping(a, b)), expected)
+            expected = sorted(p for s, e, p in intervals if s <= a < e)
+            self.assertEqual(sorted(index.at(a)), expected)
+
+    def test_long_interval_does_not_slow_queries(self):
+        """Queries inspect only nearby intervals, even past a long one."""
+        intervals = [(0.0, 1e9, "static")]
+        intervals += [(float(i), i + 1.0, i) for i in range(1, 100000)]
+        index = IntervalIndex(intervals)
+
+        inspected = []
+        index.ends = CountingList(index.ends, inspected)
+        index.starts = CountingList(index.starts, inspected)
+        self.assertEqual(index.at(90000.5), ["static", 90000])
+        self.assertEqual(index.overlapping(90000.5, 90002.5), ["static", 90000, 90001, 90002])
+        self.assertLess(len(inspected), 200)
+
+
+class TestLectureIndex(unittest.TestCase):
+    """Test cases for the LectureIndex class."""
+
+    def setUp(self):
+        """Build an index with two screens and one recording."""
+        self.index = LectureIndex()
+        self.index.add_slides([
+            {"id": 1, "session_id": "s", "screen": 1, "captured_at": 1000.0, "text": "Intro"},
+            {"id": 2, "session_id": "s", "screen": 1, "captured_at": 1030.0, "text": "Method"},
+            {"id": 3, "session_id": "s", "screen": 2, "captured_at": 1010.0, "text": "Notes"},
+        ])
+        self.index.add_transcript([
+            {"start": 0.0, "end": 10.0, "text": "Welcome."},
+            {"start": 10.0, "end": 28.0, "text": "Today we cover the basics."},
+            {"start": 28.0, "end": 40.0, "text": "Now the method."},
+        ], lecture="week1", offset=1000.0)
+
+    def test_transcript_for_slide(self):
+        """Segments spoken while a slide was showing are returned."""
+        self.assertEqual(
+            self.index.transcript_for_slide(1),
+            "Welcome. Today we cover the basics. Now the method.",
+        )
+        self.assertEqual(self.index.transcript_for_slide(2), "Now the method.")
+
+    def test_slides_at(self):
+        """Each screen's slide at a time is found."""
+        self.assertEqual({s["id"] for s in self.index.slides_at(1005.0)}, {1})
+        self.assertEqual({s["id"] for s in self.index.slides_at(1031.0)}, {2, 3})
+        self.assertEqual(self.index.slides_at(999.0), [])
+
+    def test_sessions_do_not_overlap(self):
+        """The last slide of a session ends before the next session starts."""
+        index = LectureIndex()
+        index.add_slides([
+            {"id": 1, "session_id": "a", "screen": 1, "captured_at": 0.0},
+            {"id": 2, "session_id": "a", "screen": 1, "captured_at": 100.0},
+            {"id": 3, "session_id": "b", "screen": 1, "captured_at": 10000.0},
+            {"id": 4, "session_id": "b", "screen": 1, "captured_at": 10100.0},
+        ])
+        index.add_transcript([{"start": 0.0, "end": 150.0, "text": "a2"}],
+                             lecture="a", offset=0.0)
+        index.add_transcript([{"start": 0.0, "end": 50.0, "text": "b1"},
+                              {"start": 100.0, "end": 160.0, "text": "b2"}],
+                             lecture="b", offset=10000.0)
+
+        self.assertEqual([s["id"] for s in index.slides_at(10050.0)], [3])
+        self.assertEqual([s["id"] for s in index.slides_at(120.0)], [2])
+        self.assertEqual(index.slides_at(5000.0), [])
+        self.assertEqual(index.transcript_for_slide(2), "a2")
+        self.assertEqual(index.transcript_for_slide(4), "b2")
+        self.assertEqual(index._slides_by_id[4]["end"], 10160.0)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "index.json")
+            index.save(path)
+            loaded = LectureIndex.load(path)
+        self.assertEqual([s["id"] for s in loaded.slides_at(10050.0)], [3])
+
+    def test_unknown_slide(self):
+        """Asking for an unknown slide raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.index.segments_for_slide(42)
+
+    def test_save_and_load(self):
+        """A saved index answers the same queries after reloading."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "index.json")
+            self.index.save(path)
+            loaded = LectureIndex.load(path)
+
+        self.assertEqual(loaded.transcript_for_slide(2), "Now the method.")
+        self.assertEqual({s["id"] for s in loaded.slides_at(1031.0)}, {2, 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
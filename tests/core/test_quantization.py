@@ -0,0 +1,91 @@
+"""
+Tests for the quantization module.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+from transcription_app.core.quantization import (
+    get_cache_path,
+    load_quantized_model,
+    quantize_model,
+)
+
+
+def make_small_model():
+    """Create a randomly initialized, very small Whisper model."""
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1,
+    )
+    return Whisper(dims)
+
+
+class TestQuantization(unittest.TestCase):
+    """Test cases for int8 model quantization."""
+
+    def test_quantize_model_replaces_linear_layers(self):
+        """Test every linear layer becomes a dynamically quantized one."""
+        model = quantize_model(make_small_model())
+
+        quantized = torch.ao.nn.quantized.dynamic.Linear
+        linear_types = {
+            type(module) for module in model.modules()
+            if isinstance(module, (torch.nn.Linear, quantized))
+        }
+        self.assertEqual(linear_types, {quantized})
+
+    @patch('transcription_app.core.quantization.whisper')
+    def test_converted_model_is_cached(self, mock_whisper):
+        """Test the model is converted once and then loaded from disk."""
+        mock_whisper.load_model.side_effect = lambda size, device: make_small_model()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = load_quantized_model("tiny", cache_dir=cache_dir)
+            self.assertTrue(os.path.exists(get_cache_path("tiny", cache_dir)))
+            second = load_quantized_model("tiny", cache_dir=cache_dir)
+
+        mock_whisper.load_model.assert_called_once_with("tiny", device="cpu")
+        self.assertEqual(type(second.decoder.blocks[0].attn.query),
+                         type(first.decoder.blocks[0].attn.query))
+
+
+    @patch('transcription_app.core.quantization.whisper')
+    def test_concurrent_conversions(self, mock_whisper):
+        """Test workers converting the same model at once do not clash."""
+        mock_whisper.load_model.side_effect = lambda size, device: make_small_model()
+        save = torch.save
+        both_saved = threading.Barrier(2, timeout=30)
+
+        def save_then_wait(model, path):
+            save(model, path)
+            both_saved.wait()
+
+        errors = []
+
+        def convert(cache_dir):
+            try:
+                load_quantized_model("tiny", cache_dir=cache_dir)
+            except Exception as e:
+                errors.append(e)
+
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                patch('transcription_app.core.quantization.torch.save', save_then_wait):
+            threads = [threading.Thread(target=convert, args=(cache_dir,)) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(os.listdir(cache_dir), [os.path.basename(get_cache_path("tiny"))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,10 @@
 Tests for the transcriber module.
 """
 
+import json
 import os
+import numpy as np
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 
@@ -89,6 +92,125 @@ class TestTranscriber(unittest.TestCase):
         # Check the result
         self.assertEqual(result, result_text)
 
+    @patch('os.path.exists')
+    def test_transcribe_and_save_segments(self, mock_exists):
+        """Test saving timestamped segments alongside the transcription."""
+        mock_exists.return_value = True
+
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = {
+            "text": " Hello world",
+            "segments": [{"start": 0.0, "end": 1.5, "text": " Hello world", "tokens": []}],
+        }
+        transcriber = Transcriber(model_size="tiny", model_factory=lambda size: mock_model)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "out.txt")
+            segments_path = os.path.join(temp_dir, "out.json")
+            transcriber.transcribe_and_save("test_audio.mp3", output_path, segments_path)
+
+            with open(segments_path) as f:
+                segments = json.load(f)
+
+        mock_model.transcribe.assert_called_once_with("test_audio.mp3")
+        self.assertEqual(segments, [{"start": 0.0, "end": 1.5, "text": "Hello world"}])
+
+    @patch('transcription_app.core.transcriber.load_quantized_model')
+    @patch('os.path.exists')
+    def test_quantized_model(self, mock_exists, mock_load_quantized):
+        """Test the quantized mode loads an int8 model and decodes in fp32."""
+        mock_exists.return_value = True
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = {"text": "quantized"}
+        mock_load_quantized.return_value = mock_model
+
+        transcriber = Transcriber(model_size="tiny", quantize=True)
+        result = transcriber.transcribe_file("test_audio.mp3")
+
+        mock_load_quantized.assert_called_once_with("tiny")
+        mock_model.transcribe.assert_called_once_with("test_audio.mp3", fp16=False)
+        self.assertEqual(result, "quantized")
+
+    @patch('transcription_app.core.transcriber.whisper')
+    @patch('os.path.exists')
+    def test_decode_options(self, mock_exists, mock_whisper):
+        """Test decode options from a preset are passed to the model."""
+        mock_exists.return_value = True
+        mock_model = MagicMock()
+        mock_model.transcribe.return_value = {"text": "preset"}
+        mock_whisper.load_model.return_value = mock_model
+
+        transcriber = Transcriber(model_size="tiny",
+                                  decode_options={"beam_size": 5, "language": "en"})
+        transcriber.transcribe_file("test_audio.mp3")
+
+        mock_model.transcribe.assert_called_once_with("test_audio.mp3", beam_size=5, language="en")
+
+    def test_resource_budget_applied_on_load(self):
+        """Test the worker's CPU share is applied before loading the model."""
+        resources = MagicMock()
+        resources.threads_for.return_value = 3
+        transcriber = Transcriber(model_size="tiny", model_factory=MagicMock(),
+                                  resources=resources, worker_index=1)
+
+        transcriber.load_model()
+
+        resources.apply.assert_called_once_with(1)
+        self.assertEqual(transcriber.audio_extractor.threads, 3)
+
+    @patch('transcription_app.core.transcriber.whisper.load_audio')
+    @patch('os.path.exists')
+    def test_two_pass_refines_low_confidence_segments(self, mock_exists, mock_load_audio):
+        """Test only low-confidence draft spans are re-decoded and spliced in."""
+        mock_exists.return_value = True
+        mock_load_audio.return_value = np.zeros(16000 * 40, dtype=np.float32)
+
+        def segment(start, end, text, logprob=-0.2):
+            return {"start": start, "end": end, "text": text, "avg_logprob": logprob,
+                    "compression_ratio": 1.5, "no_speech_prob": 0.1}
+
+        draft_model = MagicMock()
+        draft_model.transcribe.return_value = {"text": "", "language": "en", "segments": [
+            segment(0.0, 10.0, " Clear start."),
+            segment(10.0, 15.0, " mumble", logprob=-1.5),
+            segment(15.0, 20.0, " grumble", logprob=-1.2),
+            segment(20.0, 40.0, " Clear end."),
+        ]}
+        refine_model = MagicMock()
+        refine_model.transcribe.return_value = {"segments": [
+            segment(0.0, 10.0, " Precise middle."),
+        ]}
+        models = {"tiny": draft_model, "large": refine_model}
+
+        transcriber = Transcriber(model_size="tiny", model_factory=models.get,
+                                  refine_model_size="large")
+        text = transcriber.transcribe_file("test_audio.mp3")
+
+        self.assertEqual(text, " Clear start. Precise middle. Clear end.")
+        clip = refine_model.transcribe.call_args.args[0]
+        self.assertEqual(len(clip), 16000 * 10)
+        self.assertAlmostEqual(transcriber.upgraded_fraction, 0.25)
+
+    @patch('transcription_app.core.transcriber.whisper.load_audio')
+    @patch('os.path.exists')
+    def test_two_pass_skips_refine_model_when_confident(self, mock_exists, mock_load_audio):
+        """Test the large model is never loaded for a confident draft."""
+        mock_exists.return_value = True
+        mock_load_audio.return_value = np.zeros(16000, dtype=np.float32)
+        draft_model = MagicMock()
+        draft_model.transcribe.return_value = {"text": " Fine.", "segments": [
+            {"start": 0.0, "end": 1.0, "text": " Fine.", "avg_logprob": -0.1,
+             "compression_ratio": 1.2, "no_speech_prob": 0.0},
+        ]}
+        factory = MagicMock(return_value=draft_model)
+
+        transcriber = Transcriber(model_size="tiny", model_factory=factory,
+                                  refine_model_size="large")
+        self.assertEqual(transcriber.transcribe_file("test_audio.mp3"), " Fine.")
+
+        factory.assert_called_once_with("tiny")
+        self.assertEqual(transcriber.upgraded_fraction, 0.0)
+
     def test_is_video_file(self):
         """Test video file detection."""
         self.assertTrue(self.transcriber.is_video_file("test.mp4"))
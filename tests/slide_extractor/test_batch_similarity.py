@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+import cv2
+import numpy as np
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import ImageProcessor
+
+
+def make_sequence():
+    """Build a frame sequence of three slides with small noise per frame."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for title in ["Intro", "Method", "Results"]:
+        slide = np.full((120, 200, 3), 255, dtype=np.uint8)
+        cv2.putText(slide, title, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+        for _ in range(4):
+            noise = rng.integers(0, 3, slide.shape, dtype=np.uint8)
+            frames.append(cv2.subtract(slide, noise))
+    return frames
+
+
+class TestBatchSimilarity(unittest.TestCase):
+    """Test cases for vectorized similarity over frame sequences."""
+
+    def setUp(self):
+        """Build the frame stack."""
+        self.frames = make_sequence()
+        self.stack = ImageProcessor.prepare_frames(self.frames, width=0)
+
+    def test_matches_scalar_path(self):
+        """Batch scores match image_similarity pair by pair."""
+        scores = ImageProcessor.batch_similarity(self.stack, chunk_size=5)
+        expected = [ImageProcessor.image_similarity(a, b)
+                    for a, b in zip(self.frames, self.frames[1:])]
+
+        self.assertEqual(len(scores), len(self.frames) - 1)
+        np.testing.assert_allclose(scores, expected, atol=1e-6)
+
+    def test_segment_scenes(self):
+        """Scene boundaries are found where the slide changes."""
+        scenes = ImageProcessor.segment_scenes(self.stack, threshold=0.95)
+        self.assertEqual(scenes, [(0, 4), (4, 8), (8, 12)])
+
+    def test_batch_difference(self):
+        """Difference scores are small within a slide and large across slides."""
+        diffs = ImageProcessor.batch_difference(self.stack)
+        self.assertLess(diffs[0], diffs[3])
+
+    def test_prepare_frames_downsamples(self):
+        """Frames are converted to a downsampled grayscale stack."""
+        stack = ImageProcessor.prepare_frames(self.frames, width=100)
+        self.assertEqual(stack.shape, (12, 60, 100))
+        self.assertEqual(stack.dtype, np.uint8)
+
+
+if __name__ == "__main__":
+    unittest.main()
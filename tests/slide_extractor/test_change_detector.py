@@ -0,0 +1,189 @@
+import unittest
+import os
+import sys
+import cv2
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import (
+    ChangeDetector,
+    Config,
+    ImageProcessor,
+    SlideCapture,
+)
+
+
+def make_slide(title, video_seed=None):
+    """Draw a synthetic slide, optionally with a noisy 'video' in a corner."""
+    image = np.full((180, 320, 3), 255, dtype=np.uint8)
+    cv2.putText(image, title, (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 0), 2)
+    cv2.putText(image, "- bullet point", (10, 90), cv2.FONT_HERSHEY_SIMPLEX,
+                0.7, (0, 0, 0), 2)
+    if video_seed is not None:
+        rng = np.random.default_rng(video_seed)
+        image[120:180, 240:320] = rng.integers(0, 255, (60, 80, 3), dtype=np.uint8)
+    return image
+
+
+def is_new(detector, image, timestamp=0.0):
+    """Feed one sample and report whether it was captured as a new slide."""
+    return detector.update(image, timestamp)[0] == ChangeDetector.NEW
+
+
+# Every change is captured on its first sample, without waiting to settle
+@patch('TL_slide_extractor.slide_extractor.Config.SETTLE_SAMPLES', 1)
+class TestChangeDetector(unittest.TestCase):
+    """Test cases for masked change detection."""
+
+    def test_masked_similarity_ignores_masked_pixels(self):
+        """Differences outside the mask do not lower the score."""
+        first = make_slide("Slide", video_seed=1)
+        second = make_slide("Slide", video_seed=2)
+        mask = np.ones(first.shape[:2], dtype=bool)
+        mask[110:, 230:] = False
+
+        self.assertLess(ImageProcessor.image_similarity(first, second), 0.95)
+        self.assertGreater(
+            ImageProcessor.image_similarity(first, second, mask=mask), 0.99)
+
+    def test_configured_region_is_ignored(self):
+        """A configured webcam region never triggers a capture."""
+        detector = ChangeDetector(mask_regions=[(0.7, 0.6, 0.3, 0.4)],
+                                  learn_mask=False)
+        self.assertTrue(is_new(detector, make_slide("Intro", 0)))
+
+        for seed in range(1, 5):
+            self.assertFalse(is_new(detector, make_slide("Intro", seed)))
+
+    def test_learned_mask_stops_capture_storm(self):
+        """A constantly changing region is learned and then ignored."""
+        detector = ChangeDetector(mask_regions=[], learn_mask=True)
+        captures = [is_new(detector, make_slide("Intro", seed))
+                    for seed in range(20)]
+
+        self.assertTrue(captures[0])
+        self.assertFalse(any(captures[10:]))
+
+    def test_real_slide_change_still_detected(self):
+        """Learning the mask does not hide genuine slide changes."""
+        detector = ChangeDetector(mask_regions=[], learn_mask=True)
+        for seed in range(20):
+            is_new(detector, make_slide("Intro", seed))
+
+        self.assertTrue(is_new(detector, make_slide("Results table", 99)))
+
+
+def fade(first, second, alpha):
+    """Blend two slides, as in the middle of a fade transition."""
+    return cv2.addWeighted(first, 1 - alpha, second, alpha, 0)
+
+
+class TestSettleDetection(unittest.TestCase):
+    """Test cases for waiting until a change has settled."""
+
+    def setUp(self):
+        """Create a detector showing the intro slide."""
+        self.intro = make_slide("Intro")
+        self.results = make_slide("Results")
+        cv2.rectangle(self.results, (10, 110), (230, 170), (0, 0, 0), -1)
+        self.detector = ChangeDetector(mask_regions=[], learn_mask=False)
+        self.assertEqual(self.detector.update(self.intro, 0.0)[0],
+                         ChangeDetector.SETTLING)
+        self.assertEqual(self.detector.update(self.intro, 1.0)[0],
+                         ChangeDetector.NEW)
+
+    def test_fade_is_captured_once_settled(self):
+        """Transition frames are skipped and the settled slide is captured."""
+        frames = [fade(self.intro, self.results, alpha)
+                  for alpha in (0.3, 0.6, 0.9)] + [self.results, self.results]
+        statuses = [self.detector.update(frame, 2.0 + 0.25 * i)[0]
+                    for i, frame in enumerate(frames)]
+
+        self.assertEqual(statuses.count(ChangeDetector.NEW), 1)
+        self.assertEqual(statuses[-1], ChangeDetector.NEW)
+        self.assertIs(self.detector.reference, self.results)
+        self.assertEqual(self.detector.changed_at, 2.0)
+
+    def test_settle_time(self):
+        """With SETTLE_MS, stable samples must also span enough time."""
+        with patch('TL_slide_extractor.slide_extractor.Config.SETTLE_MS', 500):
+            self.assertEqual(self.detector.update(self.results, 2.0)[0],
+                             ChangeDetector.SETTLING)
+            self.assertEqual(self.detector.update(self.results, 2.25)[0],
+                             ChangeDetector.SETTLING)
+            self.assertEqual(self.detector.update(self.results, 2.5)[0],
+                             ChangeDetector.NEW)
+
+    def test_return_to_slide_cancels_change(self):
+        """A tooltip that disappears again is not captured."""
+        tooltip = self.intro.copy()
+        tooltip[40:120, 100:300] = 0
+
+        self.assertEqual(self.detector.update(tooltip, 2.0)[0],
+                         ChangeDetector.SETTLING)
+        self.assertEqual(self.detector.update(self.intro, 2.25)[0],
+                         ChangeDetector.UNCHANGED)
+        self.assertFalse(self.detector.settling)
+
+
+class TestSupersededOCR(unittest.TestCase):
+    """Test cases for cancelling OCR of slides that were quickly replaced."""
+
+    def test_quickly_replaced_slide_is_not_ocred(self):
+        """Only slides that stayed up long enough reach OCR."""
+        app = SlideCapture(store=MagicMock(), screen_indices=[1])
+        with patch('TL_slide_extractor.slide_extractor.Config.DELETE_IMAGES_AFTER_OCR', True), \
+                patch('TL_slide_extractor.slide_extractor.Config.MIN_SLIDE_DURATION', 1.0):
+            app._process_new_slide(make_slide("Build 1"), 1, 10.0)
+            app._process_new_slide(make_slide("Build 2"), 1, 10.4)
+            app._process_new_slide(make_slide("Build 3"), 1, 20.0)
+
+        jobs = [app.ocr_queue.get_nowait() for _ in range(3)]
+        self.assertEqual([job.cancelled for job in jobs], [True, False, False])
+        self.assertIsNone(jobs[0].image)
+        self.assertEqual(app.slides_cancelled, 1)
+
+    def test_build_steps_cancelled_with_default_settings(self):
+        """Slides replaced at the next regular sample are superseded."""
+        app = SlideCapture(store=MagicMock(), screen_indices=[1])
+        app.detectors[1] = ChangeDetector(mask_regions=[], learn_mask=False)
+        slides = [make_slide(title) for title in ("Intro", "Build 1", "Build 2", "Summary")]
+        for step, slide in enumerate(slides[1:], start=1):
+            cv2.rectangle(slide, (10, 100 + 20 * step), (300, 115 + 20 * step), (0, 0, 0), -1)
+        # Intro and Build 2 stay up for 20 s, Build 1 for one capture interval
+        schedule = [(slides[0], 20), (slides[1], 2), (slides[2], 20), (slides[3], 20)]
+
+        # Sample like the main loop: every CAPTURE_INTERVAL, and every
+        # SETTLE_INTERVAL while a change settles
+        t = 0.0
+        shown_until = 0.0
+        with patch('TL_slide_extractor.slide_extractor.Config.DELETE_IMAGES_AFTER_OCR', True):
+            for slide, seconds in schedule:
+                shown_until += seconds
+                while t < shown_until:
+                    app._check_frame(1, slide, t)
+                    t += (Config.SETTLE_INTERVAL if app.detectors[1].settling
+                          else Config.CAPTURE_INTERVAL)
+
+        jobs = list(app.ocr_queue.queue)
+        self.assertEqual(len(jobs), 4)
+        self.assertEqual([job.cancelled for job in jobs], [False, True, False, False])
+        self.assertEqual(app.slides_cancelled, 1)
+
+    @patch('TL_slide_extractor.slide_extractor.SlideCapture._store_ocr_result')
+    def test_started_jobs_are_not_cancelled(self, mock_store):
+        """A slide already being OCRed is finished."""
+        app = SlideCapture(store=MagicMock(), screen_indices=[1])
+        with patch('TL_slide_extractor.slide_extractor.Config.DELETE_IMAGES_AFTER_OCR', True):
+            app._process_new_slide(make_slide("Build 1"), 1, 10.0)
+            first = app.ocr_queue.queue[0]
+            first.started = True
+            app._process_new_slide(make_slide("Build 2"), 1, 10.4)
+
+        self.assertFalse(first.cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
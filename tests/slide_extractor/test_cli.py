@@ -0,0 +1,164 @@
+import unittest
+import os
+import sys
+import subprocess
+import tempfile
+import time
+import cv2
+import numpy as np
+from unittest.mock import patch
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import (
+    Config,
+    ImageDirectoryFrameSource,
+    SessionStore,
+    SlideCapture,
+    VideoFrameSource,
+    configure,
+    parse_args,
+)
+
+
+def make_slide(title):
+    """Draw a synthetic slide with a title."""
+    image = np.full((120, 200, 3), 255, dtype=np.uint8)
+    cv2.putText(image, title, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 0), 2)
+    return image
+
+
+class TestSlideExtractorCLI(unittest.TestCase):
+    """Test cases for the configuration file, CLI and frame sources."""
+
+    def setUp(self):
+        """Remember the configuration and create a scratch directory."""
+        self.saved_config = {k: v for k, v in vars(Config).items() if k.isupper()}
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Restore the configuration and remove the scratch directory."""
+        for key, value in self.saved_config.items():
+            setattr(Config, key, value)
+        self.temp_dir.cleanup()
+
+    def _write_config(self, text):
+        path = os.path.join(self.temp_dir.name, "config.toml")
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_config_file_and_cli_overrides(self):
+        """Settings come from the TOML file, and flags take precedence."""
+        path = self._write_config(
+            "[capture]\nssim_threshold = 0.9\ncapture_interval = 5\n"
+            "[ocr]\nocr_workers = 3\n")
+
+        configure(parse_args(["--config", path, "--interval", "0.5"]))
+
+        self.assertEqual(Config.SSIM_THRESHOLD, 0.9)
+        self.assertEqual(Config.OCR_WORKERS, 3)
+        self.assertEqual(Config.CAPTURE_INTERVAL, 0.5)
+
+    def test_unknown_config_key(self):
+        """Misspelled keys are reported instead of silently ignored."""
+        path = self._write_config("ssim_treshold = 0.9\n")
+        with self.assertRaises(ValueError):
+            configure(parse_args(["--config", path]))
+
+    @patch('TL_slide_extractor.slide_extractor.OCRProcessor.extract_text_from_image')
+    def test_headless_run_from_image_directory(self, mock_ocr):
+        """A screenshot directory is processed into the session store."""
+        mock_ocr.side_effect = lambda image: "slide text"
+        image_dir = os.path.join(self.temp_dir.name, "shots")
+        os.makedirs(image_dir)
+        for i, title in enumerate(["One", "One", "Two", "Two", "Three"]):
+            path = os.path.join(image_dir, f"{i:03d}.png")
+            cv2.imwrite(path, make_slide(title))
+            # Screenshots taken ten seconds apart
+            os.utime(path, (1000 + 10 * i, 1000 + 10 * i))
+
+        Config.OUTPUT_DIR = self.temp_dir.name
+        store_path = os.path.join(self.temp_dir.name, "sessions.db")
+        store = SessionStore(store_path, session_id="run")
+        app = SlideCapture(store=store, source=ImageDirectoryFrameSource(image_dir))
+        stats = app.run()
+
+        self.assertEqual(stats["frames"], 5)
+        self.assertEqual(stats["slides"], 3)
+        reader = SessionStore(store_path, session_id="reader")
+        try:
+            self.assertEqual(len(reader.slides("run")), 3)
+        finally:
+            reader.close()
+
+    @patch('TL_slide_extractor.slide_extractor.OCRProcessor.extract_text_from_image')
+    def test_distinct_screenshots_are_each_captured(self, mock_ocr):
+        """Every distinct screenshot is a slide, although none is repeated."""
+        mock_ocr.side_effect = lambda image: "slide text"
+        image_dir = os.path.join(self.temp_dir.name, "shots")
+        os.makedirs(image_dir)
+        for i, title in enumerate(["One", "Two", "Three"]):
+            path = os.path.join(image_dir, f"{i:03d}.png")
+            cv2.imwrite(path, make_slide(title))
+            os.utime(path, (1000 + 60 * i, 1000 + 60 * i))
+
+        self.assertEqual(Config.SETTLE_SAMPLES, 2)
+        Config.OUTPUT_DIR = self.temp_dir.name
+        store = SessionStore(os.path.join(self.temp_dir.name, "s.db"), session_id="run")
+        app = SlideCapture(store=store, source=ImageDirectoryFrameSource(image_dir))
+        stats = app.run()
+
+        self.assertEqual(stats["slides"], 3)
+        self.assertEqual(stats["cancelled"], 0)
+
+    def test_max_frames_limit(self):
+        """Runs stop after the configured number of samples."""
+        image_dir = os.path.join(self.temp_dir.name, "shots")
+        os.makedirs(image_dir)
+        for i in range(5):
+            cv2.imwrite(os.path.join(image_dir, f"{i:03d}.png"), make_slide("Same"))
+
+        Config.OUTPUT_DIR = self.temp_dir.name
+        store = SessionStore(os.path.join(self.temp_dir.name, "s.db"))
+        with patch('TL_slide_extractor.slide_extractor.OCRProcessor.extract_text_from_image',
+                   return_value=""):
+            stats = SlideCapture(store=store,
+                                 source=ImageDirectoryFrameSource(image_dir)).run(max_frames=2)
+        self.assertEqual(stats["frames"], 2)
+
+    def test_video_source_samples_by_interval(self):
+        """Video frames are sampled every capture interval of video time."""
+        path = os.path.join(self.temp_dir.name, "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (200, 120))
+        for _ in range(30):
+            writer.write(make_slide("Video"))
+        writer.release()
+
+        timestamps = [t for t, _ in VideoFrameSource(path, interval=1, start_time=1000.0)]
+        self.assertEqual(timestamps, [1000.0, 1001.0, 1002.0])
+
+        # Without a start time, runs are placed at the time they read the video
+        before = time.time()
+        source = VideoFrameSource(path, interval=1)
+        timestamps = [t for t, _ in source]
+        self.assertGreaterEqual(source.start_time, before)
+        self.assertEqual([t - source.start_time for t in timestamps], [0.0, 1.0, 2.0])
+
+
+class TestStandaloneScript(unittest.TestCase):
+    """Test the script works without the transcriber package installed."""
+
+    def test_imports_without_transcription_app(self):
+        """The script imports, without torch, from its own directory."""
+        script_dir = os.path.join(os.path.dirname(__file__), '../../TL_slide_extractor')
+        env = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+        code = "import sys, slide_extractor; print('torch' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], cwd=script_dir, env=env,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import ScreenCapture, SlideCapture
+
+
+class TestMultiMonitorCapture(unittest.TestCase):
+    """Test cases for watching several monitors at once."""
+
+    def _mock_mss(self, mock_mss, canvas, monitors):
+        """Make mss.mss() return a screen grabber over a fake desktop."""
+        sct = MagicMock()
+        sct.monitors = monitors
+
+        def grab(region):
+            top, left = region["top"], region["left"]
+            return canvas[top:top + region["height"], left:left + region["width"]]
+
+        sct.grab.side_effect = grab
+        mock_mss.return_value.__enter__.return_value = sct
+        return sct
+
+    @patch('TL_slide_extractor.slide_extractor.mss.mss')
+    def test_capture_screens_uses_one_grab(self, mock_mss):
+        """Each monitor is cut from a single grab of their bounding box."""
+        canvas = np.zeros((100, 300, 4), dtype=np.uint8)
+        canvas[:, :200] = 50
+        canvas[:, 200:] = 200
+        monitors = [
+            {"left": 0, "top": 0, "width": 300, "height": 100},
+            {"left": 0, "top": 0, "width": 200, "height": 100},
+            {"left": 200, "top": 0, "width": 100, "height": 100},
+        ]
+        sct = self._mock_mss(mock_mss, canvas, monitors)
+
+        images = ScreenCapture.capture_screens([1, 2])
+
+        sct.grab.assert_called_once()
+        self.assertEqual(images[1].shape, (100, 200, 3))
+        self.assertEqual(images[2].shape, (100, 100, 3))
+        self.assertTrue((images[1] == 50).all())
+        self.assertTrue((images[2] == 200).all())
+
+    def test_only_changed_monitors_are_queued(self):
+        """Change detection runs per monitor and feeds one OCR queue."""
+        app = SlideCapture(store=MagicMock(), screen_indices=[1, 2])
+        slide = np.full((90, 160, 3), 255, dtype=np.uint8)
+        other = slide.copy()
+        other[20:70, 20:140] = 0
+
+        with patch('TL_slide_extractor.slide_extractor.Config.DELETE_IMAGES_AFTER_OCR', True), \
+                patch('TL_slide_extractor.slide_extractor.Config.SETTLE_SAMPLES', 1):
+            app._check_frame(1, slide)
+            app._check_frame(2, slide)
+            app._check_frame(1, slide)
+            app._check_frame(2, other)
+
+        queued = []
+        while not app.ocr_queue.empty():
+            queued.append(app.ocr_queue.get_nowait().screen_index)
+        self.assertEqual(queued, [1, 2, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import unittest
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+import numpy as np
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import ImageProcessor, SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+    """Test cases for the SQLite session store."""
+
+    def setUp(self):
+        """Set up a store in a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "sessions.db")
+        self.store = SessionStore(self.path, session_id="s1",
+                                  batch_size=3, flush_interval=3600)
+
+    def tearDown(self):
+        """Close the store and remove the temporary directory."""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_writes_are_batched(self):
+        """Slides are only written once a batch is full."""
+        self.store.add(1.0, "first slide")
+        self.store.add(2.0, "second slide")
+
+        reader = SessionStore(self.path, session_id="reader")
+        try:
+            self.assertEqual(reader.slides("s1"), [])
+            self.store.add(3.0, "third slide")
+            self.assertEqual(len(reader.slides("s1")), 3)
+        finally:
+            reader.close()
+
+    def test_partial_batch_is_written_after_flush_interval(self):
+        """A partial batch is written once it is stale, without further slides."""
+        store = SessionStore(self.path, session_id="timed", batch_size=100,
+                             flush_interval=0.1)
+        reader = SessionStore(self.path, session_id="reader")
+        try:
+            store.add(1.0, "lonely slide")
+            self.assertEqual(reader.slides("timed"), [])
+            time.sleep(0.5)
+            self.assertEqual([s["text"] for s in reader.slides("timed")],
+                             ["lonely slide"])
+        finally:
+            store.close()
+            reader.close()
+
+    def test_same_second_captures_do_not_collide(self):
+        """Captures within the same second are stored as separate slides."""
+        self.store.add(100.1, "slide one")
+        self.store.add(100.2, "slide two")
+
+        slides = self.store.slides()
+        self.assertEqual([s["text"] for s in slides], ["slide one", "slide two"])
+        self.assertNotEqual(slides[0]["id"], slides[1]["id"])
+
+    def test_sessions_started_together_are_distinct(self):
+        """Default session IDs differ within a second, and reuse fails."""
+        first = SessionStore(self.path)
+        second = SessionStore(self.path)
+        try:
+            self.assertNotEqual(first.session_id, second.session_id)
+        finally:
+            first.close()
+            second.close()
+
+        with self.assertRaises(ValueError):
+            SessionStore(self.path, session_id="s1")
+
+    def test_search_across_sessions(self):
+        """Full-text search finds slides from every session in the file."""
+        self.store.add(1.0, "Gradient descent converges")
+        self.store.close()
+
+        self.store = SessionStore(self.path, session_id="s2")
+        self.store.add(2.0, "Stochastic gradient descent")
+        self.store.add(3.0, "Unrelated slide")
+
+        results = self.store.search("gradient")
+        self.assertEqual({r["session_id"] for r in results}, {"s1", "s2"})
+
+    def test_slides_by_screen(self):
+        """Slides can be filtered by the monitor they were captured on."""
+        self.store.add(1.0, "left screen", screen=1)
+        self.store.add(1.0, "right screen", screen=2)
+
+        self.assertEqual([s["text"] for s in self.store.slides(screen=2)],
+                         ["right screen"])
+
+    def test_thumbnail_round_trip(self):
+        """Thumbnails are stored as JPEG bytes."""
+        image = np.full((90, 160, 3), 255, dtype=np.uint8)
+        thumbnail = ImageProcessor.encode_thumbnail(image, width=64)
+        self.store.add(1.0, "with thumbnail", thumbnail=thumbnail)
+
+        slide_id = self.store.slides()[0]["id"]
+        self.assertTrue(self.store.thumbnail(slide_id).startswith(b"\xff\xd8"))
+
+    def test_fingerprint_is_stable(self):
+        """Identical images share a fingerprint, different ones do not."""
+        image = np.zeros((90, 160, 3), dtype=np.uint8)
+        image[:, 80:] = 255
+        other = image[:, ::-1].copy()
+
+        self.assertEqual(ImageProcessor.fingerprint(image),
+                         ImageProcessor.fingerprint(image.copy()))
+        self.assertNotEqual(ImageProcessor.fingerprint(image),
+                            ImageProcessor.fingerprint(other))
+
+
+class TestSessionStoreDeltas(unittest.TestCase):
+    """Test cases for delta-encoded slide text."""
+
+    def setUp(self):
+        """Set up a store that snapshots every fourth slide."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "sessions.db")
+        self.store = SessionStore(self.path, session_id="s1", batch_size=100,
+                                  flush_interval=3600, snapshot_interval=4)
+
+    def tearDown(self):
+        """Close the store and remove the temporary directory."""
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def _build_sequence(self, count):
+        """Slides that each reveal one more bullet point."""
+        header = "Lecture 4: Gradient descent\n" + "Background line\n" * 20
+        return [header + "".join(f"- bullet {i}\n" for i in range(n + 1))
+                for n in range(count)]
+
+    def test_delta_round_trip(self):
+        """Edits, insertions and deletions are reconstructed exactly."""
+        base = "title\nline one\nline two\nline three"
+        text = "title\nline one, edited\nline three\nnew last line\n"
+        delta = SessionStore.encode_delta(base, text)
+        self.assertEqual(SessionStore.apply_delta(base, delta), text)
+
+    def test_build_sequence_is_stored_as_deltas(self):
+        """Only every snapshot_interval-th slide keeps its full text."""
+        texts = self._build_sequence(9)
+        for i, text in enumerate(texts):
+            self.store.add(float(i), text, screen=1)
+        self.store.flush()
+
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT base_id, length(text) FROM slides ORDER BY id").fetchall()
+        finally:
+            conn.close()
+        self.assertEqual([base_id is None for base_id, _ in rows],
+                         [True, False, False, False] * 2 + [True])
+        self.assertLess(sum(length for _, length in rows),
+                        sum(len(text) for text in texts) / 2)
+
+    def test_text_is_reconstructed_by_a_new_reader(self):
+        """Full text is rebuilt from the database, not only from memory."""
+        texts = self._build_sequence(7)
+        for i, text in enumerate(texts):
+            self.store.add(float(i), text, screen=1)
+        self.store.close()
+
+        self.store = SessionStore(self.path, session_id="reader")
+        slides = self.store.slides("s1")
+        self.assertEqual([s["text"] for s in slides], texts)
+        self.assertEqual(self.store.text(slides[-1]["id"]), texts[-1])
+
+        results = self.store.search('"bullet 6"')
+        self.assertEqual([r["text"] for r in results], [texts[6]])
+
+    def test_screens_have_separate_chains(self):
+        """Slides are only diffed against earlier slides of the same screen."""
+        self.store.add(1.0, "left\n" * 30, screen=1)
+        self.store.add(1.0, "right\n" * 30, screen=2)
+        self.store.add(2.0, "left\n" * 30 + "more\n", screen=1)
+
+        self.assertEqual([s["text"] for s in self.store.slides(screen=1)],
+                         ["left\n" * 30, "left\n" * 30 + "more\n"])
+
+    def test_failed_batch_leaves_no_cached_text(self):
+        """Texts of a rolled-back batch are not served for reused IDs."""
+        self.store.add(1.0, "rolled back\n" * 30, screen=1)
+        self.store.add(None, "invalid row", screen=1)
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.store.flush()
+        self.store._pending.pop()
+
+        # Another session takes the IDs the rolled-back rows had
+        other = SessionStore(self.path, session_id="other")
+        try:
+            other.add(2.0, "other session\n" * 30, screen=1)
+            other.flush()
+            other_id = other.slides()[0]["id"]
+        finally:
+            other.close()
+
+        self.assertEqual(self.store.text(other_id), "other session\n" * 30)
+        self.assertEqual([s["text"] for s in self.store.slides()],
+                         ["rolled back\n" * 30])
+
+    def test_unknown_slide(self):
+        """Asking for a missing slide raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.store.text(12345)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import sys
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import Config, SlideCapture
+from TL_slide_extractor.soak import MemoryMonitor, run_soak
+
+
+class TestSoak(unittest.TestCase):
+    """Test cases for the soak test and the in-flight frame cap."""
+
+    def setUp(self):
+        """Remember the configuration, which soak runs change."""
+        self.saved_config = {k: v for k, v in vars(Config).items() if k.isupper()}
+
+    def tearDown(self):
+        """Restore the configuration."""
+        for key, value in self.saved_config.items():
+            setattr(Config, key, value)
+
+    def test_short_soak_run(self):
+        """A few simulated minutes capture every slide within budget."""
+        result = run_soak(hours=0.05, slide_seconds=30, size=(160, 90),
+                          budget_mb=64)
+
+        self.assertTrue(result["passed"])
+        self.assertEqual(result["slides"], 6)
+        self.assertEqual(result["inflight_bytes"], 0)
+
+    def test_soak_run_restores_config(self):
+        """The run's output settings do not outlive it."""
+        Config.OUTPUT_DIR = "slides"
+        Config.DELETE_IMAGES_AFTER_OCR = False
+        run_soak(hours=0.01, size=(160, 90))
+
+        self.assertEqual(Config.OUTPUT_DIR, "slides")
+        self.assertFalse(Config.DELETE_IMAGES_AFTER_OCR)
+
+    def test_growth_past_budget_fails(self):
+        """Memory held after the baseline counts against the budget."""
+        monitor = MemoryMonitor(budget_mb=1)
+        monitor.start()
+        try:
+            monitor.set_baseline(0)
+            held = np.ones(4 * 1024 * 1024, dtype=np.uint8)
+            monitor.sample(1)
+            self.assertFalse(monitor.passed())
+            self.assertTrue(monitor.top_growth())
+            del held
+        finally:
+            monitor.stop()
+
+    def test_inflight_frames_are_capped(self):
+        """Slides beyond MAX_INFLIGHT_MB are skipped until memory frees up."""
+        app = SlideCapture(store=MagicMock(), screen_indices=[1])
+        frame = np.zeros((512, 1024, 3), dtype=np.uint8)  # 1.5 MB
+        with patch('TL_slide_extractor.slide_extractor.Config.DELETE_IMAGES_AFTER_OCR', True), \
+                patch('TL_slide_extractor.slide_extractor.Config.MAX_INFLIGHT_MB', 2):
+            app._process_new_slide(frame.copy(), 1, 10.0)
+            app._process_new_slide(frame.copy(), 1, 20.0)
+            self.assertEqual(app.slides_dropped, 1)
+            self.assertEqual(app.inflight_bytes, frame.nbytes)
+
+            app._release(app.ocr_queue.get_nowait())
+            app._process_new_slide(frame.copy(), 1, 30.0)
+            self.assertEqual(app.slides_dropped, 1)
+            self.assertEqual(app.inflight_bytes, frame.nbytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import sys
+import cv2
+import numpy as np
+from unittest.mock import patch
+
+# Add the project root to the path so we can import the slide_extractor module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from TL_slide_extractor.slide_extractor import OCRProcessor
+
+
+class TestTextRegions(unittest.TestCase):
+    """Test cases for the text-region pre-stage of OCR."""
+
+    def setUp(self):
+        """Draw a slide with a title, a bullet list and a photo."""
+        self.slide = np.full((1080, 1920), 255, dtype=np.uint8)
+        cv2.putText(self.slide, "Lecture 4: Gradient descent", (100, 120),
+                    cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 3)
+        for i in range(4):
+            cv2.putText(self.slide, f"- bullet point number {i}",
+                        (120, 250 + i * 60), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 0, 2)
+        cv2.rectangle(self.slide, (1300, 500), (1800, 1000), 80, -1)
+
+    def test_blocks_cover_only_the_text(self):
+        """The title and the bullet list are found; margins and photo are not."""
+        regions = OCRProcessor.detect_text_regions(self.slide)
+
+        self.assertEqual(len(regions), 2)
+        title, bullets = regions
+        self.assertLess(title[1], bullets[1])
+        self.assertGreater(title[4], bullets[4])
+        covered = sum(w * h for _, _, w, h, _ in regions)
+        self.assertLess(covered, 0.1 * self.slide.size)
+
+    def test_dark_mode_slides(self):
+        """Light text on a dark background gives the same blocks."""
+        self.assertEqual(OCRProcessor.detect_text_regions(255 - self.slide),
+                         OCRProcessor.detect_text_regions(self.slide))
+
+    def test_empty_slide(self):
+        """A blank slide has no text regions."""
+        blank = np.full((720, 1280), 200, dtype=np.uint8)
+        self.assertEqual(OCRProcessor.detect_text_regions(blank), [])
+
+    @patch('TL_slide_extractor.slide_extractor.pytesseract.image_to_string')
+    def test_only_rescaled_blocks_are_ocred(self, mock_ocr):
+        """Each block is OCRed separately, scaled to the preferred line height."""
+        mock_ocr.return_value = "recognised block text\n"
+        image = cv2.cvtColor(self.slide, cv2.COLOR_GRAY2BGR)
+
+        with patch('TL_slide_extractor.slide_extractor.Config.OCR_LINE_HEIGHT', 40):
+            text = OCRProcessor.extract_text_from_image(image)
+
+        self.assertEqual(text, "recognised block text\n\nrecognised block text")
+        self.assertEqual(mock_ocr.call_count, 2)
+        for call in mock_ocr.call_args_list:
+            self.assertIn("--psm 6", call.kwargs["config"])
+        ocred_pixels = sum(call.args[0].size for call in mock_ocr.call_args_list)
+        self.assertLess(ocred_pixels, 0.25 * self.slide.size)
+
+    @patch('TL_slide_extractor.slide_extractor.pytesseract.image_to_string')
+    def test_falls_back_to_full_image(self, mock_ocr):
+        """Without text regions the whole slide is OCRed as before."""
+        mock_ocr.return_value = "text tesseract found anyway"
+        blank = np.full((720, 1280, 3), 200, dtype=np.uint8)
+
+        self.assertEqual(OCRProcessor.extract_text_from_image(blank),
+                         "text tesseract found anyway")
+        self.assertIn("--psm 1", mock_ocr.call_args.kwargs["config"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Tests for the file_utils module.
 """
 
 import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 
@@ -12,7 +13,8 @@ from transcription_app.utils.file_utils import (
     get_file_size,
     is_file_empty,
     safe_delete_file,
-    get_base_filename
+    get_base_filename,
+    fingerprint_file
 )
 
 
@@ -74,5 +76,77 @@ class TestFileUtils(unittest.TestCase):
         self.assertEqual(get_base_filename("test."), "test")
 
 
+class TestFingerprintFile(unittest.TestCase):
+    """Test cases for sampled file fingerprints."""
+
+    BLOCK = 16
+    SAMPLES = 4
+
+    def setUp(self):
+        """Create a file much larger than the sampled blocks."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.data = bytes(range(256)) * 8
+        self.path = self.write("media.bin", self.data)
+
+    def write(self, name, data):
+        """Write data to a file in the temporary directory."""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def fingerprint(self, path, full=False):
+        """Fingerprint with small blocks so sampling applies."""
+        return fingerprint_file(path, full=full, block_size=self.BLOCK, samples=self.SAMPLES)
+
+    def test_copies_match(self):
+        """Test identical contents give identical fingerprints."""
+        copy = self.write("copy.bin", self.data)
+        self.assertEqual(self.fingerprint(self.path), self.fingerprint(copy))
+        self.assertEqual(self.fingerprint(self.path, full=True),
+                         self.fingerprint(copy, full=True))
+        self.assertNotEqual(self.fingerprint(self.path),
+                            self.fingerprint(self.path, full=True))
+
+    def test_head_tail_and_size_changes(self):
+        """Test edits to sampled blocks and to the size are detected."""
+        head = self.write("head.bin", b"?" + self.data[1:])
+        tail = self.write("tail.bin", self.data[:-1] + b"?")
+        longer = self.write("longer.bin", self.data + b"\0")
+
+        original = self.fingerprint(self.path)
+        for path in (head, tail, longer):
+            self.assertNotEqual(self.fingerprint(path), original)
+
+    def test_full_mode_detects_unsampled_changes(self):
+        """Test only full mode sees an edit between sampled blocks."""
+        middle = len(self.data) // 2 + self.BLOCK
+        edited = self.write("edited.bin", self.data[:middle] + b"?" + self.data[middle + 1:])
+
+        self.assertEqual(self.fingerprint(edited), self.fingerprint(self.path))
+        self.assertNotEqual(self.fingerprint(edited, full=True),
+                            self.fingerprint(self.path, full=True))
+
+    def test_small_files_are_hashed_whole(self):
+        """Test files no larger than the samples are read completely."""
+        first = self.write("first.bin", b"a" * 40 + b"b" + b"a" * 20)
+        second = self.write("second.bin", b"a" * 40 + b"c" + b"a" * 20)
+        self.assertNotEqual(self.fingerprint(first), self.fingerprint(second))
+
+    def test_memoized_by_inode_and_mtime(self):
+        """Test unchanged files are not read again, modified ones are."""
+        original = self.fingerprint(self.path)
+        with patch('builtins.open', side_effect=AssertionError("file was read")):
+            self.assertEqual(self.fingerprint(self.path), original)
+
+        # Same size, new contents and a new modification time
+        self.write("media.bin", b"?" + self.data[1:])
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertNotEqual(self.fingerprint(self.path), original)
+
+
 if __name__ == '__main__':
     unittest.main()
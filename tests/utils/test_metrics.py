@@ -0,0 +1,31 @@
+"""
+Tests for the metrics module.
+"""
+
+import unittest
+
+from transcription_app.utils.metrics import normalize_words, word_error_rate
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the transcription metrics."""
+
+    def test_normalize_words(self):
+        """Test normalization ignores case and punctuation."""
+        self.assertEqual(normalize_words("Hello, World! It's"), ["hello", "world", "it's"])
+
+    def test_word_error_rate(self):
+        """Test substitutions, deletions and insertions are counted."""
+        self.assertEqual(word_error_rate("the cat sat", "The cat sat."), 0.0)
+        self.assertAlmostEqual(word_error_rate("the cat sat", "the bat sat"), 1 / 3)
+        self.assertAlmostEqual(word_error_rate("the cat sat", "the sat"), 1 / 3)
+        self.assertAlmostEqual(word_error_rate("the cat sat", "the cat sat down"), 1 / 3)
+
+    def test_empty_reference(self):
+        """Test an empty reference only matches an empty hypothesis."""
+        self.assertEqual(word_error_rate("", ""), 0.0)
+        self.assertEqual(word_error_rate("", "noise"), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()